@@ -20,7 +20,7 @@ def generate_lesson_plan(request, lesson_id):
     Generates an AI lesson plan for a session.
     Only available for premium users.
     """
-    session = get_object_or_404(Session, pk=lesson_id, contract__student__user=request.user)
+    session = get_object_or_404(Session, pk=lesson_id, owner=request.user)
 
     # Premium-Check
     if not user_has_feature(request.user, Feature.FEATURE_AI_LESSON_PLANS):
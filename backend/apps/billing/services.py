@@ -10,8 +10,12 @@ from django.utils.translation import gettext as _
 
 from apps.billing.models import Invoice, InvoiceItem
 from apps.contracts.institute_utils import is_abacus_institute, is_tutorspace_institute
-from apps.contracts.tutorspace_compensation import calculate_tutorspace_amount_for_session
+from apps.contracts.tutorspace_compensation import (
+    TutorSpaceTierTimeline,
+    calculate_tutorspace_amount_for_session,
+)
 from apps.core.feature_flags import Feature, user_has_feature
+from apps.lessons.availability_cache import bump_schedule_version
 from apps.lessons.models import Lesson
 
 
@@ -32,7 +36,7 @@ class InvoiceService:
             period_end: Enddatum des Zeitraums
             contract_id: Optional: Filter nach Vertrag-ID
             institute: Optional: Filter nach Institut (Contract.institute)
-            user: Optional: Filter nach Tutor (contract__student__user)
+            user: Optional: Filter nach Tutor (owner)
 
         Returns:
             QuerySet von Lessons mit Status TAUGHT, die noch nicht in einem InvoiceItem sind
@@ -54,7 +58,7 @@ class InvoiceService:
         if institute:
             queryset = queryset.filter(contract__institute=institute)
         if user:
-            queryset = queryset.filter(contract__student__user=user)
+            queryset = queryset.filter(owner=user)
 
         return queryset.order_by("date", "start_time")
 
@@ -66,7 +70,9 @@ class InvoiceService:
         Erstellt eine Invoice mit InvoiceItems aus allen verfügbaren Lessons im Zeitraum.
 
         Automatisch werden alle Lessons mit Status TAUGHT im angegebenen Zeitraum verwendet,
-        die noch nicht in einer Rechnung sind.
+        die noch nicht in einer Rechnung sind. Die Positionen werden im Speicher berechnet
+        und mit einem bulk_create geschrieben; die Lessons werden mit einem UPDATE auf PAID
+        gesetzt.
 
         Args:
             period_start: Startdatum
@@ -81,14 +87,17 @@ class InvoiceService:
         # Lade automatisch alle abrechenbaren Lessons im Zeitraum
         contract_id = contract.id if contract else None
         with transaction.atomic():
-            lessons = InvoiceService.get_billable_lessons(
-                period_start, period_end, contract_id, institute=institute, user=user
-            ).select_for_update()
+            # Einmal laden und sperren; alles Weitere arbeitet auf der Liste
+            lessons = list(
+                InvoiceService.get_billable_lessons(
+                    period_start, period_end, contract_id, institute=institute, user=user
+                ).select_for_update()
+            )
 
-            if not lessons.exists():
+            if not lessons:
                 raise ValueError(_("No billable lessons found in the specified period."))
 
-            first_lesson = lessons.first()
+            first_lesson = lessons[0]
             # Tutor for TutorSpace tier math must always be set (calculate_tutorspace returns 0 if None).
             owner = user if user is not None else first_lesson.contract.student.user
 
@@ -133,11 +142,18 @@ class InvoiceService:
             invoice = Invoice.objects.create(**invoice_kwargs)
 
             total_amount = Decimal("0.00")
+            items = []
+            # TutorSpace-Historie des Tutors nur einmal laden (statt einmal pro Lesson)
+            tier_timeline = None
             for lesson in lessons:
                 contract = lesson.contract
 
                 if is_tutorspace_institute(getattr(contract, "institute", None)):
-                    amount = calculate_tutorspace_amount_for_session(lesson, tutor=owner)
+                    if tier_timeline is None:
+                        tier_timeline = TutorSpaceTierTimeline.for_tutor(owner)
+                    amount = calculate_tutorspace_amount_for_session(
+                        lesson, tutor=owner, timeline=tier_timeline
+                    )
                 else:
                     unit_duration = Decimal(str(contract.unit_duration_minutes))
                     lesson_duration = Decimal(str(lesson.duration_minutes))
@@ -160,24 +176,38 @@ class InvoiceService:
                     elif is_abacus_institute(getattr(contract, "institute", None)):
                         desc = f"{desc} ({_('not billed — tutor no-show')})"
 
-                InvoiceItem.objects.create(
-                    invoice=invoice,
-                    lesson=lesson,
-                    description=desc,
-                    date=lesson.date,
-                    duration_minutes=lesson.duration_minutes,
-                    amount=amount,
+                items.append(
+                    InvoiceItem(
+                        invoice=invoice,
+                        lesson=lesson,
+                        description=desc,
+                        date=lesson.date,
+                        duration_minutes=lesson.duration_minutes,
+                        amount=amount,
+                    )
                 )
 
                 total_amount += amount
 
+            InvoiceItem.objects.bulk_create(items, batch_size=500)
+
+            # Ein UPDATE für alle Lessons statt save() pro Lesson
+            now = timezone.now()
+            Lesson.objects.filter(pk__in=[lesson.pk for lesson in lessons]).update(
+                status="paid", updated_at=now
+            )
+            for lesson in lessons:
                 lesson.status = "paid"
-                lesson.save(update_fields=["status", "updated_at"])
+                lesson.updated_at = now
 
             invoice.total_amount = total_amount
             invoice.save(update_fields=["total_amount", "updated_at"])
 
-            return invoice
+        # update() umgeht die post_save-Receiver der Lessons
+        for owner_id in {lesson.owner_id for lesson in lessons}:
+            bump_schedule_version(owner_id)
+
+        return invoice
 
     @staticmethod
     def delete_invoice(invoice: Invoice):
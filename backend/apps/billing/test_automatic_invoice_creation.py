@@ -234,3 +234,26 @@ class AutomaticInvoiceCreationTest(TestCase):
 
         # Keine Lessons sollten mehr verfügbar sein
         self.assertEqual(billable_after.count(), 0)
+
+    def test_query_count_does_not_grow_with_lesson_count(self):
+        """Test: Positionen und Status werden gebündelt geschrieben (konstante Query-Anzahl)."""
+        for month, count in ((8, 3), (9, 30)):
+            for day in range(count):
+                Lesson.objects.create(
+                    contract=self.contract,
+                    date=date(2025, month, 1 + day % 28),
+                    start_time=time(8 + day // 28, 0),
+                    duration_minutes=60,
+                    status="taught",
+                )
+
+            with self.assertNumQueries(9):
+                invoice = InvoiceService.create_invoice_from_lessons(
+                    date(2025, month, 1), date(2025, month, 30), self.contract
+                )
+
+            self.assertEqual(invoice.items.count(), count)
+            self.assertEqual(invoice.total_amount, Decimal("25.00") * count)
+            self.assertFalse(
+                Lesson.objects.filter(date__month=month).exclude(status="paid").exists()
+            )
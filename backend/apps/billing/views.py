@@ -165,8 +165,11 @@ class InvoiceCreateView(LoginRequiredMixin, CreateView):
             # Same amount logic as InvoiceService.create_invoice_from_lessons (not template widthratio).
             lessons_list = list(billable_lessons)
             preview_total = Decimal("0.00")
+            tier_timelines = {}
             for lesson in lessons_list:
-                lesson.invoice_preview_amount = IncomeSelector._calculate_lesson_amount(lesson)
+                lesson.invoice_preview_amount = IncomeSelector._calculate_lesson_amount(
+                    lesson, tier_timelines
+                )
                 preview_total += lesson.invoice_preview_amount
             context["billable_lessons"] = lessons_list
             context["preview_total_amount"] = preview_total
@@ -180,7 +183,7 @@ class InvoiceCreateView(LoginRequiredMixin, CreateView):
                 profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
                 tier_from = profile.tutorspace_tier_count_from
                 prior_qs = Lesson.objects.filter(
-                    contract__student__user=self.request.user,
+                    owner=self.request.user,
                     contract__institute__iexact=TUTORSPACE_INSTITUTE_NAME,
                     status__in=["taught", "paid"],
                     tutor_no_show=False,
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blocked_times", "0006_blockedtime_user_required"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blockedtime",
+            index=models.Index(
+                fields=["user", "start_datetime", "end_datetime"],
+                name="blocked_tim_user_range_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringblockedtime",
+            index=models.Index(
+                fields=["user", "is_active", "start_date"], name="blocked_tim_rec_user_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+"""Add RecurringBlockedTime.materialized_until and fill it for existing series.
+
+Existing series were materialized up to their end date or one year after the start.
+"""
+
+from datetime import date
+
+from django.db import migrations, models
+
+
+def _one_year_after(start):
+    try:
+        return start.replace(year=start.year + 1)
+    except ValueError:  # 29 February
+        return date(start.year + 1, 2, 28)
+
+
+def backfill(apps, schema_editor):
+    RecurringBlockedTime = apps.get_model("blocked_times", "RecurringBlockedTime")
+    series = list(RecurringBlockedTime.objects.all())
+    for recurring in series:
+        recurring.materialized_until = recurring.end_date or _one_year_after(recurring.start_date)
+    RecurringBlockedTime.objects.bulk_update(series, ["materialized_until"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blocked_times", "0007_user_range_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recurringblockedtime",
+            name="materialized_until",
+            field=models.DateField(
+                blank=True,
+                help_text="Last day up to which the series has been materialized",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -41,7 +41,22 @@ class BlockedTime(models.Model):
         verbose_name_plural = _("Blocked Times")
         indexes = [
             models.Index(fields=["start_datetime", "end_datetime"]),
+            models.Index(
+                fields=["user", "start_datetime", "end_datetime"],
+                name="blocked_tim_user_range_idx",
+            ),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.start_datetime.strftime('%Y-%m-%d %H:%M')}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or not {"user", "start_datetime", "end_datetime"}.isdisjoint(
+            update_fields
+        ):
+            from apps.lessons.services import SessionConflictService
+
+            SessionConflictService.sync_blocked_time_conflicts(self)
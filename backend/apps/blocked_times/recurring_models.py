@@ -6,6 +6,8 @@ from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.recurrence import BLOCKED_TIME_WKST, Recurrence
+
 
 class RecurringBlockedTime(models.Model):
     """Recurring blocked time - template for series appointments."""
@@ -48,6 +50,11 @@ class RecurringBlockedTime(models.Model):
     saturday = models.BooleanField(default=False, help_text=_("Saturday"))
     sunday = models.BooleanField(default=False, help_text=_("Sunday"))
     is_active = models.BooleanField(default=True, help_text=_("Is the series active?"))
+    materialized_until = models.DateField(
+        null=True,
+        blank=True,
+        help_text=_("Last day up to which the series has been materialized"),
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -55,6 +62,11 @@ class RecurringBlockedTime(models.Model):
         ordering = ["-start_date", "title"]
         verbose_name = _("Recurring Blocked Time")
         verbose_name_plural = _("Recurring Blocked Times")
+        indexes = [
+            models.Index(
+                fields=["user", "is_active", "start_date"], name="blocked_tim_rec_user_idx"
+            ),
+        ]
 
     def __str__(self):
         weekdays = self.get_active_weekdays_display()
@@ -79,6 +91,17 @@ class RecurringBlockedTime(models.Model):
             weekdays.append(6)
         return weekdays
 
+    @property
+    def recurrence(self) -> Recurrence:
+        """Recurrence rule; bi-weekly weeks start on Tuesday (see BLOCKED_TIME_WKST)."""
+        return Recurrence.from_series(
+            self.recurrence_type,
+            self.start_date,
+            self.end_date,
+            self.get_active_weekdays(),
+            wkst=BLOCKED_TIME_WKST,
+        )
+
     def get_active_weekdays_display(self):
         """Returns a human-readable representation of active weekdays."""
         from django.utils.translation import gettext_lazy as _
@@ -3,13 +3,17 @@ Service für wiederholende Blockzeiten (Recurring Blocked Times).
 """
 
 from datetime import date, datetime, timedelta
-from typing import List
+from typing import Iterable, List
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.blocked_times.models import BlockedTime
 from apps.blocked_times.recurring_models import RecurringBlockedTime
+from apps.core.recurrence import horizon_end
 
 
 class RecurringBlockedTimeService:
@@ -22,7 +26,7 @@ class RecurringBlockedTimeService:
         dry_run: bool = False,
     ) -> dict:
         """
-        Generiert BlockedTime-Einträge für eine RecurringBlockedTime über den Zeitraum [start_date, end_date].
+        Generiert BlockedTime-Einträge für eine RecurringBlockedTime von start_date bis materialization_end.
 
         Args:
             recurring_blocked_time: Die RecurringBlockedTime-Vorlage
@@ -39,73 +43,44 @@ class RecurringBlockedTimeService:
         if not recurring_blocked_time.is_active:
             return {"created": 0, "skipped": 0, "conflicts": [], "preview": []}
 
-        # Bestimme Enddatum
-        end_date = recurring_blocked_time.end_date
-        if not end_date:
-            # Falls kein Enddatum, verwende 1 Jahr nach Start
-            end_date = date(
-                recurring_blocked_time.start_date.year + 1,
-                recurring_blocked_time.start_date.month,
-                recurring_blocked_time.start_date.day,
-            )
-
-        # Generiere BlockedTime-Einträge basierend auf recurrence_type
-        recurrence_type = recurring_blocked_time.recurrence_type
-
-        if recurrence_type == "weekly":
-            return RecurringBlockedTimeService._generate_weekly_blocked_times(
-                recurring_blocked_time, end_date, check_conflicts, dry_run
-            )
-        elif recurrence_type == "biweekly":
-            return RecurringBlockedTimeService._generate_biweekly_blocked_times(
-                recurring_blocked_time, end_date, check_conflicts, dry_run
-            )
-        elif recurrence_type == "monthly":
-            return RecurringBlockedTimeService._generate_monthly_blocked_times(
-                recurring_blocked_time, end_date, check_conflicts, dry_run
-            )
-        else:
-            # Fallback auf weekly für unbekannte Typen
-            return RecurringBlockedTimeService._generate_weekly_blocked_times(
-                recurring_blocked_time, end_date, check_conflicts, dry_run
-            )
+        # Bestimme Enddatum (offene Serien: rollierender Horizont)
+        until = RecurringBlockedTimeService.materialization_end(recurring_blocked_time)
+        result = RecurringBlockedTimeService._generate_between(
+            recurring_blocked_time,
+            recurring_blocked_time.start_date,
+            until,
+            check_conflicts,
+            dry_run,
+        )
+        if not dry_run:
+            RecurringBlockedTimeService.mark_materialized(recurring_blocked_time, until)
+        return result
 
     @staticmethod
-    def _generate_weekly_blocked_times(
+    def _generate_between(
         recurring_blocked_time: RecurringBlockedTime,
-        end_date: date,
+        start: date,
+        end: date,
         check_conflicts: bool,
         dry_run: bool,
     ) -> dict:
-        """Generiert wöchentliche BlockedTime-Einträge."""
-        active_weekdays = recurring_blocked_time.get_active_weekdays()
-        if not active_weekdays:
-            return {"created": 0, "skipped": 0, "conflicts": [], "preview": []}
-
-        current_date = recurring_blocked_time.start_date
+        """Hilfsmethode: Erstellt die BlockedTime-Einträge der Serie im Zeitraum [start, end]."""
         created = 0
         skipped = 0
         conflicts = []
         preview = []
 
-        while current_date <= end_date:
-            weekday = current_date.weekday()  # 0=Montag, 6=Sonntag
-
-            if weekday in active_weekdays:
-                result = RecurringBlockedTimeService._create_blocked_time_if_not_exists(
-                    recurring_blocked_time, current_date, check_conflicts, dry_run
-                )
-                if result["created"]:
-                    created += 1
-                    if result.get("blocked_time"):
-                        if dry_run:
-                            preview.append(result["blocked_time"])
-                        if result.get("conflicts"):
-                            conflicts.extend(result["conflicts"])
-                elif result["skipped"]:
-                    skipped += 1
-
-            current_date += timedelta(days=1)
+        for blocked_date in recurring_blocked_time.recurrence.between(start, end):
+            result = RecurringBlockedTimeService._create_blocked_time_if_not_exists(
+                recurring_blocked_time, blocked_date, check_conflicts, dry_run
+            )
+            if result["created"]:
+                created += 1
+                if dry_run:
+                    preview.append(result["blocked_time"])
+                conflicts.extend(result["conflicts"])
+            else:
+                skipped += 1
 
         return {
             "created": created,
@@ -115,130 +90,103 @@ class RecurringBlockedTimeService:
         }
 
     @staticmethod
-    def _generate_biweekly_blocked_times(
-        recurring_blocked_time: RecurringBlockedTime,
-        end_date: date,
-        check_conflicts: bool,
-        dry_run: bool,
-    ) -> dict:
-        """Generiert zweiwöchentliche BlockedTime-Einträge (alle 2 Wochen)."""
-        active_weekdays = recurring_blocked_time.get_active_weekdays()
-        if not active_weekdays:
-            return {"created": 0, "skipped": 0, "conflicts": [], "preview": []}
-
-        current_date = recurring_blocked_time.start_date
-        created = 0
-        skipped = 0
-        conflicts = []
-        preview = []
-
-        # Zähle Wochen seit Start
-        week_count = 0
-
-        while current_date <= end_date:
-            weekday = current_date.weekday()
+    def materialization_end(
+        recurring_blocked_time: RecurringBlockedTime, today: date | None = None
+    ) -> date:
+        """
+        Letzter Tag, bis zu dem die Serie jetzt materialisiert wird.
 
-            if weekday in active_weekdays:
-                # Nur jede 2. Woche (gerade Wochennummer)
-                if week_count % 2 == 0:
-                    result = RecurringBlockedTimeService._create_blocked_time_if_not_exists(
-                        recurring_blocked_time, current_date, check_conflicts, dry_run
-                    )
-                    if result["created"]:
-                        created += 1
-                        if result.get("blocked_time"):
-                            if dry_run:
-                                preview.append(result["blocked_time"])
-                            if result.get("conflicts"):
-                                conflicts.extend(result["conflicts"])
-                    elif result["skipped"]:
-                        skipped += 1
-
-            # Wenn wir einen Montag erreichen, erhöhe Wochenzähler
-            if weekday == 0:  # Montag
-                week_count += 1
-
-            current_date += timedelta(days=1)
+        Serien mit Enddatum werden vollständig erzeugt, offene Serien nur bis zum
+        rollierenden Horizont (SERIES_HORIZON_WEEKS Wochen voraus); materialize_series
+        verlängert sie später.
+        """
+        if recurring_blocked_time.end_date:
+            return recurring_blocked_time.end_date
+        if today is None:
+            today = timezone.localdate()
+        return horizon_end(recurring_blocked_time.start_date, today, settings.SERIES_HORIZON_WEEKS)
 
-        return {
-            "created": created,
-            "skipped": skipped,
-            "conflicts": conflicts,
-            "preview": preview if dry_run else [],
-        }
+    @staticmethod
+    def mark_materialized(recurring_blocked_time: RecurringBlockedTime, until: date) -> None:
+        """Speichert den zuletzt materialisierten Tag (ohne save() der Serie)."""
+        RecurringBlockedTime.objects.filter(pk=recurring_blocked_time.pk).update(
+            materialized_until=until
+        )
+        recurring_blocked_time.materialized_until = until
 
     @staticmethod
-    def _generate_monthly_blocked_times(
-        recurring_blocked_time: RecurringBlockedTime,
-        end_date: date,
-        check_conflicts: bool,
-        dry_run: bool,
+    def extend_materialization(
+        recurring_blocked_time: RecurringBlockedTime, today: date | None = None
     ) -> dict:
-        """Generiert monatliche BlockedTime-Einträge (gleicher Kalendertag jeden Monat)."""
-        active_weekdays = recurring_blocked_time.get_active_weekdays()
-        if not active_weekdays:
-            return {"created": 0, "skipped": 0, "conflicts": [], "preview": []}
+        """
+        Erzeugt die Termine zwischen dem zuletzt materialisierten Tag und dem aktuellen Horizont.
 
-        created = 0
-        skipped = 0
-        conflicts = []
-        preview = []
+        Die Serie wird zuerst gesperrt (SELECT ... FOR UPDATE) und neu gelesen, damit
+        gleichzeitige Verlängerungen derselben Serie keine Termine doppelt anlegen.
 
-        # Starte mit dem Startdatum
-        current_date = recurring_blocked_time.start_date
-        start_day = current_date.day  # Tag des Monats (z.B. 15.)
-
-        from calendar import monthrange
-
-        while current_date <= end_date:
-            # Prüfe, ob aktuelles Datum der richtige Tag des Monats ist
-            # UND ob es ein aktiver Wochentag ist
-            target_day = start_day
-            # Wenn der Tag im aktuellen Monat nicht existiert (z.B. 31. Februar),
-            # verwende den letzten Tag des Monats
-            last_day_of_month = monthrange(current_date.year, current_date.month)[1]
-            if start_day > last_day_of_month:
-                target_day = last_day_of_month
-
-            if current_date.day == target_day and current_date.weekday() in active_weekdays:
-                result = RecurringBlockedTimeService._create_blocked_time_if_not_exists(
-                    recurring_blocked_time, current_date, check_conflicts, dry_run
-                )
-                if result["created"]:
-                    created += 1
-                    if result.get("blocked_time"):
-                        if dry_run:
-                            preview.append(result["blocked_time"])
-                        if result.get("conflicts"):
-                            conflicts.extend(result["conflicts"])
-                elif result["skipped"]:
-                    skipped += 1
-
-            # Springe zum nächsten Monat
-            # Berechne den nächsten Monat
-            if current_date.month == 12:
-                next_year = current_date.year + 1
-                next_month = 1
-            else:
-                next_year = current_date.year
-                next_month = current_date.month + 1
+        Returns:
+            Dict mit 'created' und 'skipped' (siehe generate_blocked_times)
+        """
+        with transaction.atomic():
+            current = (
+                RecurringBlockedTime.objects.select_for_update()
+                .filter(pk=recurring_blocked_time.pk)
+                .values("is_active", "materialized_until")
+                .first()
+            )
+            if current is None:
+                return {"created": 0, "skipped": 0}
+            recurring_blocked_time.is_active = current["is_active"]
+            recurring_blocked_time.materialized_until = current["materialized_until"]
+
+            until = RecurringBlockedTimeService.materialization_end(recurring_blocked_time, today)
+            start = recurring_blocked_time.start_date
+            if recurring_blocked_time.materialized_until:
+                start = max(start, recurring_blocked_time.materialized_until + timedelta(days=1))
+            if not recurring_blocked_time.is_active or start > until:
+                return {"created": 0, "skipped": 0}
+
+            result = RecurringBlockedTimeService._generate_between(
+                recurring_blocked_time, start, until, check_conflicts=False, dry_run=False
+            )
+            RecurringBlockedTimeService.mark_materialized(recurring_blocked_time, until)
+        return {"created": result["created"], "skipped": result["skipped"]}
 
-            # Versuche denselben Tag im nächsten Monat
-            last_day_next_month = monthrange(next_year, next_month)[1]
-            target_day_next = min(start_day, last_day_next_month)
+    @staticmethod
+    def extend_all_materializations(today: date | None = None, user=None) -> dict:
+        """
+        Verlängert alle aktiven Serien, deren Materialisierung hinter dem Horizont liegt.
 
-            try:
-                current_date = date(next_year, next_month, target_day_next)
-            except ValueError:
-                # Fallback: letzter Tag des Monats
-                current_date = date(next_year, next_month, last_day_next_month)
+        Args:
+            today: Optional - Stichtag (Standard: heute)
+            user: Optional - nur Serien dieses Benutzers verlängern
 
-        return {
-            "created": created,
-            "skipped": skipped,
-            "conflicts": conflicts,
-            "preview": preview if dry_run else [],
-        }
+        Returns:
+            Dict mit 'series' (Anzahl verlängerter Serien) und 'created'
+        """
+        if today is None:
+            today = timezone.localdate()
+        min_horizon = today + timedelta(weeks=settings.SERIES_HORIZON_WEEKS)
+        candidates = (
+            RecurringBlockedTime.objects.filter(is_active=True)
+            .filter(Q(materialized_until__isnull=True) | Q(materialized_until__lt=min_horizon))
+            .filter(
+                Q(end_date__isnull=True)
+                | Q(materialized_until__isnull=True)
+                | Q(materialized_until__lt=F("end_date"))
+            )
+            .select_related("user")
+        )
+        if user is not None:
+            candidates = candidates.filter(user=user)
+        series = created = 0
+        for recurring_blocked_time in candidates:
+            result = RecurringBlockedTimeService.extend_materialization(
+                recurring_blocked_time, today
+            )
+            series += 1
+            created += result["created"]
+        return {"series": series, "created": created}
 
     @staticmethod
     def _create_blocked_time_if_not_exists(
@@ -285,27 +233,27 @@ class RecurringBlockedTimeService:
             # Prüfe Konflikte mit Lessons (falls gewünscht) - nur Lessons desselben Users
             if check_conflicts:
                 from apps.lessons.models import Lesson
-                from apps.lessons.services import LessonConflictService
 
                 # Finde alle Lessons desselben Users, die mit dieser Blockzeit kollidieren
+                # (Überlappung per SQL auf dem gespeicherten belegten Intervall)
                 conflicting_lessons = Lesson.objects.filter(
-                    date=blocked_date, contract__student__user=recurring_blocked_time.user
+                    date=blocked_date,
+                    owner=recurring_blocked_time.user,
+                    occupied_from__lt=end_datetime,
+                    occupied_until__gt=start_datetime,
                 ).select_related("contract", "contract__student")
 
                 for lesson in conflicting_lessons:
-                    lesson_start, lesson_end = LessonConflictService.calculate_time_block(lesson)
-                    # Prüfe Überlappung
-                    if not (end_datetime <= lesson_start or start_datetime >= lesson_end):
-                        result["conflicts"].append(
-                            {
-                                "lesson": lesson,
-                                "date": blocked_date,
-                                "message": _("Overlap with lesson for {student} ({time})").format(
-                                    student=lesson.contract.student,
-                                    time=lesson.start_time.strftime("%H:%M"),
-                                ),
-                            }
-                        )
+                    result["conflicts"].append(
+                        {
+                            "lesson": lesson,
+                            "date": blocked_date,
+                            "message": _("Overlap with lesson for {student} ({time})").format(
+                                student=lesson.contract.student,
+                                time=lesson.start_time.strftime("%H:%M"),
+                            ),
+                        }
+                    )
 
         return result
 
@@ -324,3 +272,88 @@ class RecurringBlockedTimeService:
             recurring_blocked_time, check_conflicts=False, dry_run=True
         )
         return result.get("preview", [])
+
+    @staticmethod
+    def occurrence_dates_between(
+        recurring_blocked_time: RecurringBlockedTime, start: date, end: date
+    ) -> List[date]:
+        """
+        Berechnet die Termine einer Serie im Fenster [start, end] direkt (ohne Tagesschleife).
+
+        Liefert dieselben Daten wie generate_blocked_times, aber nur für das angefragte
+        Fenster (Expansion über die Recurrence-Regel der Serie). Offene Serien werden auch
+        jenseits des materialisierten Horizonts expandiert.
+        """
+        if not recurring_blocked_time.is_active:
+            return []
+
+        if recurring_blocked_time.end_date:
+            end = min(end, recurring_blocked_time.end_date)
+        return recurring_blocked_time.recurrence.between(start, end)
+
+    @staticmethod
+    def occurrences_between(
+        recurring_blocked_time: RecurringBlockedTime, start: date, end: date
+    ) -> List[BlockedTime]:
+        """
+        Gibt die Termine einer Serie im Fenster [start, end] als (nicht gespeicherte)
+        BlockedTime-Instanzen zurück.
+
+        Args:
+            recurring_blocked_time: Die RecurringBlockedTime-Vorlage
+            start: Erster Tag des Fensters
+            end: Letzter Tag des Fensters
+
+        Returns:
+            Liste von BlockedTime-Instanzen (nicht gespeichert)
+        """
+        return [
+            BlockedTime(
+                user=recurring_blocked_time.user,
+                title=recurring_blocked_time.title,
+                description=recurring_blocked_time.description,
+                start_datetime=timezone.make_aware(
+                    datetime.combine(occurrence, recurring_blocked_time.start_time)
+                ),
+                end_datetime=timezone.make_aware(
+                    datetime.combine(occurrence, recurring_blocked_time.end_time)
+                ),
+                is_recurring=True,
+                recurring_pattern=recurring_blocked_time.recurrence_type,
+            )
+            for occurrence in RecurringBlockedTimeService.occurrence_dates_between(
+                recurring_blocked_time, start, end
+            )
+        ]
+
+    @staticmethod
+    def expand_recurring_between(
+        recurring_blocked_times: Iterable[RecurringBlockedTime],
+        start: date,
+        end: date,
+        existing: Iterable[BlockedTime] = (),
+    ) -> List[BlockedTime]:
+        """
+        Expandiert mehrere Serien für ein Fenster.
+
+        Termine, die bereits als BlockedTime gespeichert sind (gleicher Titel, Start und
+        Ende), werden wie bei der Vorschau übersprungen.
+
+        Args:
+            recurring_blocked_times: RecurringBlockedTime-Vorlagen
+            start: Erster Tag des Fensters
+            end: Letzter Tag des Fensters
+            existing: Bereits geladene BlockedTimes des Fensters
+
+        Returns:
+            Liste von BlockedTime-Instanzen (nicht gespeichert)
+        """
+        seen = {(bt.title, bt.start_datetime, bt.end_datetime) for bt in existing}
+        expanded = []
+        for rbt in recurring_blocked_times:
+            for blocked_time in RecurringBlockedTimeService.occurrences_between(rbt, start, end):
+                key = (blocked_time.title, blocked_time.start_datetime, blocked_time.end_datetime)
+                if key not in seen:
+                    seen.add(key)
+                    expanded.append(blocked_time)
+        return expanded
@@ -78,32 +78,4 @@ def get_all_blocked_times_for_recurring(
 
 def _date_matches_recurring_pattern(blocked_date: date, recurring: RecurringBlockedTime) -> bool:
     """Checks if a date matches the recurrence pattern of a RecurringBlockedTime."""
-    # Check if the date is within the period
-    if blocked_date < recurring.start_date:
-        return False
-
-    if recurring.end_date and blocked_date > recurring.end_date:
-        return False
-
-    # Check if the weekday is active
-    weekday = blocked_date.weekday()  # 0=Monday, 6=Sunday
-    active_weekdays = recurring.get_active_weekdays()
-
-    if weekday not in active_weekdays:
-        return False
-
-    # Check based on recurrence_type
-    if recurring.recurrence_type == "weekly":
-        # Every week - already checked by weekday
-        return True
-
-    elif recurring.recurrence_type == "biweekly":
-        # Every 2 weeks
-        weeks_since_start = (blocked_date - recurring.start_date).days // 7
-        return weeks_since_start % 2 == 0
-
-    elif recurring.recurrence_type == "monthly":
-        # Monthly - same calendar day
-        return blocked_date.day == recurring.start_date.day
-
-    return False
+    return recurring.recurrence.matches(blocked_date)
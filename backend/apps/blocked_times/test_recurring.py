@@ -5,12 +5,16 @@ Tests für RecurringBlockedTime und RecurringBlockedTimeService.
 from datetime import date, datetime, time, timedelta
 
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone, translation
 
 from apps.blocked_times.models import BlockedTime
 from apps.blocked_times.recurring_models import RecurringBlockedTime
 from apps.blocked_times.recurring_service import RecurringBlockedTimeService
+from apps.blocked_times.recurring_utils import (
+    _date_matches_recurring_pattern,
+    get_all_blocked_times_for_recurring,
+)
 
 
 class RecurringBlockedTimeModelTest(TestCase):
@@ -238,3 +242,147 @@ class BlockedTimeCalendarIntegrationTest(TestCase):
             current_date += timedelta(days=1)
 
         self.assertEqual(len(days), 3)  # 15., 16., 17.
+
+
+class RecurringBlockedTimeOccurrencesTest(TestCase):
+    """Tests für die fensterbasierte Terminberechnung (occurrences_between)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="occuser", password="testpass123")
+
+    def _recurring(self, recurrence_type, start_date, end_date=None, **weekdays):
+        return RecurringBlockedTime.objects.create(
+            user=self.user,
+            title=f"Serie {recurrence_type}",
+            start_date=start_date,
+            end_date=end_date,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            recurrence_type=recurrence_type,
+            **weekdays,
+        )
+
+    def test_matches_full_preview(self):
+        """Test: Über den materialisierten Zeitraum identisch mit der Vorschau."""
+        cases = [
+            ("weekly", date(2025, 1, 1), None, {"monday": True, "thursday": True}),
+            ("biweekly", date(2025, 1, 1), None, {"monday": True, "friday": True}),
+            ("biweekly", date(2025, 3, 3), date(2025, 8, 1), {"monday": True, "sunday": True}),
+            ("biweekly", date(2025, 3, 9), date(2025, 8, 1), {"tuesday": True}),
+            ("monthly", date(2025, 1, 31), None, {"monday": True, "friday": True, "sunday": True}),
+        ]
+        for recurrence_type, start_date, end_date, weekdays in cases:
+            recurring = self._recurring(recurrence_type, start_date, end_date, **weekdays)
+            preview = [
+                bt.start_datetime.date()
+                for bt in RecurringBlockedTimeService.preview_blocked_times(recurring)
+            ]
+            dates = RecurringBlockedTimeService.occurrence_dates_between(
+                recurring,
+                date(2024, 1, 1),
+                RecurringBlockedTimeService.materialization_end(recurring),
+            )
+            self.assertEqual(sorted(preview), dates, (recurrence_type, start_date))
+
+    def test_window_is_bounded(self):
+        """Test: Nur Termine innerhalb des Fensters werden erzeugt."""
+        recurring = self._recurring("weekly", date(2025, 1, 1), None, wednesday=True)
+        occurrences = RecurringBlockedTimeService.occurrences_between(
+            recurring, date(2025, 6, 2), date(2025, 6, 8)
+        )
+        self.assertEqual(len(occurrences), 1)
+        self.assertEqual(
+            occurrences[0].start_datetime,
+            timezone.make_aware(datetime(2025, 6, 4, 9, 0)),
+        )
+        self.assertIsNone(occurrences[0].pk)
+
+    def test_existing_blocked_times_are_skipped(self):
+        """Test: Bereits gespeicherte Termine werden nicht doppelt expandiert."""
+        recurring = self._recurring("weekly", date(2025, 1, 1), None, wednesday=True)
+        existing = BlockedTime.objects.create(
+            user=self.user,
+            title=recurring.title,
+            start_datetime=timezone.make_aware(datetime(2025, 6, 4, 9, 0)),
+            end_datetime=timezone.make_aware(datetime(2025, 6, 4, 10, 0)),
+        )
+        expanded = RecurringBlockedTimeService.expand_recurring_between(
+            [recurring], date(2025, 6, 2), date(2025, 6, 15), existing=[existing]
+        )
+        self.assertEqual([bt.start_datetime.date() for bt in expanded], [date(2025, 6, 11)])
+
+    def test_matcher_agrees_with_generator(self):
+        """Test: Generierte Termine werden ihrer Serie zugeordnet (auch zweiwöchentlich ab Mittwoch)."""
+        cases = [
+            ("biweekly", date(2025, 3, 5), {"tuesday": True, "wednesday": True}),
+            ("monthly", date(2025, 1, 31), {"friday": True, "monday": True}),
+        ]
+        for recurrence_type, start_date, weekdays in cases:
+            recurring = self._recurring(recurrence_type, start_date, date(2025, 12, 31), **weekdays)
+            RecurringBlockedTimeService.generate_blocked_times(recurring, check_conflicts=False)
+            generated = BlockedTime.objects.filter(title=recurring.title)
+            self.assertTrue(generated.exists())
+            for blocked_time in generated:
+                local_date = timezone.localtime(blocked_time.start_datetime).date()
+                self.assertTrue(_date_matches_recurring_pattern(local_date, recurring), local_date)
+            self.assertEqual(len(get_all_blocked_times_for_recurring(recurring)), generated.count())
+
+
+@override_settings(SERIES_HORIZON_WEEKS=4)
+class RecurringBlockedTimeHorizonTest(TestCase):
+    """Tests für den rollierenden Horizont offener Serien."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="horizonuser", password="testpass123")
+        self.today = timezone.localdate()
+        self.monday = self.today - timedelta(days=self.today.weekday())
+        self.recurring = RecurringBlockedTime.objects.create(
+            user=self.user,
+            title="Offene Serie",
+            start_date=self.monday,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            recurrence_type="weekly",
+            monday=True,
+        )
+
+    def test_open_series_is_materialized_up_to_horizon(self):
+        """Test: Offene Serien werden nur bis zum Horizont erzeugt und verlängert."""
+        result = RecurringBlockedTimeService.generate_blocked_times(
+            self.recurring, check_conflicts=False
+        )
+
+        horizon = self.today + timedelta(weeks=4)
+        self.assertEqual(result["created"], len(range(0, (horizon - self.monday).days + 1, 7)))
+        self.recurring.refresh_from_db()
+        self.assertEqual(self.recurring.materialized_until, horizon)
+
+        # Zwei Wochen später: nur die neuen Termine werden ergänzt
+        later = self.today + timedelta(weeks=2)
+        result = RecurringBlockedTimeService.extend_materialization(self.recurring, later)
+        self.assertEqual(result["created"], 2)
+        self.assertEqual(self.recurring.materialized_until, later + timedelta(weeks=4))
+        self.assertEqual(
+            BlockedTime.objects.filter(title="Offene Serie").count(),
+            len(get_all_blocked_times_for_recurring(self.recurring)),
+        )
+
+    def test_extend_all_skips_finished_series(self):
+        """Test: Serien mit erreichtem Enddatum werden nicht erneut geladen."""
+        RecurringBlockedTimeService.generate_blocked_times(self.recurring, check_conflicts=False)
+        finished = RecurringBlockedTime.objects.create(
+            user=self.user,
+            title="Beendet",
+            start_date=self.monday,
+            end_date=self.monday + timedelta(weeks=1),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            monday=True,
+        )
+        RecurringBlockedTimeService.generate_blocked_times(finished, check_conflicts=False)
+
+        result = RecurringBlockedTimeService.extend_all_materializations(
+            self.today + timedelta(weeks=1)
+        )
+
+        self.assertEqual(result, {"series": 1, "created": 1})
@@ -232,29 +232,21 @@ class BlockedTimeCreateView(LoginRequiredMixin, CreateView):
             # Recalculate conflicts for affected lessons
             recalculate_conflicts_for_blocked_time(blocked_time)
 
-            conflicts = []
             from apps.lessons.models import Lesson
-            from apps.lessons.services import LessonConflictService
 
-            # Check conflicts with lessons
-            conflicting_lessons = Lesson.objects.filter(
+            # Check conflicts with lessons (overlap on the stored occupied interval)
+            conflict_count = Lesson.objects.filter(
                 date=blocked_time.start_datetime.date(),
-                contract__student__user=self.request.user,
-            ).select_related("contract", "contract__student")
-
-            for lesson in conflicting_lessons:
-                lesson_start, lesson_end = LessonConflictService.calculate_time_block(lesson)
-                if not (
-                    blocked_time.end_datetime <= lesson_start
-                    or blocked_time.start_datetime >= lesson_end
-                ):
-                    conflicts.append(lesson)
-
-            if conflicts:
+                owner=self.request.user,
+                occupied_from__lt=blocked_time.end_datetime,
+                occupied_until__gt=blocked_time.start_datetime,
+            ).count()
+
+            if conflict_count:
                 messages.warning(
                     self.request,
                     _("Blocked time created, but {count} conflict(s) detected!").format(
-                        count=len(conflicts)
+                        count=conflict_count
                     ),
                 )
             else:
@@ -106,7 +106,7 @@ def _compute_carried_over_before(contract: Contract, before_year: int, before_mo
 
 def get_institute_tier_progress(user, institute_name: str) -> dict | None:
     from apps.contracts.tutorspace_compensation import TIERS
-    from apps.core.models import UserProfile
+    from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
 
     config = InstituteTierConfig.objects.filter(
         user=user, institute_name__iexact=institute_name
@@ -125,19 +125,18 @@ def get_institute_tier_progress(user, institute_name: str) -> dict | None:
     else:
         return None
 
-    qs = Session.objects.filter(
-        contract__student__user=user,
-        contract__institute__iexact=institute_name,
-        status__in=["taught", "paid"],
-    )
-
     if institute_name.lower() == "tutorspace":
-        profile = UserProfile.objects.filter(user=user).first()
-        tier_from = getattr(profile, "tutorspace_tier_count_from", None) if profile else None
-        if tier_from is not None:
-            qs = qs.filter(date__gte=tier_from)
-
-    total_minutes = qs.aggregate(total=Sum("duration_minutes"))["total"] or 0
+        # The TutorSpace ledger already applies tutorspace_tier_count_from and no-shows
+        total_minutes = TutorSpaceLedgerService.total_minutes(user.pk)
+    else:
+        total_minutes = (
+            Session.objects.filter(
+                owner=user,
+                contract__institute__iexact=institute_name,
+                status__in=["taught", "paid"],
+            ).aggregate(total=Sum("duration_minutes"))["total"]
+            or 0
+        )
     total_hours = round(total_minutes / 60.0, 2)
 
     sorted_tiers = sorted(tiers, key=lambda t: t["hours_from"])
@@ -157,7 +156,7 @@ def get_institute_tier_progress(user, institute_name: str) -> dict | None:
 
     today = date.today()
     recent_qs = Session.objects.filter(
-        contract__student__user=user,
+        owner=user,
         contract__institute__iexact=institute_name,
         status__in=["taught", "paid"],
         date__gte=today - timedelta(days=90),
@@ -7,6 +7,7 @@ from django.test import TestCase
 from apps.contracts.institute_utils import TUTORSPACE_INSTITUTE_NAME
 from apps.contracts.models import Contract
 from apps.contracts.tutorspace_compensation import (
+    TutorSpaceTierTimeline,
     _tutorspace_minutes_before_session,
     calculate_tutorspace_amount_for_session,
     tutorspace_rate_for_hour_index,
@@ -217,3 +218,45 @@ class TutorSpaceCompensationCumulativeTest(TestCase):
         )
         amount = calculate_tutorspace_amount_for_session(next_lesson, tutor=self.tutor)
         self.assertEqual(amount, Decimal("13.00"))
+
+    def test_timeline_prices_like_per_session_calculation(self):
+        """One loaded timeline gives the same amounts as pricing each session on its own."""
+        UserProfile.objects.update_or_create(
+            user=self.tutor, defaults={"tutor_no_show_pay_percent": 50}
+        )
+        start_day = date(2025, 1, 1)
+        lessons = []
+        for i in range(80):
+            lessons.append(
+                Lesson.objects.create(
+                    contract=self.c1 if i % 2 == 0 else self.c2,
+                    date=start_day + timedelta(days=i),
+                    start_time=time(10, 0),
+                    duration_minutes=90 if i % 7 == 0 else 45,
+                    status="taught",
+                    tutor_no_show=i % 11 == 5,
+                )
+            )
+        lessons.append(
+            Lesson.objects.create(
+                contract=self.c2,
+                date=start_day + timedelta(days=30),
+                start_time=time(10, 0),
+                duration_minutes=60,
+                status="planned",
+            )
+        )
+
+        expected = [
+            calculate_tutorspace_amount_for_session(lesson, tutor=self.tutor) for lesson in lessons
+        ]
+        with self.assertNumQueries(2):
+            timeline = TutorSpaceTierTimeline.for_tutor(self.tutor)
+        with self.assertNumQueries(0):
+            amounts = [
+                calculate_tutorspace_amount_for_session(lesson, tutor=self.tutor, timeline=timeline)
+                for lesson in lessons
+            ]
+        self.assertEqual(amounts, expected)
+        # The tier boundary at 50 hours falls inside the history
+        self.assertGreater(timeline.prefix[-1], 50 * 60)
@@ -14,12 +14,13 @@ The calculation is done in minutes to correctly handle non-60-minute sessions.
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from decimal import Decimal
 
 from django.contrib.auth.models import User
 
-from apps.contracts.institute_utils import TUTORSPACE_INSTITUTE_NAME, is_tutorspace_institute
+from apps.contracts.institute_utils import is_tutorspace_institute
 from apps.core.models import UserProfile
 
 
@@ -75,80 +76,36 @@ def tutorspace_rate_for_cumulative_minute(cumulative_minute_0_based: int) -> Dec
     return tutorspace_rate_for_hour_index(hour_index)
 
 
-def _tutorspace_session_precedes_in_tier_order(a, b) -> bool:
+def _tier_order_key(session) -> tuple:
     """
-    True if session a counts before b in the global TutorSpace tier timeline.
+    Sort key of a session in the global TutorSpace tier timeline.
 
     Order: (date, start_time, created_at, pk). Using created_at avoids relying only on pk
     when several lessons share the same clock slot (e.g. backfilled or two pupils same time).
+    Sessions without created_at (unsaved) sort after those with one in the same slot.
     """
-    if a.date != b.date:
-        return a.date < b.date
-    if a.start_time != b.start_time:
-        return a.start_time < b.start_time
-    ca = getattr(a, "created_at", None)
-    cb = getattr(b, "created_at", None)
-    if ca is not None and cb is not None and ca != cb:
-        return ca < cb
-    if ca is not None and cb is None:
-        return True
-    if ca is None and cb is not None:
-        return False
-    ap = getattr(a, "pk", None) or 0
-    bp = getattr(b, "pk", None) or 0
-    return ap < bp
-
-
-def _tutorspace_minutes_before_session(session, tutor: User) -> int:
-    """
-    Sum duration_minutes of TutorSpace sessions (taught/paid, tutor_no_show=False) strictly
-    before ``session`` in tier order.
-
-    Note: a tutor_no_show session is not in this queryset but still gets a correct total from
-    rows that precede it in time order.
-
-    If the tutor's profile has ``tutorspace_tier_count_from`` set, only sessions on or after
-    that date participate in the tier pool (earlier TutorSpace lessons are ignored for tiers).
-    """
-    from apps.lessons.models import Session  # local import to avoid circulars
-
-    profile = UserProfile.objects.filter(user=tutor).first()
-    tier_from = getattr(profile, "tutorspace_tier_count_from", None) if profile else None
-
-    qs = Session.objects.filter(
-        contract__student__user=tutor,
-        contract__institute__iexact=TUTORSPACE_INSTITUTE_NAME,
-        status__in=["taught", "paid"],
-        tutor_no_show=False,
-    )
-    if tier_from is not None:
-        qs = qs.filter(date__gte=tier_from)
-    qs = qs.order_by("date", "start_time", "created_at", "pk").only(
-        "id", "date", "start_time", "duration_minutes", "created_at"
+    created_at = getattr(session, "created_at", None)
+    return (
+        session.date,
+        session.start_time,
+        created_at is None,
+        created_at,
+        getattr(session, "pk", None) or 0,
     )
 
-    total = 0
-    for row in qs:
-        if _tutorspace_session_precedes_in_tier_order(row, session):
-            total += int(row.duration_minutes or 0)
-    return total
 
+def _no_show_pay_percent(tutor: User | int) -> int:
+    """Share of the usual pay the tutor keeps for a tutor_no_show session (0..100)."""
+    pct = (
+        UserProfile.objects.filter(user=tutor)
+        .values_list("tutor_no_show_pay_percent", flat=True)
+        .first()
+    )
+    return max(0, min(100, int(pct or 0)))
 
-def calculate_tutorspace_amount_for_session(session, tutor: User) -> Decimal:
-    """
-    Calculate the TutorSpace compensation amount for one session.
 
-    - Uses cumulative minutes from all TutorSpace sessions (taught/paid) of the tutor,
-      excluding tutor_no_show for tier progression, in order (date, start_time, created_at, pk).
-    - Splits the session duration across tier boundaries when needed.
-    """
-    if not session or not tutor:
-        return Decimal("0.00")
-    contract = getattr(session, "contract", None)
-    if not contract or not is_tutorspace_institute(getattr(contract, "institute", None)):
-        raise ValueError("Session is not a TutorSpace session")
-
-    minutes_before = _tutorspace_minutes_before_session(session, tutor)
+def _amount_for_minutes_before(session, minutes_before: int, no_show_pay_percent: int) -> Decimal:
+    """TutorSpace compensation for a session starting at ``minutes_before`` pool minutes."""
     duration = int(getattr(session, "duration_minutes", 0) or 0)
     if duration <= 0:
         return Decimal("0.00")
@@ -158,24 +115,17 @@ def calculate_tutorspace_amount_for_session(session, tutor: User) -> Decimal:
     remaining = duration
     cursor = minutes_before
 
-    def next_boundary_after(minute_index: int) -> int | None:
-        for b in boundaries:
-            if b > minute_index:
-                return b
-        return None
-
     while remaining > 0:
         rate = tutorspace_rate_for_cumulative_minute(cursor)
-        nb = next_boundary_after(cursor)
+        index = bisect_right(boundaries, cursor)
+        nb = boundaries[index] if index < len(boundaries) else None
         chunk = remaining if nb is None else min(remaining, nb - cursor)
         amount += (Decimal(chunk) / Decimal("60")) * rate
         cursor += chunk
         remaining -= chunk
 
     if getattr(session, "tutor_no_show", False):
-        profile = UserProfile.objects.filter(user=tutor).first()
-        pct = int(getattr(profile, "tutor_no_show_pay_percent", 0) or 0) if profile else 0
-        pct = max(0, min(100, pct))
+        pct = no_show_pay_percent
         base = amount
         if pct >= 100:
             pass  # full TutorSpace amount despite flag
@@ -185,3 +135,94 @@ def calculate_tutorspace_amount_for_session(session, tutor: User) -> Decimal:
             amount = base * (Decimal(pct) / Decimal("100")) - base
 
     return amount.quantize(Decimal("0.01"))
+
+
+@dataclass(frozen=True)
+class TutorSpaceTierTimeline:
+    """
+    Ordered TutorSpace tier pool of one tutor with cumulative minute prefix sums.
+
+    ``keys`` are the tier order keys of the counted sessions (taught/paid, tutor_no_show=False,
+    on or after ``tutorspace_tier_count_from``); ``prefix[i]`` is the sum of the durations of
+    the first i sessions. Loading reads the tutor's TutorSpace ledger (two queries); pricing a
+    session is a binary search, so N sessions are priced in O(N log N).
+    """
+
+    keys: list[tuple]
+    prefix: list[int]
+    no_show_pay_percent: int = 0
+
+    @classmethod
+    def for_tutor(cls, tutor: User | int) -> TutorSpaceTierTimeline:
+        """Loads the tier timeline of a tutor (User or user id)."""
+        from apps.lessons.models import TutorSpaceLedgerEntry  # local import to avoid circulars
+
+        rows = (
+            TutorSpaceLedgerEntry.objects.filter(tutor=tutor)
+            .order_by("date", "start_time", "session_created_at", "session_id")
+            .values_list("date", "start_time", "session_created_at", "session_id", "minutes")
+        )
+        keys = []
+        prefix = [0]
+        for day, start_time, created_at, session_id, minutes in rows:
+            keys.append((day, start_time, False, created_at, session_id))
+            prefix.append(prefix[-1] + minutes)
+        return cls(keys=keys, prefix=prefix, no_show_pay_percent=_no_show_pay_percent(tutor))
+
+    def minutes_before(self, session) -> int:
+        """Counted minutes strictly before ``session`` in tier order."""
+        return self.prefix[bisect_left(self.keys, _tier_order_key(session))]
+
+    def amount_for_session(self, session) -> Decimal:
+        """TutorSpace compensation for one session (see calculate_tutorspace_amount_for_session)."""
+        return _amount_for_minutes_before(
+            session, self.minutes_before(session), self.no_show_pay_percent
+        )
+
+
+def _tutorspace_minutes_before_session(session, tutor: User | int) -> int:
+    """
+    Sum duration_minutes of TutorSpace sessions (taught/paid, tutor_no_show=False) strictly
+    before ``session`` in tier order.
+
+    Note: a tutor_no_show session is not in the pool but still gets a correct total from
+    rows that precede it in time order.
+
+    If the tutor's profile has ``tutorspace_tier_count_from`` set, only sessions on or after
+    that date participate in the tier pool (earlier TutorSpace lessons are ignored for tiers).
+
+    Reads the closest earlier row of the tutor's TutorSpace ledger, so the cost does not grow
+    with the tutor's history.
+    """
+    from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
+
+    return TutorSpaceLedgerService.minutes_before(getattr(tutor, "pk", tutor), session)
+
+
+def calculate_tutorspace_amount_for_session(
+    session, tutor: User | int, timeline: TutorSpaceTierTimeline | None = None
+) -> Decimal:
+    """
+    Calculate the TutorSpace compensation amount for one session.
+
+    - Uses cumulative minutes from all TutorSpace sessions (taught/paid) of the tutor,
+      excluding tutor_no_show for tier progression, in order (date, start_time, created_at, pk).
+    - Splits the session duration across tier boundaries when needed.
+
+    Without a ``timeline`` the position is read from the TutorSpace ledger (two queries).
+    When pricing several sessions of the same tutor, pass a ``timeline`` loaded once with
+    TutorSpaceTierTimeline.for_tutor.
+    """
+    if not session or not tutor:
+        return Decimal("0.00")
+    contract = getattr(session, "contract", None)
+    if not contract or not is_tutorspace_institute(getattr(contract, "institute", None)):
+        raise ValueError("Session is not a TutorSpace session")
+
+    if timeline is not None:
+        return timeline.amount_for_session(session)
+    return _amount_for_minutes_before(
+        session,
+        _tutorspace_minutes_before_session(session, tutor),
+        _no_show_pay_percent(tutor),
+    )
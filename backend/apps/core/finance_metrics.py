@@ -93,7 +93,7 @@ def taught_hours(user: User, year: int, month: int) -> float:
     start_d, end_d = _month_range(year, month)
     mins = (
         Lesson.objects.filter(
-            contract__student__user=user,
+            owner=user,
             date__gte=start_d,
             date__lt=end_d,
             status__in=("taught", "paid"),
@@ -108,7 +108,7 @@ def paid_hours(user: User, year: int, month: int) -> float:
     start_d, end_d = _month_range(year, month)
     mins = (
         Lesson.objects.filter(
-            contract__student__user=user,
+            owner=user,
             date__gte=start_d,
             date__lt=end_d,
             status=InvoiceStatus.PAID,
@@ -122,7 +122,7 @@ def lesson_count_taught_or_paid(user: User, year: int, month: int) -> int:
     """Count of lessons with status in (taught, paid). Owner-scoped."""
     start_d, end_d = _month_range(year, month)
     return Lesson.objects.filter(
-        contract__student__user=user,
+        owner=user,
         date__gte=start_d,
         date__lt=end_d,
         status__in=("taught", "paid"),
@@ -202,17 +202,18 @@ def taught_not_invoiced(user: User, year: int, month: int) -> dict:
 
     start_d, end_d = _month_range(year, month)
     taught = Lesson.objects.filter(
-        contract__student__user=user,
+        owner=user,
         date__gte=start_d,
         date__lt=end_d,
         status__in=("taught", "paid"),
     ).select_related("contract")
     count = 0
     value = Decimal("0")
+    tier_timelines = {}
     for les in taught:
         if not InvoiceItem.objects.filter(lesson=les).exists():
             count += 1
-            value += IncomeSelector._calculate_lesson_amount(les)
+            value += IncomeSelector._calculate_lesson_amount(les, tier_timelines)
     return {"count": count, "value": value}
 
 
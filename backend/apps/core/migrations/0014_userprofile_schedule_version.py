@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0013_expense_business_use_percent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="schedule_version",
+            field=models.BigIntegerField(
+                default=0,
+                editable=False,
+                help_text="Changes with every schedule write; part of the booking week cache keys",
+            ),
+        ),
+    ]
@@ -98,6 +98,11 @@ class UserProfile(models.Model):
             "(can make the preview look ‘too high’ if you have many older sessions)."
         ),
     )
+    schedule_version = models.BigIntegerField(
+        default=0,
+        editable=False,
+        help_text=_("Changes with every schedule write; part of the booking week cache keys"),
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
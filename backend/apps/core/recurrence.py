@@ -0,0 +1,177 @@
+"""
+Recurrence rules for series of sessions and blocked times.
+
+A Recurrence is a small subset of an iCalendar RRULE (RFC 5545): FREQ=WEEKLY or
+FREQ=MONTHLY with INTERVAL, BYDAY, BYMONTHDAY, WKST and UNTIL, anchored at DTSTART.
+Occurrences are computed arithmetically (jump to each active weekday, then step 7 or
+14 days; one date per month for monthly rules) and cached per rule and window.
+
+Deviation from RFC 5545: a monthly BYMONTHDAY that does not exist in a month (e.g. 31
+in April) falls back to the last day of the month instead of skipping the month.
+"""
+
+import heapq
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Week start of bi-weekly blocked times: the generator used to count the Mondays passed
+# since the series start, i.e. a new week begins on every Tuesday.
+BLOCKED_TIME_WKST = 1
+
+_EXPANSION_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """
+    Recurrence rule of a series.
+
+    Attributes:
+        dtstart: First day of the series
+        freq: "WEEKLY" or "MONTHLY"
+        byday: Active weekdays (0=Monday, 6=Sunday), sorted
+        interval: Every n-th week (weekly rules only)
+        until: Last day of the series (inclusive) or None
+        wkst: First weekday of a week when counting intervals
+        bymonthday: Day of month for monthly rules (defaults to dtstart.day)
+    """
+
+    dtstart: date
+    freq: str
+    byday: tuple[int, ...]
+    interval: int = 1
+    until: date | None = None
+    wkst: int = 0
+    bymonthday: int | None = None
+
+    @classmethod
+    def from_series(
+        cls,
+        recurrence_type: str,
+        start_date: date,
+        end_date: date | None,
+        weekdays: Iterable[int],
+        wkst: int | None = None,
+    ) -> "Recurrence":
+        """
+        Builds the rule for a series model ("weekly", "biweekly" or "monthly").
+
+        Unknown types are treated as weekly. wkst defaults to the weekday of start_date,
+        so bi-weekly weeks are 7-day blocks counted from the series start.
+        """
+        byday = tuple(sorted(set(weekdays)))
+        if recurrence_type == "monthly":
+            return cls(start_date, "MONTHLY", byday, until=end_date, bymonthday=start_date.day)
+        return cls(
+            start_date,
+            "WEEKLY",
+            byday,
+            interval=2 if recurrence_type == "biweekly" else 1,
+            until=end_date,
+            wkst=start_date.weekday() if wkst is None else wkst,
+        )
+
+    @classmethod
+    def from_rrule(cls, rrule: str, dtstart: date) -> "Recurrence":
+        """Parses the RRULE value produced by to_rrule (with or without the 'RRULE:' prefix)."""
+        parts = dict(part.split("=", 1) for part in rrule.removeprefix("RRULE:").split(";") if part)
+        until = parts.get("UNTIL")
+        return cls(
+            dtstart,
+            parts["FREQ"],
+            tuple(sorted(WEEKDAY_CODES.index(code) for code in parts["BYDAY"].split(","))),
+            interval=int(parts.get("INTERVAL", 1)),
+            until=date(int(until[:4]), int(until[4:6]), int(until[6:8])) if until else None,
+            wkst=WEEKDAY_CODES.index(parts.get("WKST", "MO")),
+            bymonthday=int(parts["BYMONTHDAY"]) if "BYMONTHDAY" in parts else None,
+        )
+
+    def to_rrule(self) -> str:
+        """RRULE value of the rule (DTSTART is not part of it)."""
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        parts.append("BYDAY=" + ",".join(WEEKDAY_CODES[d] for d in self.byday))
+        if self.freq == "MONTHLY":
+            parts.append(f"BYMONTHDAY={self.month_day}")
+        else:
+            parts.append(f"WKST={WEEKDAY_CODES[self.wkst]}")
+        if self.until:
+            parts.append(f"UNTIL={self.until:%Y%m%d}")
+        return ";".join(parts)
+
+    @property
+    def month_day(self) -> int:
+        return self.bymonthday or self.dtstart.day
+
+    def week_index(self, day: date) -> int:
+        """Number of weeks (starting on wkst) between dtstart and day."""
+        offset = (self.dtstart.weekday() - self.wkst) % 7
+        return ((day - self.dtstart).days + offset) // 7
+
+    def monthly_date(self, year: int, month: int) -> date:
+        """Occurrence day in a month, clamped to the end of the month."""
+        return date(year, month, min(self.month_day, monthrange(year, month)[1]))
+
+    def matches(self, day: date) -> bool:
+        """Checks in O(1) whether day is an occurrence."""
+        if day < self.dtstart or (self.until and day > self.until):
+            return False
+        if day.weekday() not in self.byday:
+            return False
+        if self.freq == "MONTHLY":
+            return day == self.monthly_date(day.year, day.month)
+        return self.week_index(day) % self.interval == 0
+
+    def between(self, start: date, end: date) -> list[date]:
+        """Occurrences in [start, end] in ascending order (cached per rule and window)."""
+        return list(_expand(self, start, end))
+
+    def iter_between(self, start: date, end: date) -> Iterator[date]:
+        """Uncached variant of between."""
+        first = max(start, self.dtstart)
+        last = min(end, self.until) if self.until else end
+        if not self.byday or first > last:
+            return
+
+        if self.freq == "MONTHLY":
+            year, month = first.year, first.month
+            while date(year, month, 1) <= last:
+                occurrence = self.monthly_date(year, month)
+                if first <= occurrence <= last and occurrence.weekday() in self.byday:
+                    yield occurrence
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            return
+
+        step = timedelta(days=7 * self.interval)
+        sequences = []
+        for weekday in self.byday:
+            current = first + timedelta(days=(weekday - first.weekday()) % 7)
+            skip = -self.week_index(current) % self.interval
+            sequences.append(_arithmetic_dates(current + timedelta(days=7 * skip), last, step))
+        yield from heapq.merge(*sequences)
+
+
+def horizon_end(dtstart: date, today: date, weeks: int) -> date:
+    """
+    Last day of a rolling horizon: weeks ahead of today, or of dtstart for series
+    that have not started yet.
+    """
+    return max(today, dtstart) + timedelta(weeks=weeks)
+
+
+@lru_cache(maxsize=_EXPANSION_CACHE_SIZE)
+def _expand(recurrence: Recurrence, start: date, end: date) -> tuple[date, ...]:
+    return tuple(recurrence.iter_between(start, end))
+
+
+def _arithmetic_dates(first: date, last: date, step: timedelta) -> Iterator[date]:
+    current = first
+    while current <= last:
+        yield current
+        current += step
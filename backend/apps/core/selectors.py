@@ -12,7 +12,10 @@ from django.db.models import Q, Sum
 from apps.billing.models import InvoiceItem
 from apps.contracts.institute_utils import is_abacus_institute, is_tutorspace_institute
 from apps.contracts.models import ContractMonthlyPlan
-from apps.contracts.tutorspace_compensation import calculate_tutorspace_amount_for_session
+from apps.contracts.tutorspace_compensation import (
+    TutorSpaceTierTimeline,
+    calculate_tutorspace_amount_for_session,
+)
 from apps.lessons.models import Lesson
 
 
@@ -30,20 +33,32 @@ class IncomeSelector:
     """
 
     @staticmethod
-    def _calculate_lesson_amount(lesson: Lesson) -> Decimal:
+    def _calculate_lesson_amount(
+        lesson: Lesson, tier_timelines: dict[int, TutorSpaceTierTimeline] | None = None
+    ) -> Decimal:
         """
         Berechnet den Betrag für eine Lesson mit der gleichen Logik wie InvoiceService.
 
         Args:
             lesson: Lesson-Instanz
+            tier_timelines: Optional - Dict Tutor-ID → TutorSpaceTierTimeline; in Schleifen
+                übergeben, damit die TutorSpace-Historie pro Tutor nur einmal geladen wird
 
         Returns:
             Betrag als Decimal
         """
         contract = lesson.contract
         if is_tutorspace_institute(getattr(contract, "institute", None)):
-            tutor = contract.student.user
-            return calculate_tutorspace_amount_for_session(lesson, tutor=tutor)
+            tutor_id = lesson.owner_id
+            timeline = None
+            if tier_timelines is not None:
+                timeline = tier_timelines.get(tutor_id)
+                if timeline is None:
+                    timeline = TutorSpaceTierTimeline.for_tutor(tutor_id)
+                    tier_timelines[tutor_id] = timeline
+            return calculate_tutorspace_amount_for_session(
+                lesson, tutor=tutor_id, timeline=timeline
+            )
 
         unit_duration = Decimal(str(contract.unit_duration_minutes))
         lesson_duration = Decimal(str(lesson.duration_minutes))
@@ -57,7 +72,9 @@ class IncomeSelector:
         return amount
 
     @staticmethod
-    def _get_lesson_amount(lesson: Lesson) -> Decimal:
+    def _get_lesson_amount(
+        lesson: Lesson, tier_timelines: dict[int, TutorSpaceTierTimeline] | None = None
+    ) -> Decimal:
         """
         Gibt den Betrag für eine Lesson zurück.
 
@@ -67,6 +84,7 @@ class IncomeSelector:
 
         Args:
             lesson: Lesson-Instanz
+            tier_timelines: Optional - siehe _calculate_lesson_amount
 
         Returns:
             Betrag als Decimal
@@ -74,7 +92,7 @@ class IncomeSelector:
         invoiced_total = InvoiceItem.objects.filter(lesson=lesson).aggregate(s=Sum("amount"))["s"]
         if invoiced_total is not None:
             return invoiced_total
-        return IncomeSelector._calculate_lesson_amount(lesson)
+        return IncomeSelector._calculate_lesson_amount(lesson, tier_timelines)
 
     @staticmethod
     def get_monthly_income(year: int, month: int, status: str = "paid", user: User = None) -> dict:
@@ -117,15 +135,16 @@ class IncomeSelector:
             date__gte=start_date, date__lt=end_date, status=status
         ).select_related("contract")
         if user:
-            lessons_qs = lessons_qs.filter(contract__student__user=user)
+            lessons_qs = lessons_qs.filter(owner=user)
         lessons = lessons_qs
 
         total_income = Decimal("0.00")
         lesson_count = 0
         contract_details = {}
+        tier_timelines = {}
 
         for lesson in lessons:
-            lesson_income = IncomeSelector._get_lesson_amount(lesson)
+            lesson_income = IncomeSelector._get_lesson_amount(lesson, tier_timelines)
             total_income += lesson_income
             lesson_count += 1
 
@@ -183,15 +202,16 @@ class IncomeSelector:
             "contract"
         )
         if user:
-            lessons_qs = lessons_qs.filter(contract__student__user=user)
+            lessons_qs = lessons_qs.filter(owner=user)
         lessons = lessons_qs
 
         actual_units = lessons.count()
         actual_amount = Decimal("0.00")
+        tier_timelines = {}
 
         for lesson in lessons:
             # Use central calculation method (same logic as InvoiceService)
-            actual_amount += IncomeSelector._calculate_lesson_amount(lesson)
+            actual_amount += IncomeSelector._calculate_lesson_amount(lesson, tier_timelines)
 
         return {
             "year": year,
@@ -258,10 +278,11 @@ class IncomeSelector:
 
         lessons_qs = Lesson.objects.filter(query).select_related("contract")
         if user:
-            lessons_qs = lessons_qs.filter(contract__student__user=user)
+            lessons_qs = lessons_qs.filter(owner=user)
         lessons = lessons_qs
 
         status_breakdown = {}
+        tier_timelines = {}
         for status_code, status_name in Lesson.STATUS_CHOICES:
             status_lessons = lessons.filter(status=status_code)
             total_income = Decimal("0.00")
@@ -269,7 +290,7 @@ class IncomeSelector:
 
             for lesson in status_lessons:
                 # Use central calculation method (same logic as InvoiceService)
-                total_income += IncomeSelector._get_lesson_amount(lesson)
+                total_income += IncomeSelector._get_lesson_amount(lesson, tier_timelines)
 
             status_breakdown[status_code] = {
                 "name": status_name,
@@ -314,7 +335,7 @@ class IncomeSelector:
             query & Q(id__in=invoiced_lesson_ids)
         ).select_related("contract")
         if user:
-            invoiced_lessons_qs = invoiced_lessons_qs.filter(contract__student__user=user)
+            invoiced_lessons_qs = invoiced_lessons_qs.filter(owner=user)
         invoiced_lessons = invoiced_lessons_qs
 
         # Lessons without InvoiceItem with status TAUGHT (not invoiced, but taught)
@@ -324,19 +345,20 @@ class IncomeSelector:
             .select_related("contract")
         )
         if user:
-            not_invoiced_qs = not_invoiced_qs.filter(contract__student__user=user)
+            not_invoiced_qs = not_invoiced_qs.filter(owner=user)
         not_invoiced_lessons = not_invoiced_qs
 
         # Calculate income
         # For invoiced lessons: amounts from InvoiceItems (Single Source of Truth)
         invoiced_income = Decimal("0.00")
+        tier_timelines = {}
         for lesson in invoiced_lessons:
-            invoiced_income += IncomeSelector._get_lesson_amount(lesson)
+            invoiced_income += IncomeSelector._get_lesson_amount(lesson, tier_timelines)
 
         # For not invoiced lessons: calculate with same logic as InvoiceService
         not_invoiced_income = Decimal("0.00")
         for lesson in not_invoiced_lessons:
-            not_invoiced_income += IncomeSelector._calculate_lesson_amount(lesson)
+            not_invoiced_income += IncomeSelector._calculate_lesson_amount(lesson, tier_timelines)
 
         return {
             "invoiced": {
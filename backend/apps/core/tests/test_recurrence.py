@@ -0,0 +1,108 @@
+"""
+Tests for the shared recurrence rules.
+"""
+
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import combinations
+
+from django.test import SimpleTestCase
+
+from apps.core.recurrence import BLOCKED_TIME_WKST, Recurrence
+
+
+def _day_by_day(series_start, series_end, weekdays, recurrence_type, count_mondays):
+    """Reference: the former per-day loops of the session and blocked-time generators."""
+    dates = []
+    current = series_start
+    mondays = 0
+    while current <= series_end:
+        if current.weekday() in weekdays:
+            if recurrence_type == "biweekly":
+                if count_mondays:
+                    week = mondays
+                else:
+                    week = (current - series_start).days // 7
+                if week % 2 == 0:
+                    dates.append(current)
+            elif recurrence_type == "monthly":
+                last = monthrange(current.year, current.month)[1]
+                if current.day == min(series_start.day, last):
+                    dates.append(current)
+            else:
+                dates.append(current)
+        if current.weekday() == 0:
+            mondays += 1
+        current += timedelta(days=1)
+    return dates
+
+
+class RecurrenceTest(SimpleTestCase):
+    def _rule(self, recurrence_type, series_start, series_end, weekdays, count_mondays):
+        return Recurrence.from_series(
+            recurrence_type,
+            series_start,
+            series_end,
+            weekdays,
+            wkst=BLOCKED_TIME_WKST if count_mondays else None,
+        )
+
+    def test_between_and_matches_agree_with_day_by_day_loop(self):
+        weekday_sets = [{0}, {6}, {0, 3}, {1, 4, 6}, {0, 1, 2, 3, 4, 5, 6}]
+        starts = [date(2025, 1, 1) + timedelta(days=i) for i in range(7)] + [date(2024, 1, 31)]
+        for recurrence_type in ("weekly", "biweekly", "monthly"):
+            for count_mondays in (False, True):
+                for series_start in starts:
+                    for weekdays in weekday_sets:
+                        series_end = series_start + timedelta(days=400)
+                        rule = self._rule(
+                            recurrence_type, series_start, series_end, weekdays, count_mondays
+                        )
+                        expected = _day_by_day(
+                            series_start, series_end, weekdays, recurrence_type, count_mondays
+                        )
+                        case = (recurrence_type, count_mondays, series_start, weekdays)
+                        self.assertEqual(
+                            rule.between(date(2020, 1, 1), date(2030, 1, 1)), expected, case
+                        )
+                        matched = [
+                            series_start + timedelta(days=i)
+                            for i in range(-7, 410)
+                            if rule.matches(series_start + timedelta(days=i))
+                        ]
+                        self.assertEqual(matched, expected, case)
+
+    def test_window_equals_slice_of_full_series(self):
+        rule = Recurrence.from_series("biweekly", date(2025, 3, 5), date(2026, 3, 5), {0, 2})
+        full = rule.between(date(2025, 1, 1), date(2027, 1, 1))
+        for window_start, window_end in combinations(
+            [date(2025, 1, 1), date(2025, 3, 10), date(2025, 7, 14), date(2026, 1, 1)], 2
+        ):
+            self.assertEqual(
+                rule.between(window_start, window_end),
+                [d for d in full if window_start <= d <= window_end],
+            )
+
+    def test_rrule_round_trip(self):
+        cases = [
+            (Recurrence.from_series("weekly", date(2025, 1, 1), None, {0, 3}), None),
+            (
+                Recurrence.from_series("biweekly", date(2025, 1, 1), date(2025, 6, 30), {4}),
+                "FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;WKST=WE;UNTIL=20250630",
+            ),
+            (
+                Recurrence.from_series("monthly", date(2025, 1, 31), None, {0, 4}),
+                "FREQ=MONTHLY;BYDAY=MO,FR;BYMONTHDAY=31",
+            ),
+        ]
+        for rule, expected in cases:
+            if expected:
+                self.assertEqual(rule.to_rrule(), expected)
+            self.assertEqual(Recurrence.from_rrule("RRULE:" + rule.to_rrule(), rule.dtstart), rule)
+
+    def test_no_weekdays_or_empty_range(self):
+        rule = Recurrence.from_series("weekly", date(2025, 1, 1), date(2025, 12, 31), [])
+        self.assertEqual(rule.between(date(2025, 1, 1), date(2025, 12, 31)), [])
+        self.assertFalse(rule.matches(date(2025, 1, 6)))
+        rule = Recurrence.from_series("weekly", date(2025, 2, 1), date(2025, 1, 1), [0])
+        self.assertEqual(rule.between(date(2025, 1, 1), date(2025, 12, 31)), [])
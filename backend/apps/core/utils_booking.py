@@ -24,7 +24,9 @@ def get_tutor_for_booking(tutor_token: str | None = None) -> User | None:
     """
     if tutor_token:
         try:
-            profile = UserProfile.objects.get(public_booking_token=tutor_token)
+            profile = UserProfile.objects.select_related("user").get(
+                public_booking_token=tutor_token
+            )
             return profile.user
         except UserProfile.DoesNotExist:
             pass
@@ -35,6 +35,7 @@ from apps.core.forms import (
 from apps.core.models import Expense, UserProfile
 from apps.core.selectors import IncomeSelector
 from apps.core.utils_booking import ensure_public_booking_token
+from apps.lessons.recurring_service import extend_series_of_user
 from apps.lessons.services import LessonConflictService, SessionQueryService
 from apps.lessons.status_service import SessionStatusUpdater
 
@@ -55,24 +56,26 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Automatic status update for past sessions
-        SessionStatusUpdater.update_past_sessions_to_taught()
+        # Catch up the user's open-ended series (full sweep: materialize_series)
+        extend_series_of_user(self.request.user)
+        # Catch up the status of the user's past sessions (full sweep: mark_taught)
+        SessionStatusUpdater.update_past_sessions_to_taught(user=self.request.user)
 
         now = timezone.now()
         user = self.request.user
 
         # Today's sessions
-        today_sessions = SessionQueryService.get_today_sessions(user=user)
-        for session in today_sessions:
-            session.conflicts = LessonConflictService.check_conflicts(session)
+        today_sessions = list(SessionQueryService.get_today_sessions(user=user))
 
         # Upcoming sessions
-        upcoming_sessions = SessionQueryService.get_upcoming_sessions(days=7, user=user)
-        for session in upcoming_sessions:
-            session.conflicts = LessonConflictService.check_conflicts(session)
+        upcoming_sessions = list(SessionQueryService.get_upcoming_sessions(days=7, user=user))
+
+        # Read conflicts for all shown sessions from the conflict store
+        all_sessions = today_sessions + upcoming_sessions
+        conflicts_by_session = LessonConflictService.get_stored_conflicts(all_sessions)
+        for session in all_sessions:
+            session.conflicts = conflicts_by_session.get(session.pk, [])
 
-        # Count conflicts (convert both QuerySets to lists for combination)
-        all_sessions = list(today_sessions) + list(upcoming_sessions)
         conflict_count = sum(1 for session in all_sessions if session.conflicts)
 
         # Income for current month
@@ -115,8 +118,10 @@ class IncomeOverviewView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Automatic status update for past sessions
-        SessionStatusUpdater.update_past_sessions_to_taught()
+        # Catch up the user's open-ended series (full sweep: materialize_series)
+        extend_series_of_user(self.request.user)
+        # Catch up the status of the user's past sessions (full sweep: mark_taught)
+        SessionStatusUpdater.update_past_sessions_to_taught(user=self.request.user)
 
         now = timezone.now()
 
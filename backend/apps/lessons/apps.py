@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LessonsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.lessons"
+
+    def ready(self):
+        from apps.lessons import signals  # noqa: F401
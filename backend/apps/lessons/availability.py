@@ -0,0 +1,170 @@
+"""
+Minutengenaue Belegungskarte eines Tages für die Slot-Berechnung.
+
+Lessons (inkl. Wegzeiten), Blockzeiten und synthetische Travel-Policy-Blöcke werden
+in ein Array mit 1440 Minuten eingetragen. Über Präfixsummen ist die Prüfung
+„ist das Fenster [start, start + Dauer) frei?“ für jede Startzeit O(1), unabhängig
+von der Anzahl belegter Intervalle.
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from django.utils import timezone
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def time_to_minute(value: time) -> int:
+    """Minute des Tages (abgerundet)."""
+    return value.hour * 60 + value.minute
+
+
+def time_to_minute_ceil(value: time) -> int:
+    """Minute des Tages (aufgerundet, time.max -> 1440)."""
+    minute = value.hour * 60 + value.minute
+    if value.second or value.microsecond:
+        minute += 1
+    return minute
+
+
+def minute_to_time(minute: int) -> time:
+    """Minute des Tages als time (1440 wird zu 00:00 wie bei datetime.time())."""
+    minute %= MINUTES_PER_DAY
+    return time(minute // 60, minute % 60)
+
+
+class DayOccupancy:
+    """Belegung eines Tages als Minuten-Array mit Präfixsummen."""
+
+    def __init__(self, occupied: Iterable[Tuple[time, time]] = ()):
+        self._minutes = bytearray(MINUTES_PER_DAY)
+        self._prefix = None
+        for start, end in occupied:
+            self.occupy(start, end)
+
+    def occupy(self, start: time, end: time) -> None:
+        """
+        Markiert [start, end) als belegt.
+
+        Eine Minute gilt als belegt, sobald das Intervall sie berührt; für Slots mit
+        ganzzahligen Minuten entspricht das exakt dem Überlappungstest
+        ``not (slot_end <= start or slot_start >= end)``.
+        """
+        first = time_to_minute(start)
+        last = time_to_minute_ceil(end)
+        if last <= first:
+            return
+        self._minutes[first:last] = b"\x01" * (last - first)
+        self._prefix = None
+
+    def _prefix_sums(self) -> List[int]:
+        if self._prefix is None:
+            self._prefix = [0, *accumulate(self._minutes)]
+        return self._prefix
+
+    def is_free(self, start_minute: int, end_minute: int) -> bool:
+        """True, wenn keine Minute in [start_minute, end_minute) belegt ist."""
+        prefix = self._prefix_sums()
+        return prefix[end_minute] - prefix[start_minute] == 0
+
+    def free_slots(
+        self,
+        working_hours: List[Dict[str, str]],
+        duration_minutes: int,
+        step_minutes: int = 30,
+        earliest_minute: int = 0,
+    ) -> List[Tuple[time, time]]:
+        """
+        Freie Slots innerhalb der Arbeitszeiten.
+
+        Startzeiten laufen im Raster step_minutes ab Beginn jedes Arbeitsblocks; ein Slot
+        wird nur aufgenommen, wenn das komplette Fenster frei ist und der Start nicht vor
+        earliest_minute liegt.
+        """
+        slots = []
+        for period_start, period_end in parse_working_hours(working_hours):
+            slot_start = period_start
+            while slot_start + duration_minutes <= period_end:
+                if slot_start >= earliest_minute and self.is_free(
+                    slot_start, slot_start + duration_minutes
+                ):
+                    slots.append(
+                        (minute_to_time(slot_start), minute_to_time(slot_start + duration_minutes))
+                    )
+                slot_start += step_minutes
+        return slots
+
+
+def merge_intervals(occupied: Iterable[Tuple[time, time]]) -> List[Tuple[int, int]]:
+    """
+    Sortiert belegte Intervalle und verschmilzt sie zu disjunkten Minuten-Intervallen.
+
+    Rundung wie bei DayOccupancy.occupy (Start abgerundet, Ende aufgerundet).
+    """
+    intervals = sorted((time_to_minute(start), time_to_minute_ceil(end)) for start, end in occupied)
+    merged: List[Tuple[int, int]] = []
+    for start, end in intervals:
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def iter_free_slots(
+    merged: List[Tuple[int, int]],
+    working_hours: List[Dict[str, str]],
+    duration_minutes: int,
+    step_minutes: int = 30,
+    earliest_minute: int = 0,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Freie Slots (Minuten) eines Tages in zeitlicher Reihenfolge, lazy.
+
+    Gleiche Rasterung wie DayOccupancy.free_slots; die Prüfung je Startzeit ist eine
+    Binärsuche über die Enden der verschmolzenen Intervalle.
+    """
+    starts = [start for start, _end in merged]
+    ends = [end for _start, end in merged]
+    for period_start, period_end in sorted(parse_working_hours(working_hours)):
+        slot_start = period_start
+        while slot_start + duration_minutes <= period_end:
+            if slot_start >= earliest_minute:
+                i = bisect_right(ends, slot_start)
+                if i == len(starts) or starts[i] >= slot_start + duration_minutes:
+                    yield slot_start, slot_start + duration_minutes
+            slot_start += step_minutes
+
+
+def parse_working_hours(working_hours: List[Dict[str, str]]) -> List[Tuple[int, int]]:
+    """Wandelt [{"start": "HH:MM", "end": "HH:MM"}] in Minuten-Paare; ungültige Einträge entfallen."""
+    periods = []
+    for work_period in working_hours:
+        try:
+            period_start = datetime.strptime(work_period.get("start", "00:00"), "%H:%M").time()
+            period_end = datetime.strptime(work_period.get("end", "23:59"), "%H:%M").time()
+        except ValueError:
+            continue
+        periods.append((time_to_minute(period_start), time_to_minute(period_end)))
+    return periods
+
+
+def earliest_bookable_minute(target_date: date, lead_minutes: int = 30) -> int | None:
+    """
+    Erste buchbare Minute an target_date (jetzt + Vorlauf, in lokaler Zeit).
+
+    Returns:
+        0 für zukünftige Tage, die Minute für heute, None wenn der Tag vorbei ist
+    """
+    earliest = timezone.localtime(timezone.now() + timedelta(minutes=lead_minutes))
+    if target_date > earliest.date():
+        return 0
+    if target_date < earliest.date():
+        return None
+    return time_to_minute_ceil(earliest.time())
@@ -0,0 +1,156 @@
+"""
+Cache and ETags for booking week payloads.
+
+Cache keys: tutor, week (Monday ISO), language, time bucket and a per-tutor schedule
+version. The version is bumped whenever a session, series, blocked time, recurring blocked
+time or the tutor's profile is saved or deleted (see apps.lessons.signals), so stale weeks are
+never served; old entries simply expire. It is stored on UserProfile rather than in the
+cache: the default cache is per process, and writes in one web worker (or the job worker)
+must invalidate the weeks cached by all others.
+
+ETags are derived from the database instead (row counts and max updated_at per table),
+so they are identical across processes and survive cache evictions.
+"""
+
+import hashlib
+import time as _time
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+
+from django.db.models import Count, Max
+from django.utils import timezone, translation
+from django.utils.cache import patch_cache_control
+
+from apps.lessons.availability import time_to_minute_ceil
+
+WEEK_CACHE_TIMEOUT_SECONDS = 3600
+BOOKING_LEAD_MINUTES = 30
+
+
+def get_schedule_version(user_id: int) -> int:
+    """Current schedule version of a tutor (0 without profile)."""
+    from apps.core.models import UserProfile
+
+    version = (
+        UserProfile.objects.filter(user_id=user_id)
+        .values_list("schedule_version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_schedule_version(user_id: int | None) -> None:
+    """
+    Invalidate all cached weeks of a tutor.
+
+    The new version is a timestamp, so it never repeats even if a full profile save wrote
+    back an older value in between (the profile's post_save bumps again afterwards).
+    """
+    from apps.core.models import UserProfile
+
+    if user_id is None:
+        return
+    UserProfile.objects.filter(user_id=user_id).update(schedule_version=_time.time_ns())
+
+
+def _time_bucket(week_start: date) -> str:
+    """
+    Part of the key that captures the dependency on "now".
+
+    Weeks entirely after the earliest bookable moment do not depend on the clock; the week
+    containing it changes with every minute (slots before now + lead time disappear).
+    """
+    earliest = timezone.localtime(timezone.now() + timedelta(minutes=BOOKING_LEAD_MINUTES))
+    week_end = week_start + timedelta(days=6)
+    if week_start > earliest.date():
+        return "future"
+    if week_end < earliest.date():
+        return "past"
+    return f"{earliest.date().isoformat()}:{time_to_minute_ceil(earliest.time())}"
+
+
+def week_cache_key(user_id: int, week_start: date) -> str:
+    """
+    Cache key for a week; build it before computing the payload so that a write during
+    the computation stores the result under an already outdated version.
+    """
+    return ":".join(
+        [
+            "pb_week",
+            str(user_id),
+            week_start.isoformat(),
+            translation.get_language() or "",
+            _time_bucket(week_start),
+            str(get_schedule_version(user_id)),
+        ]
+    )
+
+
+def _aggregate(queryset) -> str:
+    agg = queryset.aggregate(count=Count("pk"), last=Max("updated_at"))
+    last = agg["last"].isoformat() if agg["last"] else ""
+    return f"{agg['count']}@{last}"
+
+
+def week_etag(
+    user_id: int,
+    week_start: date,
+    student_id: int | None = None,
+    contract_id: int | None = None,
+    exclude_lesson_id: int | None = None,
+) -> str:
+    """
+    Strong ETag for a booking week of a tutor.
+
+    Fingerprint: count and max updated_at of the week's sessions, overlapping blocked
+    times, the tutor's series (unmaterialized dates are projected into the week), recurring
+    blocked times and the profile; for student-specific payloads also the student's
+    contracts and the student.
+    """
+    from apps.blocked_times.models import BlockedTime
+    from apps.blocked_times.recurring_models import RecurringBlockedTime
+    from apps.contracts.models import Contract
+    from apps.core.models import UserProfile
+    from apps.lessons.models import Session
+    from apps.lessons.recurring_models import RecurringSession
+    from apps.students.models import Student
+
+    week_end = week_start + timedelta(days=6)
+    range_start = timezone.make_aware(datetime.combine(week_start, dt_time.min))
+    range_end = timezone.make_aware(datetime.combine(week_end, dt_time.max))
+
+    parts = [
+        str(user_id),
+        week_start.isoformat(),
+        translation.get_language() or "",
+        timezone.localdate().isoformat(),
+        _time_bucket(week_start),
+        str(student_id or ""),
+        str(contract_id or ""),
+        str(exclude_lesson_id or ""),
+        _aggregate(
+            Session.objects.filter(owner_id=user_id, date__gte=week_start, date__lte=week_end)
+        ),
+        _aggregate(
+            BlockedTime.objects.filter(
+                user_id=user_id, start_datetime__lt=range_end, end_datetime__gt=range_start
+            )
+        ),
+        _aggregate(RecurringSession.objects.filter(owner_id=user_id)),
+        _aggregate(RecurringBlockedTime.objects.filter(user_id=user_id)),
+        _aggregate(UserProfile.objects.filter(user_id=user_id)),
+    ]
+    if student_id is not None:
+        parts += [
+            _aggregate(Contract.objects.filter(student_id=student_id)),
+            _aggregate(Student.objects.filter(pk=student_id)),
+        ]
+    digest = hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def apply_week_etag(response, etag: str):
+    """Attach the week ETag; clients must revalidate before reusing the payload."""
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -6,15 +6,27 @@ from collections import defaultdict
 from datetime import date, datetime, time, timedelta
 from typing import Dict, List, Tuple
 
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.blocked_times.models import BlockedTime
 from apps.blocked_times.recurring_models import RecurringBlockedTime
 from apps.blocked_times.recurring_service import RecurringBlockedTimeService
+from apps.lessons.availability import (
+    DayOccupancy,
+    earliest_bookable_minute,
+    iter_free_slots,
+    merge_intervals,
+    minute_to_time,
+    time_to_minute,
+    time_to_minute_ceil,
+)
 from apps.lessons.conflict_service import LessonConflictService
 from apps.lessons.models import Lesson
-from apps.lessons.travel_policy import get_synthetic_occupied_for_date
+from apps.lessons.recurring_models import RecurringSession
+from apps.lessons.recurring_service import RecurringSessionService
+from apps.lessons.travel_policy import TravelPolicy
 
 
 class BookingService:
@@ -27,6 +39,8 @@ class BookingService:
         """
         Gibt alle belegten Zeitslots für einen Vertrag zurück (inkl. Wegzeiten).
 
+        Berücksichtigt nur Lessons und Blockzeiten des Vertragsinhabers (Tutor).
+
         Args:
             contract_id: ID des Vertrags
             start_date: Startdatum
@@ -35,77 +49,17 @@ class BookingService:
         Returns:
             Dict[date, List[Tuple[start_time, end_time]]] - belegte Zeitslots pro Tag
         """
-        occupied = defaultdict(list)
+        from apps.contracts.models import Contract
 
-        # Load all lessons in the period (including from other contracts, as travel times are relevant)
-        lessons = Lesson.objects.filter(date__gte=start_date, date__lte=end_date).select_related(
-            "contract", "contract__student"
+        # Lessons of all contracts of the owner count (travel times), other tenants do not
+        owner_id = (
+            Contract.objects.filter(pk=contract_id)
+            .values_list("student__user_id", flat=True)
+            .first()
         )
-
-        for lesson in lessons:
-            start_datetime, end_datetime = LessonConflictService.calculate_time_block(lesson)
-            occupied[lesson.date].append((start_datetime.time(), end_datetime.time()))
-
-        # Lade Blockzeiten im Zeitraum
-        start_datetime = timezone.make_aware(datetime.combine(start_date, time.min))
-        end_datetime = timezone.make_aware(datetime.combine(end_date, time.max))
-        blocked_times = BlockedTime.objects.filter(
-            start_datetime__lt=end_datetime, end_datetime__gt=start_datetime
-        ).order_by("start_datetime")
-
-        # Lade wiederkehrende Blockzeiten und generiere temporäre Blockzeiten für den Zeitraum
-        recurring_blocked_times = RecurringBlockedTime.objects.filter(
-            start_date__lte=end_date, end_date__gte=start_date, is_active=True
-        ) | RecurringBlockedTime.objects.filter(
-            start_date__lte=end_date, end_date__isnull=True, is_active=True
-        )
-
-        # Füge Vorschau-Blockzeiten aus wiederkehrenden Blockzeiten hinzu
-        for rbt in recurring_blocked_times:
-            generated_blocked_times_preview = RecurringBlockedTimeService.preview_blocked_times(rbt)
-            for bt_preview in generated_blocked_times_preview:
-                # Filter nur für den Zeitraum
-                if start_date <= bt_preview.start_datetime.date() <= end_date:
-                    blocked_times = list(blocked_times) + [bt_preview]
-
-        for blocked_time in blocked_times:
-            # Convert to local timezone for correct time extraction
-            local_start_datetime = timezone.localtime(blocked_time.start_datetime)
-            local_end_datetime = timezone.localtime(blocked_time.end_datetime)
-
-            current_date = local_start_datetime.date()
-            end_date_bt = local_end_datetime.date()
-
-            while current_date <= end_date_bt and current_date <= end_date:
-                if current_date >= start_date:
-                    # Calculate the actual time range for this specific day
-                    if current_date == local_start_datetime.date():
-                        # First day: from start time to end of day or end time
-                        if current_date == end_date_bt:
-                            # Same day: use actual start and end time
-                            day_start_time = local_start_datetime.time()
-                            day_end_time = local_end_datetime.time()
-                        else:
-                            # Multi-day: from start time to end of day
-                            day_start_time = local_start_datetime.time()
-                            day_end_time = time.max
-                    elif current_date == end_date_bt:
-                        # Last day: from start of day to end time
-                        day_start_time = time.min
-                        day_end_time = local_end_datetime.time()
-                    else:
-                        # Middle days: full day
-                        day_start_time = time.min
-                        day_end_time = time.max
-
-                    occupied[current_date].append((day_start_time, day_end_time))
-                current_date += timedelta(days=1)
-
-        # Sortiere Zeitslots pro Tag
-        for day in occupied:
-            occupied[day].sort()
-
-        return dict(occupied)
+        if owner_id is None:
+            return {}
+        return BookingService.get_all_occupied_time_slots(start_date, end_date, user=owner_id)
 
     @staticmethod
     def is_time_slot_available(
@@ -138,6 +92,95 @@ class BookingService:
 
     _SLOT_STEP_MINUTES = 30  # Start times on 30-min grid
 
+    _WEEKDAY_NAMES = [
+        "monday",
+        "tuesday",
+        "wednesday",
+        "thursday",
+        "friday",
+        "saturday",
+        "sunday",
+    ]
+
+    @staticmethod
+    def lock_tutor_schedule(user):
+        """
+        Sperrt das UserProfile des Tutors (SELECT ... FOR UPDATE).
+
+        Serialisiert Buchungen und Umbuchungen pro Tutor: zwei gleichzeitige Requests
+        können so nicht denselben Slot prüfen und beide buchen. Nur innerhalb von
+        transaction.atomic() aufrufen.
+
+        Returns:
+            Das gesperrte UserProfile oder None
+        """
+        from apps.core.models import UserProfile
+
+        return UserProfile.objects.select_for_update().filter(user=user).first()
+
+    @staticmethod
+    def check_slot(
+        target_date: date,
+        start_time: time,
+        end_time: time,
+        user,
+        profile=None,
+        exclude_lesson_id: int | None = None,
+        max_alternatives: int = 10,
+    ) -> Dict:
+        """
+        Prüft einen Slot in einem Durchgang gegen die Belegung des Tages.
+
+        Lessons und Blockzeiten des Tages werden einmal geladen; ist ein Profil mit
+        aktiver Travel-Policy (Vor-Ort) übergeben, zählen deren Blöcke ebenfalls.
+        Alternativen stammen aus derselben Belegungskarte.
+
+        Returns:
+            Dict mit:
+            - 'available': bool
+            - 'reason': None, 'occupied' oder 'travel_policy'
+            - 'alternative_slots': List[Tuple[time, time]] (nur wenn nicht verfügbar)
+        """
+        occupied = BookingService.get_all_occupied_time_slots(
+            target_date, target_date, user=user, exclude_lesson_id=exclude_lesson_id
+        )
+        occupancy = DayOccupancy(occupied.get(target_date, []))
+        start_minute = time_to_minute(start_time)
+        end_minute = time_to_minute(end_time)
+
+        reason = None
+        if not occupancy.is_free(start_minute, end_minute):
+            reason = "occupied"
+
+        day_working_hours = []
+        if profile is not None:
+            working_hours = getattr(profile, "default_working_hours", None) or {}
+            day_working_hours = working_hours.get(
+                BookingService._WEEKDAY_NAMES[target_date.weekday()], []
+            )
+            travel_policy = TravelPolicy.for_profile(profile)
+            if reason is None and not travel_policy.allows(target_date, start_time, end_time):
+                reason = "travel_policy"
+            for block_start, block_end in travel_policy.blocks_for(target_date):
+                occupancy.occupy(block_start, block_end)
+
+        alternatives = []
+        if reason is not None:
+            earliest_minute = earliest_bookable_minute(target_date)
+            if earliest_minute is not None:
+                alternatives = occupancy.free_slots(
+                    day_working_hours,
+                    end_minute - start_minute,
+                    step_minutes=BookingService._SLOT_STEP_MINUTES,
+                    earliest_minute=earliest_minute,
+                )[:max_alternatives]
+
+        return {
+            "available": reason is None,
+            "reason": reason,
+            "alternative_slots": alternatives,
+        }
+
     @staticmethod
     def get_available_time_slots(
         target_date: date,
@@ -149,41 +192,21 @@ class BookingService:
         Return available time slots. Each slot spans slot_duration_minutes.
         Start times iterate on 30-min grid. A slot is only added if the full
         block (start -> start+duration) is free within working hours.
-        """
-        available = []
-        now = timezone.now()
-        min_booking_datetime = now + timedelta(minutes=30)
-        step = BookingService._SLOT_STEP_MINUTES
-
-        for work_period in working_hours:
-            start_str = work_period.get("start", "00:00")
-            end_str = work_period.get("end", "23:59")
-            try:
-                period_start = datetime.strptime(start_str, "%H:%M").time()
-                period_end = datetime.strptime(end_str, "%H:%M").time()
-            except ValueError:
-                continue
-
-            current = datetime.combine(target_date, period_start)
-            period_end_dt = datetime.combine(target_date, period_end)
-
-            while current + timedelta(minutes=slot_duration_minutes) <= period_end_dt:
-                slot_start = current.time()
-                slot_end = (current + timedelta(minutes=slot_duration_minutes)).time()
-
-                slot_datetime = timezone.make_aware(datetime.combine(target_date, slot_start))
-                if slot_datetime < min_booking_datetime:
-                    current += timedelta(minutes=step)
-                    continue
-
-                if BookingService.is_time_slot_available(
-                    target_date, slot_start, slot_end, occupied_slots
-                ):
-                    available.append((slot_start, slot_end))
 
-                current += timedelta(minutes=step)
-
-        return available
+        The day's occupied intervals are rasterized once into a minute
+        occupancy map, so each candidate is an O(1) window test.
+        """
+        earliest_minute = earliest_bookable_minute(target_date)
+        if earliest_minute is None:
+            return []
+
+        occupancy = DayOccupancy(occupied_slots.get(target_date, []))
+        return occupancy.free_slots(
+            working_hours,
+            slot_duration_minutes,
+            step_minutes=BookingService._SLOT_STEP_MINUTES,
+            earliest_minute=earliest_minute,
+        )
 
     @staticmethod
     def get_week_booking_data(
@@ -229,10 +252,10 @@ class BookingService:
         student_id = None
         owner_user = None
         unit_duration = 60
-        contract = Contract.objects.select_related("student").filter(pk=contract_id).first()
+        contract = Contract.objects.select_related("student__user").filter(pk=contract_id).first()
         if contract:
             student_id = contract.student_id
-            owner_user = contract.student.user_id
+            owner_user = contract.student.user
             unit_duration = contract.unit_duration_minutes
 
         busy_per_day = (
@@ -289,24 +312,44 @@ class BookingService:
         user,
         student_id: int | None,
         exclude_lesson_id: int | None = None,
+        schedule: Tuple[List, List] | None = None,
     ) -> Dict[date, List[dict]]:
         """
         Build busy_intervals per day with own/other distinction.
         Returns Dict[date, List[{start, end, own, label?}]].
+        schedule: optional (lessons, blocked_times) from _load_schedule, already user-scoped.
         """
         result = defaultdict(list)
 
         if not user:
             return dict(result)
 
-        lessons_qs = Lesson.objects.filter(
-            date__gte=week_start, date__lte=week_end, contract__student__user=user
-        ).select_related("contract", "contract__student")
-        if exclude_lesson_id:
-            lessons_qs = lessons_qs.exclude(pk=exclude_lesson_id)
-        lessons = lessons_qs
+        if schedule is None:
+            schedule = BookingService._load_schedule(
+                week_start, week_end, user=user, exclude_lesson_id=exclude_lesson_id
+            )
+        lessons, blocked_times = schedule
 
         today = timezone.now().date()
+        reschedulable_own = [
+            lesson
+            for lesson in lessons
+            if student_id is not None
+            and lesson.pk is not None
+            and lesson.contract.student_id == student_id
+            and lesson.status == "planned"
+            and lesson.date >= today
+        ]
+        # Feature flag and series membership are resolved once for all own lessons
+        has_reschedule = False
+        series_by_lesson = {}
+        if reschedulable_own:
+            from apps.core.feature_flags import Feature, user_has_feature
+            from apps.lessons.recurring_utils import find_matching_recurring_sessions
+
+            has_reschedule = user_has_feature(user, Feature.FEATURE_PUBLIC_RESCHEDULE)
+            series_by_lesson = find_matching_recurring_sessions(reschedulable_own)
+
         for lesson in lessons:
             start_dt, end_dt = LessonConflictService.calculate_time_block(lesson)
             start_str = start_dt.time().strftime("%H:%M")
@@ -316,17 +359,15 @@ class BookingService:
             if is_own:
                 interval["label"] = lesson.contract.student.full_name
                 interval["lesson_id"] = lesson.id
-                can_reschedule = lesson.status == "planned" and lesson.date >= today
-                from apps.core.feature_flags import Feature, user_has_feature
-
-                has_reschedule = user_has_feature(user, Feature.FEATURE_PUBLIC_RESCHEDULE)
+                # Not yet materialized series dates have no lesson to move or cancel
+                can_reschedule = (
+                    lesson.pk is not None and lesson.status == "planned" and lesson.date >= today
+                )
                 interval["reschedulable"] = can_reschedule and has_reschedule
                 interval["reschedule_locked"] = can_reschedule and not has_reschedule
                 interval["cancellable"] = can_reschedule
                 if can_reschedule:
-                    from apps.lessons.recurring_utils import find_matching_recurring_session
-
-                    recurring = find_matching_recurring_session(lesson)
+                    recurring = series_by_lesson.get(lesson.id)
                     interval["in_series"] = recurring is not None
                     interval["recurring_lesson_id"] = recurring.id if recurring else None
                 else:
@@ -334,31 +375,7 @@ class BookingService:
                     interval["recurring_lesson_id"] = None
             result[lesson.date].append(interval)
 
-        start_datetime = timezone.make_aware(datetime.combine(week_start, time.min))
-        end_datetime = timezone.make_aware(datetime.combine(week_end, time.max))
-        blocked_qs = BlockedTime.objects.filter(
-            user=user,
-            start_datetime__lt=end_datetime,
-            end_datetime__gt=start_datetime,
-        ).order_by("start_datetime")
-
-        recurring_qs = RecurringBlockedTime.objects.filter(
-            user=user,
-            start_date__lte=week_end,
-            end_date__gte=week_start,
-            is_active=True,
-        ) | RecurringBlockedTime.objects.filter(
-            user=user,
-            start_date__lte=week_end,
-            end_date__isnull=True,
-            is_active=True,
-        )
-        for rbt in recurring_qs:
-            for bt in RecurringBlockedTimeService.preview_blocked_times(rbt):
-                if week_start <= bt.start_datetime.date() <= week_end:
-                    blocked_qs = list(blocked_qs) + [bt]
-
-        for bt in blocked_qs:
+        for bt in blocked_times:
             local_start = timezone.localtime(bt.start_datetime)
             local_end = timezone.localtime(bt.end_datetime)
             d = local_start.date()
@@ -386,6 +403,8 @@ class BookingService:
             result[d].sort(key=lambda x: (x["start"], x["end"]))
         return dict(result)
 
+    MAX_RANGE_WEEKS = 8
+
     @staticmethod
     def get_public_booking_data(
         year: int,
@@ -411,13 +430,42 @@ class BookingService:
             - 'week_end': date
             - 'days': List[Dict] mit Daten für jeden Tag
         """
+        return BookingService.get_public_booking_range(
+            date(year, month, day),
+            weeks=1,
+            user=user,
+            student_id=student_id,
+            exclude_lesson_id=exclude_lesson_id,
+        )[0]
+
+    @staticmethod
+    def get_public_booking_range(
+        target_date: date,
+        weeks: int = 1,
+        user=None,
+        student_id: int | None = None,
+        exclude_lesson_id: int | None = None,
+    ) -> List[Dict]:
+        """
+        Wie get_public_booking_data, aber für mehrere aufeinanderfolgende Wochen.
+
+        Lessons, Blockzeiten und wiederkehrende Blockzeiten werden einmal für den
+        gesamten Zeitraum geladen und danach pro Woche aufgeteilt.
+
+        Args:
+            target_date: Ein Tag der ersten Woche
+            weeks: Anzahl Wochen (1 bis MAX_RANGE_WEEKS)
+
+        Returns:
+            Liste von Wochen-Dicts im Format von get_public_booking_data
+        """
         from apps.contracts.models import Contract
         from apps.core.models import UserProfile
         from apps.lessons.utils_dates import add_days_to_date, get_week_start
 
-        target_date = date(year, month, day)
-        week_start = get_week_start(target_date)
-        week_end = add_days_to_date(week_start, 6)
+        weeks = max(1, min(weeks, BookingService.MAX_RANGE_WEEKS))
+        range_start = get_week_start(target_date)
+        range_end = add_days_to_date(range_start, 7 * weeks - 1)
 
         unit_duration = 60
         if student_id and user:
@@ -436,33 +484,28 @@ class BookingService:
         if profile and getattr(profile, "default_working_hours", None):
             working_hours = profile.default_working_hours
 
+        schedule = BookingService._load_schedule(
+            range_start, range_end, user=user, exclude_lesson_id=exclude_lesson_id
+        )
         occupied_slots = BookingService.get_all_occupied_time_slots(
-            week_start, week_end, user=user, exclude_lesson_id=exclude_lesson_id
+            range_start, range_end, schedule=schedule
         )
-        weekday_names = [
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ]
-        if profile and getattr(profile, "default_booking_location", "online") == "vor_ort":
-            policy = getattr(profile, "travel_policy", None) or {}
-            if policy.get("enabled"):
-                for i in range(7):
-                    d = week_start + timedelta(days=i)
-                    day_wh = working_hours.get(weekday_names[i], [])
-                    synthetic = get_synthetic_occupied_for_date(
-                        d, policy, working_hours_for_date=day_wh
-                    )
-                    if synthetic:
-                        occupied_slots[d] = occupied_slots.get(d, []) + synthetic
-                        occupied_slots[d].sort()
-
-        busy_intervals = BookingService._get_busy_intervals_for_week(
-            week_start, week_end, user, student_id, exclude_lesson_id=exclude_lesson_id
+        weekday_names = BookingService._WEEKDAY_NAMES
+        travel_policy = TravelPolicy.for_profile(profile)
+        if travel_policy.enabled:
+            for i in range(7 * weeks):
+                d = range_start + timedelta(days=i)
+                synthetic = travel_policy.blocks_for(d)
+                if synthetic:
+                    occupied_slots[d] = occupied_slots.get(d, []) + synthetic
+                    occupied_slots[d].sort()
+
+        busy_intervals = (
+            BookingService._get_busy_intervals_for_week(
+                range_start, range_end, user, student_id, schedule=schedule
+            )
+            if user
+            else {}
         )
         weekday_display_keys = [
             "Monday",
@@ -474,69 +517,145 @@ class BookingService:
             "Sunday",
         ]
 
-        days_data = []
-        for i in range(7):
-            current_date = week_start + timedelta(days=i)
-            weekday_name = weekday_names[i]
-            day_working_hours = working_hours.get(weekday_name, [])
-            available_slots = BookingService.get_available_time_slots(
-                current_date,
-                day_working_hours,
-                occupied_slots,
-                slot_duration_minutes=unit_duration,
-            )
-            days_data.append(
+        result = []
+        for week in range(weeks):
+            week_start = add_days_to_date(range_start, 7 * week)
+            days_data = []
+            for i in range(7):
+                current_date = week_start + timedelta(days=i)
+                weekday_name = weekday_names[i]
+                day_working_hours = working_hours.get(weekday_name, [])
+                available_slots = BookingService.get_available_time_slots(
+                    current_date,
+                    day_working_hours,
+                    occupied_slots,
+                    slot_duration_minutes=unit_duration,
+                )
+                days_data.append(
+                    {
+                        "date": current_date,
+                        "weekday": weekday_name,
+                        "weekday_display": _(weekday_display_keys[i]),
+                        "working_hours": day_working_hours,
+                        "available_slots": available_slots,
+                        "occupied_slots": occupied_slots.get(current_date, []),
+                        "busy_intervals": busy_intervals.get(current_date, []),
+                    }
+                )
+            result.append(
                 {
-                    "date": current_date,
-                    "weekday": weekday_name,
-                    "weekday_display": _(weekday_display_keys[i]),
-                    "working_hours": day_working_hours,
-                    "available_slots": available_slots,
-                    "occupied_slots": occupied_slots.get(current_date, []),
-                    "busy_intervals": busy_intervals.get(current_date, []),
+                    "week_start": week_start,
+                    "week_end": add_days_to_date(week_start, 6),
+                    "days": days_data,
+                    "unit_duration_minutes": unit_duration,
                 }
             )
+        return result
 
-        return {
-            "week_start": week_start,
-            "week_end": week_end,
-            "days": days_data,
-            "unit_duration_minutes": unit_duration,
-        }
+    _SEARCH_CHUNK_DAYS = 7
+    MAX_SEARCH_DAYS = 180
 
     @staticmethod
-    def get_all_occupied_time_slots(
-        start_date: date, end_date: date, user=None, exclude_lesson_id: int | None = None
-    ) -> Dict[date, List[Tuple[time, time]]]:
+    def find_next_available_slots(
+        user,
+        duration_minutes: int,
+        after: datetime | None = None,
+        limit: int = 5,
+        max_days: int | None = None,
+    ) -> List[Tuple[date, time, time]]:
         """
-        Gibt alle belegten Zeitslots zurück.
+        Sucht die nächsten freien Slots eines Tutors ab einem Zeitpunkt.
+
+        Der Zeitplan wird wochenweise nachgeladen; pro Tag werden Lessons, Blockzeiten
+        und Travel-Policy-Blöcke zu einem sortierten, verschmolzenen Intervall-Strom
+        zusammengefasst. Die Suche endet, sobald limit Slots gefunden sind oder
+        max_days durchsucht wurden.
 
         Args:
-            start_date: Startdatum
-            end_date: Enddatum
-            user: Optional - filtert nach User (für Multi-Tenancy)
-            exclude_lesson_id: Optional - Lesson-ID ausschließen (z. B. bei Umbuchung)
+            user: Tutor
+            duration_minutes: Dauer eines Slots
+            after: Frühester Beginn (Standard: jetzt); nie früher als jetzt + 30 Minuten
+            limit: Anzahl gesuchter Slots
+            max_days: Suchhorizont in Tagen (Standard: MAX_SEARCH_DAYS)
 
         Returns:
-            Dict[date, List[Tuple[start_time, end_time]]] - belegte Zeitslots pro Tag
+            Liste von (date, start_time, end_time), chronologisch
         """
-        occupied = defaultdict(list)
+        from apps.core.models import UserProfile
+
+        if limit <= 0 or duration_minutes <= 0:
+            return []
+        profile = UserProfile.objects.filter(user=user).first()
+        working_hours = (getattr(profile, "default_working_hours", None) or {}) if profile else {}
+        if not any(working_hours.get(name) for name in BookingService._WEEKDAY_NAMES):
+            return []
+        travel_policy = TravelPolicy.for_profile(profile)
+
+        earliest = timezone.localtime(timezone.now() + timedelta(minutes=30))
+        if after is not None:
+            if timezone.is_naive(after):
+                after = timezone.make_aware(after)
+            earliest = max(earliest, timezone.localtime(after))
+        first_day = earliest.date()
+        last_day = first_day + timedelta(days=(max_days or BookingService.MAX_SEARCH_DAYS) - 1)
+
+        found = []
+        chunk_start = first_day
+        while chunk_start <= last_day:
+            chunk_end = min(
+                chunk_start + timedelta(days=BookingService._SEARCH_CHUNK_DAYS - 1), last_day
+            )
+            occupied = BookingService.get_all_occupied_time_slots(chunk_start, chunk_end, user=user)
+            current = chunk_start
+            while current <= chunk_end:
+                day_working_hours = working_hours.get(
+                    BookingService._WEEKDAY_NAMES[current.weekday()], []
+                )
+                if day_working_hours:
+                    day_occupied = list(occupied.get(current, []))
+                    day_occupied += travel_policy.blocks_for(current)
+                    earliest_minute = (
+                        time_to_minute_ceil(earliest.time()) if current == first_day else 0
+                    )
+                    for start_minute, end_minute in iter_free_slots(
+                        merge_intervals(day_occupied),
+                        day_working_hours,
+                        duration_minutes,
+                        step_minutes=BookingService._SLOT_STEP_MINUTES,
+                        earliest_minute=earliest_minute,
+                    ):
+                        found.append(
+                            (current, minute_to_time(start_minute), minute_to_time(end_minute))
+                        )
+                        if len(found) >= limit:
+                            return found
+                current += timedelta(days=1)
+            chunk_start = chunk_end + timedelta(days=1)
+        return found
 
-        # Load all lessons in the period
+    @staticmethod
+    def _load_schedule(
+        start_date: date, end_date: date, user=None, exclude_lesson_id: int | None = None
+    ) -> Tuple[List, List]:
+        """
+        Lädt Lessons und Blockzeiten eines Zeitraums einmal.
+
+        Wiederkehrende Blockzeiten werden für den Zeitraum expandiert und an die
+        Blockzeiten angehängt. Noch nicht materialisierte Termine von Lesson-Serien
+        (nach materialized_until) werden als ungespeicherte Lessons angehängt, damit
+        Buchungsseiten sie als belegt zeigen, ohne bei einem GET zu schreiben.
+
+        Returns:
+            (lessons, blocked_times) als Listen
+        """
         lessons_qs = Lesson.objects.filter(date__gte=start_date, date__lte=end_date).select_related(
             "contract", "contract__student"
         )
         if user:
-            lessons_qs = lessons_qs.filter(contract__student__user=user)
+            lessons_qs = lessons_qs.filter(owner=user)
         if exclude_lesson_id:
             lessons_qs = lessons_qs.exclude(pk=exclude_lesson_id)
-        lessons = lessons_qs
 
-        for lesson in lessons:
-            start_datetime, end_datetime = LessonConflictService.calculate_time_block(lesson)
-            occupied[lesson.date].append((start_datetime.time(), end_datetime.time()))
-
-        # Load blocked times in the period
         start_datetime = timezone.make_aware(datetime.combine(start_date, time.min))
         end_datetime = timezone.make_aware(datetime.combine(end_date, time.max))
         blocked_times_qs = BlockedTime.objects.filter(
@@ -544,9 +663,7 @@ class BookingService:
         ).order_by("start_datetime")
         if user:
             blocked_times_qs = blocked_times_qs.filter(user=user)
-        blocked_times = blocked_times_qs
 
-        # Lade wiederkehrende Blockzeiten und generiere temporäre Blockzeiten für den Zeitraum
         recurring_qs = RecurringBlockedTime.objects.filter(
             start_date__lte=end_date, end_date__gte=start_date, is_active=True
         ) | RecurringBlockedTime.objects.filter(
@@ -554,15 +671,58 @@ class BookingService:
         )
         if user:
             recurring_qs = recurring_qs.filter(user=user)
-        recurring_blocked_times = recurring_qs
-
-        # Füge Vorschau-Blockzeiten aus wiederkehrenden Blockzeiten hinzu
-        for rbt in recurring_blocked_times:
-            generated_blocked_times_preview = RecurringBlockedTimeService.preview_blocked_times(rbt)
-            for bt_preview in generated_blocked_times_preview:
-                # Filter nur für den Zeitraum
-                if start_date <= bt_preview.start_datetime.date() <= end_date:
-                    blocked_times = list(blocked_times) + [bt_preview]
+
+        series_qs = (
+            RecurringSession.objects.filter(is_active=True, start_date__lte=end_date)
+            .filter(Q(end_date__isnull=True) | Q(end_date__gte=start_date))
+            .filter(Q(materialized_until__isnull=True) | Q(materialized_until__lt=end_date))
+            .select_related("contract", "contract__student")
+        )
+        if user:
+            series_qs = series_qs.filter(owner=user)
+
+        blocked_times = list(blocked_times_qs)
+        blocked_times += RecurringBlockedTimeService.expand_recurring_between(
+            recurring_qs, start_date, end_date, existing=blocked_times
+        )
+        lessons = list(lessons_qs)
+        lessons += RecurringSessionService.unmaterialized_sessions(
+            series_qs, start_date, end_date, existing=lessons
+        )
+        return lessons, blocked_times
+
+    @staticmethod
+    def get_all_occupied_time_slots(
+        start_date: date,
+        end_date: date,
+        user=None,
+        exclude_lesson_id: int | None = None,
+        schedule: Tuple[List, List] | None = None,
+    ) -> Dict[date, List[Tuple[time, time]]]:
+        """
+        Gibt alle belegten Zeitslots zurück.
+
+        Args:
+            start_date: Startdatum
+            end_date: Enddatum
+            user: Optional - filtert nach User (für Multi-Tenancy)
+            exclude_lesson_id: Optional - Lesson-ID ausschließen (z. B. bei Umbuchung)
+            schedule: Optional - bereits geladenes Ergebnis von _load_schedule
+
+        Returns:
+            Dict[date, List[Tuple[start_time, end_time]]] - belegte Zeitslots pro Tag
+        """
+        occupied = defaultdict(list)
+
+        if schedule is None:
+            schedule = BookingService._load_schedule(
+                start_date, end_date, user=user, exclude_lesson_id=exclude_lesson_id
+            )
+        lessons, blocked_times = schedule
+
+        for lesson in lessons:
+            start_datetime, end_datetime = LessonConflictService.calculate_time_block(lesson)
+            occupied[lesson.date].append((start_datetime.time(), end_datetime.time()))
 
         for blocked_time in blocked_times:
             # Convert to local timezone for correct time extraction
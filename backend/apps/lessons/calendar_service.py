@@ -46,8 +46,8 @@ class CalendarService:
             .order_by("date", "start_time")
         )
         if user:
-            lessons_qs = lessons_qs.filter(contract__student__user=user)
-        lessons = lessons_qs
+            lessons_qs = lessons_qs.filter(owner=user)
+        lessons = list(lessons_qs)
 
         # Lade Blockzeiten im Monatsbereich
         start_datetime = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
@@ -61,14 +61,11 @@ class CalendarService:
 
         # Gruppiere Lessons nach Datum
         lessons_by_date = defaultdict(list)
-        conflicts_by_lesson = {}
-
         for lesson in lessons:
             lessons_by_date[lesson.date].append(lesson)
-            # Prüfe Konflikte
-            conflicts = LessonConflictService.check_conflicts(lesson)
-            if conflicts:
-                conflicts_by_lesson[lesson.id] = conflicts
+
+        # Lese Konflikte aller Lessons aus dem Konflikt-Speicher
+        conflicts_by_lesson = LessonConflictService.get_stored_conflicts(lessons)
 
         # Gruppiere Blockzeiten nach Datum
         blocked_times_by_date = defaultdict(list)
@@ -2,38 +2,35 @@
 Service for conflict detection and recalculation.
 """
 
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
 
 from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.blocked_times.models import BlockedTime
-from apps.lessons.models import Session
+from apps.lessons.models import Session, SessionConflict
 from apps.lessons.quota_service import ContractQuotaService
+from apps.lessons.recurring_models import contract_owner_id
 
 
 def recalculate_conflicts_for_affected_sessions(session: Session):
     """
     Recalculates conflicts for a session and all potentially affected sessions.
 
-    This should be called after a session is created, updated, or deleted
-    to ensure all conflict flags are up to date. Only sessions of the same user
-    are considered (multi-tenancy).
+    Session.save() keeps the conflict store up to date already; calling this again is
+    idempotent and only needed after writes that bypass save(). Deleted sessions are
+    removed from the store by cascade. Only sessions of the same user are considered
+    (multi-tenancy).
 
     Args:
         session: The session that was changed
     """
-    owner_user = session.contract.student.user
-
-    # Find all sessions on the same date of the same user that might be affected
-    affected_sessions = Session.objects.filter(
-        date=session.date, contract__student__user=owner_user
-    ).exclude(pk=session.pk if session.pk else None)
-
-    for affected_session in affected_sessions:
-        # Force conflict check (clears cached conflicts)
-        affected_session.get_conflicts()
+    if session.pk:
+        SessionConflictService.sync_session_conflicts(session)
 
 
 # Alias for backwards compatibility
@@ -44,20 +41,15 @@ def recalculate_conflicts_for_blocked_time(blocked_time: BlockedTime):
     """
     Recalculates conflicts for all sessions that might be affected by a blocked time change.
 
-    Only sessions of the same user as the blocked time are considered (multi-tenancy).
+    BlockedTime.save() keeps the conflict store up to date already; calling this again is
+    idempotent. Only sessions of the same user as the blocked time are considered
+    (multi-tenancy).
 
     Args:
         blocked_time: The blocked time that was changed or deleted
     """
-    # Find sessions on the same date belonging to the same user
-    affected_sessions = Session.objects.filter(
-        date=blocked_time.start_datetime.date(),
-        contract__student__user=blocked_time.user,
-    )
-
-    for session in affected_sessions:
-        # Force conflict check (clears cached conflicts)
-        session.get_conflicts()
+    if blocked_time.pk:
+        SessionConflictService.sync_blocked_time_conflicts(blocked_time)
 
 
 class SessionConflictService:
@@ -124,8 +116,14 @@ class SessionConflictService:
         start_datetime, end_datetime = SessionConflictService.calculate_time_block(session)
 
         # Check conflicts with other sessions (same user only - multi-tenancy)
-        owner_user = session.contract.student.user
-        query = Q(date=session.date, start_time__isnull=False, contract__student__user=owner_user)
+        # The overlap test runs in SQL on the stored occupied interval
+        owner_id = contract_owner_id(session)
+        query = Q(
+            date=session.date,
+            owner_id=owner_id,
+            occupied_from__lt=end_datetime,
+            occupied_until__gt=start_datetime,
+        )
 
         if exclude_self and session.pk:
             query &= ~Q(pk=session.pk)
@@ -136,28 +134,23 @@ class SessionConflictService:
 
         for other_session in other_sessions:
             other_start, other_end = SessionConflictService.calculate_time_block(other_session)
-
-            # Check overlap with explicit helper function
-            if SessionConflictService.intervals_overlap(
-                start1=start_datetime, end1=end_datetime, start2=other_start, end2=other_end
-            ):
-                conflicts.append(
-                    {
-                        "type": "lesson",
-                        "object": other_session,
-                        "message": _("Overlap with lesson for {student} ({time})").format(
-                            student=other_session.contract.student,
-                            time=other_session.start_time.strftime("%H:%M"),
-                        ),
-                        "start": other_start,
-                        "end": other_end,
-                    }
-                )
+            conflicts.append(
+                {
+                    "type": "lesson",
+                    "object": other_session,
+                    "message": _("Overlap with lesson for {student} ({time})").format(
+                        student=other_session.contract.student,
+                        time=other_session.start_time.strftime("%H:%M"),
+                    ),
+                    "start": other_start,
+                    "end": other_end,
+                }
+            )
 
         # Check conflicts with blocked times (same user only - multi-tenancy)
         # Find blocked times that could overlap: start before session ends, end after session starts
         blocked_times = BlockedTime.objects.filter(
-            user=owner_user,
+            user_id=owner_id,
             start_datetime__lt=end_datetime,
             end_datetime__gt=start_datetime,
         )
@@ -185,20 +178,354 @@ class SessionConflictService:
         # Check quota conflict
         quota_conflict = ContractQuotaService.check_quota_conflict(session, exclude_self)
         if quota_conflict:
-            conflicts.append(
-                {
-                    "type": "quota",
-                    "object": session.contract,
-                    "message": quota_conflict["message"],
-                    "planned_total": quota_conflict["planned_total"],
-                    "actual_total": quota_conflict["actual_total"],
-                    "month": quota_conflict["month"],
-                    "year": quota_conflict["year"],
-                }
-            )
+            conflicts.append(SessionConflictService._quota_conflict_dict(session, quota_conflict))
 
         return conflicts
 
+    @staticmethod
+    def check_conflicts_bulk(sessions: Iterable[Session]) -> dict[int, list[dict]]:
+        """
+        Checks conflicts for many sessions at once.
+
+        Produces the same conflict dicts as check_conflicts (with exclude_self=True),
+        but loads the sessions and blocked times of each owner once for the whole
+        date range and finds overlaps with a per-day sweep line. The number of
+        queries therefore depends on the number of owners, not on the number of sessions.
+
+        Args:
+            sessions: Saved Session objects (ideally with contract__student selected)
+
+        Returns:
+            Dict mapping session pk to its list of conflicts (only sessions with conflicts)
+        """
+        sessions = [s for s in sessions if s.pk and s.start_time is not None]
+        conflicts_by_session = SessionConflictService._overlap_conflicts_bulk(sessions)
+        SessionConflictService._add_quota_conflicts_bulk(sessions, conflicts_by_session)
+        return conflicts_by_session
+
+    @staticmethod
+    def _add_quota_conflicts_bulk(sessions: list[Session], conflicts_by_session: dict) -> None:
+        """Appends quota conflicts using one quota index per contract (two queries in total)."""
+        indexes = ContractQuotaService.build_indexes({s.contract for s in sessions})
+        for session in sessions:
+            index = indexes.get(session.contract_id)
+            quota_conflict = index.check(session) if index else None
+            if quota_conflict:
+                conflicts_by_session.setdefault(session.pk, []).append(
+                    SessionConflictService._quota_conflict_dict(session, quota_conflict)
+                )
+
+    @staticmethod
+    def _overlap_conflicts_bulk(sessions: list[Session]) -> dict[int, list[dict]]:
+        """
+        Lesson and blocked-time overlaps for many sessions (no quota check).
+
+        Loads the sessions and blocked times of each owner once for the whole
+        date range and finds overlaps with a per-day sweep line.
+        """
+        if not sessions:
+            return {}
+
+        sessions_by_owner = defaultdict(list)
+        for session in sessions:
+            sessions_by_owner[session.owner_id].append(session)
+
+        conflicts_by_session = defaultdict(list)
+
+        for owner_id, owner_sessions in sessions_by_owner.items():
+            target_ids = {s.pk for s in owner_sessions}
+            dates = {s.date for s in owner_sessions}
+
+            # All sessions of the owner on the affected days (targets included)
+            day_sessions = defaultdict(list)
+            for other in Session.objects.filter(
+                date__in=dates, start_time__isnull=False, owner_id=owner_id
+            ).select_related("contract", "contract__student"):
+                start, end = SessionConflictService.calculate_time_block(other)
+                day_sessions[other.date].append((start, end, other))
+
+            # Time window covered by the session blocks of each day
+            windows = {
+                day: (min(item[0] for item in items), max(item[1] for item in items))
+                for day, items in day_sessions.items()
+            }
+            if not windows:
+                continue
+            range_start = min(window[0] for window in windows.values())
+            range_end = max(window[1] for window in windows.values())
+
+            blocked_times = list(
+                BlockedTime.objects.filter(
+                    user_id=owner_id,
+                    start_datetime__lt=range_end,
+                    end_datetime__gt=range_start,
+                ).order_by("start_datetime")
+            )
+            blocked_starts = [bt.start_datetime for bt in blocked_times]
+
+            for day, items in day_sessions.items():
+                window_start, window_end = windows[day]
+                day_blocked = [
+                    bt
+                    for bt in blocked_times[: bisect_left(blocked_starts, window_end)]
+                    if bt.end_datetime > window_start
+                ]
+                SessionConflictService._sweep_day(
+                    items, day_blocked, target_ids, conflicts_by_session
+                )
+
+        for session_conflicts in conflicts_by_session.values():
+            SessionConflictService._sort_conflicts(session_conflicts)
+
+        return dict(conflicts_by_session)
+
+    @staticmethod
+    def _sort_conflicts(conflicts: list[dict]) -> None:
+        """Orders conflicts like check_conflicts: lessons (latest first), then blocked times."""
+        conflicts.sort(
+            key=lambda c: (
+                (0, -(c["object"].start_time.hour * 60 + c["object"].start_time.minute))
+                if c["type"] == "lesson"
+                else (1, c["start"].timestamp())
+            )
+        )
+
+    @staticmethod
+    def _sweep_day(
+        session_items: list[tuple],
+        blocked_times: list[BlockedTime],
+        target_ids: set[int],
+        conflicts_by_session: dict,
+    ) -> None:
+        """
+        Sweep line over the intervals of one day.
+
+        Intervals are visited in start order; every interval still active when
+        another one starts is a candidate overlap. Conflicts are appended for
+        target sessions only.
+        """
+        events = [(start, end, "lesson", session) for start, end, session in session_items]
+        events += [(bt.start_datetime, bt.end_datetime, "blocked_time", bt) for bt in blocked_times]
+        events.sort(key=lambda e: (e[0], e[1]))
+
+        active = []
+        for start, end, kind, obj in events:
+            active = [a for a in active if a[1] > start]
+            for a_start, a_end, a_kind, a_obj in active:
+                if not SessionConflictService.intervals_overlap(start, end, a_start, a_end):
+                    continue
+                if kind == "lesson" and obj.pk in target_ids:
+                    conflicts_by_session[obj.pk].append(
+                        SessionConflictService._conflict_dict(a_kind, a_obj, a_start, a_end)
+                    )
+                if a_kind == "lesson" and a_obj.pk in target_ids:
+                    conflicts_by_session[a_obj.pk].append(
+                        SessionConflictService._conflict_dict(kind, obj, start, end)
+                    )
+            active.append((start, end, kind, obj))
+
+    @staticmethod
+    def _quota_conflict_dict(session: Session, quota_conflict: dict) -> dict:
+        """Builds the quota conflict dict from a ContractQuotaService result."""
+        return {
+            "type": "quota",
+            "object": session.contract,
+            "message": quota_conflict["message"],
+            "planned_total": quota_conflict["planned_total"],
+            "actual_total": quota_conflict["actual_total"],
+            "month": quota_conflict["month"],
+            "year": quota_conflict["year"],
+        }
+
+    @staticmethod
+    def _conflict_dict(kind: str, obj, start: datetime, end: datetime) -> dict:
+        """Builds a lesson or blocked-time conflict dict as returned by check_conflicts."""
+        if kind == "lesson":
+            message = _("Overlap with lesson for {student} ({time})").format(
+                student=obj.contract.student,
+                time=obj.start_time.strftime("%H:%M"),
+            )
+        else:
+            message = _("Overlap with blocked time: {title}").format(title=obj.title)
+        return {"type": kind, "object": obj, "message": message, "start": start, "end": end}
+
+    @staticmethod
+    def sync_session_conflicts(session: Session) -> None:
+        """
+        Updates the conflict store after a session was created or changed.
+
+        Removes every stored pair involving the session (also on its previous date)
+        and stores its current overlaps in both directions.
+        """
+        SessionConflict.objects.filter(Q(session=session) | Q(other_session=session)).delete()
+        if session.start_time is None:
+            return
+        if not isinstance(session.start_time, time) or not isinstance(session.date, date):
+            # Values assigned as strings are only converted when loaded from the database
+            session = Session.objects.get(pk=session.pk)
+
+        start, end = SessionConflictService.calculate_time_block(session)
+        entries = []
+        for conflict in SessionConflictService._overlap_conflicts_bulk([session]).get(
+            session.pk, []
+        ):
+            entries.append(SessionConflictService._store_entry(session.pk, conflict))
+            if conflict["type"] == "lesson":
+                entries.append(
+                    SessionConflict(
+                        session=conflict["object"],
+                        conflict_type="lesson",
+                        other_session=session,
+                        start_datetime=start,
+                        end_datetime=end,
+                    )
+                )
+        SessionConflict.objects.bulk_create(entries)
+
+    @staticmethod
+    def sync_new_sessions_conflicts(sessions: list[Session]) -> None:
+        """
+        Stores the overlaps of freshly inserted sessions (e.g. after bulk_create).
+
+        The sessions must not have stored entries yet. Overlaps between two new
+        sessions are stored once per direction from each session's own result;
+        overlaps with existing sessions additionally get the reverse entry.
+        """
+        sessions = [s for s in sessions if s.pk and s.start_time is not None]
+        new_ids = {s.pk for s in sessions}
+        by_pk = {s.pk: s for s in sessions}
+        entries = []
+        for session_id, conflicts in SessionConflictService._overlap_conflicts_bulk(
+            sessions
+        ).items():
+            start, end = SessionConflictService.calculate_time_block(by_pk[session_id])
+            for conflict in conflicts:
+                entries.append(SessionConflictService._store_entry(session_id, conflict))
+                if conflict["type"] == "lesson" and conflict["object"].pk not in new_ids:
+                    entries.append(
+                        SessionConflict(
+                            session=conflict["object"],
+                            conflict_type="lesson",
+                            other_session_id=session_id,
+                            start_datetime=start,
+                            end_datetime=end,
+                        )
+                    )
+        SessionConflict.objects.bulk_create(entries, batch_size=500)
+
+    @staticmethod
+    def sync_blocked_time_conflicts(blocked_time: BlockedTime) -> None:
+        """Updates the conflict store after a blocked time was created or changed."""
+        SessionConflict.objects.filter(blocked_time=blocked_time).delete()
+        if not isinstance(blocked_time.start_datetime, datetime) or not isinstance(
+            blocked_time.end_datetime, datetime
+        ):
+            blocked_time = BlockedTime.objects.get(pk=blocked_time.pk)
+
+        # Overlap on the stored occupied interval (travel times included)
+        session_ids = Session.objects.filter(
+            owner_id=blocked_time.user_id,
+            occupied_from__lt=blocked_time.end_datetime,
+            occupied_until__gt=blocked_time.start_datetime,
+        ).values_list("pk", flat=True)
+        SessionConflict.objects.bulk_create(
+            SessionConflict(
+                session_id=session_id,
+                conflict_type="blocked_time",
+                blocked_time=blocked_time,
+                start_datetime=blocked_time.start_datetime,
+                end_datetime=blocked_time.end_datetime,
+            )
+            for session_id in session_ids
+        )
+
+    @staticmethod
+    def rebuild_conflict_store(user=None) -> int:
+        """
+        Recomputes the conflict store from scratch (all users or one user).
+
+        Used after writes that bypass save(), e.g. fixture loading.
+
+        Returns:
+            Number of stored conflict entries
+        """
+        sessions = Session.objects.filter(start_time__isnull=False).select_related(
+            "contract", "contract__student"
+        )
+        stored = SessionConflict.objects.all()
+        if user:
+            sessions = sessions.filter(owner=user)
+            stored = stored.filter(session__owner=user)
+        stored.delete()
+
+        entries = []
+        conflicts_by_session = SessionConflictService._overlap_conflicts_bulk(list(sessions))
+        for session_id, conflicts in conflicts_by_session.items():
+            for conflict in conflicts:
+                entries.append(SessionConflictService._store_entry(session_id, conflict))
+        SessionConflict.objects.bulk_create(entries, batch_size=500)
+        return len(entries)
+
+    @staticmethod
+    def _store_entry(session_id: int, conflict: dict) -> SessionConflict:
+        """Builds a SessionConflict row from a lesson or blocked-time conflict dict."""
+        entry = SessionConflict(
+            session_id=session_id,
+            conflict_type=conflict["type"],
+            start_datetime=conflict["start"],
+            end_datetime=conflict["end"],
+        )
+        if conflict["type"] == "lesson":
+            entry.other_session = conflict["object"]
+        else:
+            entry.blocked_time = conflict["object"]
+        return entry
+
+    @staticmethod
+    def get_stored_conflicts(sessions: Iterable[Session]) -> dict[int, list[dict]]:
+        """
+        Reads conflicts of many sessions from the conflict store.
+
+        Returns the same conflict dicts as check_conflicts. Overlaps come from a single
+        indexed query; quota conflicts come from the per-contract quota index.
+
+        Args:
+            sessions: Saved Session objects
+
+        Returns:
+            Dict mapping session pk to its list of conflicts (only sessions with conflicts)
+        """
+        sessions = [s for s in sessions if s.pk]
+        if not sessions:
+            return {}
+
+        conflicts_by_session = defaultdict(list)
+        entries = SessionConflict.objects.filter(
+            session_id__in=[s.pk for s in sessions]
+        ).select_related("other_session__contract__student", "blocked_time")
+        for entry in entries:
+            obj = entry.other_session if entry.conflict_type == "lesson" else entry.blocked_time
+            conflicts_by_session[entry.session_id].append(
+                SessionConflictService._conflict_dict(
+                    entry.conflict_type, obj, entry.start_datetime, entry.end_datetime
+                )
+            )
+        for session_conflicts in conflicts_by_session.values():
+            SessionConflictService._sort_conflicts(session_conflicts)
+
+        conflicts_by_session = dict(conflicts_by_session)
+        SessionConflictService._add_quota_conflicts_bulk(sessions, conflicts_by_session)
+        return conflicts_by_session
+
+    @staticmethod
+    def has_stored_conflicts(session: Session) -> bool:
+        """Checks the conflict store (and the quota) for a single session."""
+        if not session.pk:
+            return SessionConflictService.has_conflicts(session)
+        if session.conflict_entries.exists():
+            return True
+        return ContractQuotaService.has_quota_conflict(session)
+
     @staticmethod
     def has_conflicts(session: Session, exclude_self: bool = True) -> bool:
         """
@@ -0,0 +1,18 @@
+"""
+Management command to set past planned sessions to 'taught'.
+
+Run it periodically (cron or scheduler); the process_series_jobs worker also runs it.
+Views only catch up the sessions of the current user.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.lessons.status_service import SessionStatusUpdater
+
+
+class Command(BaseCommand):
+    help = "Set planned sessions whose end time has passed to taught"
+
+    def handle(self, *args, **options):
+        count = SessionStatusUpdater.update_past_sessions_to_taught()
+        self.stdout.write(self.style.SUCCESS(f"Marked {count} session(s) as taught."))
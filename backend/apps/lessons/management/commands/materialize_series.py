@@ -0,0 +1,27 @@
+"""
+Management command to extend open-ended series up to the rolling horizon.
+
+Open-ended RecurringSession and RecurringBlockedTime series are only materialized
+SERIES_HORIZON_WEEKS ahead. Run this daily (cron or scheduler); the
+process_series_jobs worker also runs it periodically.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.blocked_times.recurring_service import RecurringBlockedTimeService
+from apps.lessons.recurring_service import RecurringSessionService
+
+
+class Command(BaseCommand):
+    help = "Materialize open-ended series up to the rolling horizon"
+
+    def handle(self, *args, **options):
+        sessions = RecurringSessionService.extend_all_materializations()
+        blocked_times = RecurringBlockedTimeService.extend_all_materializations()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Extended {sessions['series']} session series ({sessions['created']} sessions) "
+                f"and {blocked_times['series']} blocked time series "
+                f"({blocked_times['created']} blocked times)."
+            )
+        )
@@ -0,0 +1,71 @@
+"""
+Management command (worker) that processes background series generation jobs.
+
+Run it as a long-lived process next to the web server and enable
+SERIES_GENERATION_ASYNC, or with --once from a scheduler (e.g. cron). The long-lived
+worker also extends open-ended series to the rolling horizon (materialize_series) and
+sets past planned sessions to taught (mark_taught).
+"""
+
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.lessons.series_job_service import SeriesGenerationJobService
+
+
+class Command(BaseCommand):
+    help = "Process pending series generation jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the current queue and exit instead of polling",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the queue is empty (default: 2)",
+        )
+        parser.add_argument(
+            "--materialize-every",
+            type=float,
+            default=3600.0,
+            help="Seconds between runs of materialize_series (default: 3600, 0 disables)",
+        )
+        parser.add_argument(
+            "--mark-taught-every",
+            type=float,
+            default=300.0,
+            help="Seconds between runs of mark_taught (default: 300, 0 disables)",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            count = SeriesGenerationJobService.process_pending()
+            self.stdout.write(self.style.SUCCESS(f"Processed {count} job(s)."))
+            return
+
+        self.stdout.write("Waiting for series generation jobs...")
+        last_run = {}
+        while True:
+            # Long-lived process: drop connections the database has closed meanwhile
+            close_old_connections()
+            for command, interval in (
+                ("materialize_series", options["materialize_every"]),
+                ("mark_taught", options["mark_taught_every"]),
+            ):
+                if interval and (
+                    command not in last_run or time.monotonic() - last_run[command] >= interval
+                ):
+                    call_command(command, stdout=self.stdout)
+                    last_run[command] = time.monotonic()
+            count = SeriesGenerationJobService.process_pending()
+            if count:
+                self.stdout.write(f"Processed {count} job(s).")
+            else:
+                time.sleep(options["sleep"])
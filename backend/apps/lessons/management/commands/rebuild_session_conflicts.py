@@ -0,0 +1,30 @@
+"""
+Management command to rebuild the materialized session conflict store.
+
+Session and BlockedTime saves keep the store up to date; this command is only
+needed after writes that bypass save() (e.g. loaddata or raw SQL).
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.lessons.services import SessionConflictService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the SessionConflict store (all users or a single user)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Only rebuild conflicts for this user")
+
+    def handle(self, *args, **options):
+        user = None
+        if options.get("username"):
+            User = get_user_model()
+            try:
+                user = User.objects.get(username=options["username"])
+            except User.DoesNotExist as exc:
+                raise CommandError(f"User '{options['username']}' not found") from exc
+
+        count = SessionConflictService.rebuild_conflict_store(user=user)
+        self.stdout.write(self.style.SUCCESS(f"Stored {count} conflict entries."))
@@ -0,0 +1,31 @@
+"""
+Management command to rebuild the TutorSpace tier ledger.
+
+Session, contract and profile saves keep the ledger up to date; this command is only
+needed after writes that bypass save() (e.g. loaddata or raw SQL).
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the TutorSpace tier ledger (all users or a single user)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Only rebuild the ledger of this user")
+
+    def handle(self, *args, **options):
+        tutor_ids = None
+        if options.get("username"):
+            User = get_user_model()
+            try:
+                user = User.objects.get(username=options["username"])
+            except User.DoesNotExist as exc:
+                raise CommandError(f"User '{options['username']}' not found") from exc
+            tutor_ids = [user.pk]
+
+        count = TutorSpaceLedgerService.rebuild(tutor_ids)
+        self.stdout.write(self.style.SUCCESS(f"Stored {count} ledger entries."))
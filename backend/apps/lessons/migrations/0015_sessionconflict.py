@@ -0,0 +1,142 @@
+"""Create the SessionConflict store and fill it for existing sessions.
+
+The backfill mirrors SessionConflictService.rebuild_conflict_store with historical
+models: per owner and day, every pair of overlapping session blocks (including
+travel times) and every session/blocked-time overlap is stored.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def _time_block(session):
+    start = timezone.make_aware(datetime.combine(session.date, session.start_time))
+    return (
+        start - timedelta(minutes=session.travel_time_before_minutes),
+        start + timedelta(minutes=session.duration_minutes + session.travel_time_after_minutes),
+    )
+
+
+def backfill(apps, schema_editor):
+    Session = apps.get_model("lessons", "Session")
+    SessionConflict = apps.get_model("lessons", "SessionConflict")
+    BlockedTime = apps.get_model("blocked_times", "BlockedTime")
+
+    sessions_by_owner_day = defaultdict(list)
+    for session in Session.objects.filter(start_time__isnull=False).select_related(
+        "contract__student"
+    ):
+        owner_id = session.contract.student.user_id
+        sessions_by_owner_day[(owner_id, session.date)].append((session, *_time_block(session)))
+
+    blocked_by_owner = defaultdict(list)
+    for blocked_time in BlockedTime.objects.all():
+        blocked_by_owner[blocked_time.user_id].append(blocked_time)
+
+    entries = []
+    for (owner_id, _day), items in sessions_by_owner_day.items():
+        for session, start, end in items:
+            for other, other_start, other_end in items:
+                if other.pk != session.pk and end > other_start and start < other_end:
+                    entries.append(
+                        SessionConflict(
+                            session_id=session.pk,
+                            conflict_type="lesson",
+                            other_session_id=other.pk,
+                            start_datetime=other_start,
+                            end_datetime=other_end,
+                        )
+                    )
+            for blocked_time in blocked_by_owner.get(owner_id, []):
+                if end > blocked_time.start_datetime and start < blocked_time.end_datetime:
+                    entries.append(
+                        SessionConflict(
+                            session_id=session.pk,
+                            conflict_type="blocked_time",
+                            blocked_time_id=blocked_time.pk,
+                            start_datetime=blocked_time.start_datetime,
+                            end_datetime=blocked_time.end_datetime,
+                        )
+                    )
+
+    SessionConflict.objects.bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blocked_times", "0006_blockedtime_user_required"),
+        ("lessons", "0014_add_contract_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SessionConflict",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "conflict_type",
+                    models.CharField(
+                        choices=[("lesson", "Lesson"), ("blocked_time", "Blocked time")],
+                        help_text="Type of the conflicting object",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "start_datetime",
+                    models.DateTimeField(help_text="Start of the conflicting interval"),
+                ),
+                ("end_datetime", models.DateTimeField(help_text="End of the conflicting interval")),
+                (
+                    "blocked_time",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Overlapping blocked time (for blocked time conflicts)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="blocked_times.blockedtime",
+                    ),
+                ),
+                (
+                    "other_session",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Overlapping session (for lesson conflicts)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="lessons.session",
+                    ),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        help_text="Session that has the conflict",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="conflict_entries",
+                        to="lessons.session",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Session Conflict",
+                "verbose_name_plural": "Session Conflicts",
+                "indexes": [
+                    models.Index(
+                        fields=["session", "conflict_type"], name="lessons_conflict_session_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0015_sessionconflict"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeriesGenerationJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        help_text="Job status",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "check_conflicts",
+                    models.BooleanField(default=True, help_text="Report conflicts"),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(default=0, help_text="Number of series dates"),
+                ),
+                (
+                    "processed",
+                    models.PositiveIntegerField(default=0, help_text="Number of processed dates"),
+                ),
+                (
+                    "created",
+                    models.PositiveIntegerField(default=0, help_text="Number of created sessions"),
+                ),
+                (
+                    "skipped",
+                    models.PositiveIntegerField(default=0, help_text="Number of skipped dates"),
+                ),
+                (
+                    "conflict_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of created sessions with conflicts"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", help_text="Error message (if failed)"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "recurring_session",
+                    models.ForeignKey(
+                        help_text="Series whose sessions are generated",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="generation_jobs",
+                        to="lessons.recurringsession",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Series Generation Job",
+                "verbose_name_plural": "Series Generation Jobs",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(fields=["status", "created_at"], name="lessons_genjob_status_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+"""Add RecurringSession.materialized_until and fill it for existing series.
+
+Existing series were materialized up to their end date, the contract end or one year
+after the start; recording that keeps materialize_series from re-creating sessions
+that were deleted individually.
+"""
+
+from datetime import date
+
+from django.db import migrations, models
+
+
+def _one_year_after(start):
+    try:
+        return start.replace(year=start.year + 1)
+    except ValueError:  # 29 February
+        return date(start.year + 1, 2, 28)
+
+
+def backfill(apps, schema_editor):
+    RecurringSession = apps.get_model("lessons", "RecurringSession")
+    series = list(RecurringSession.objects.select_related("contract"))
+    for recurring in series:
+        recurring.materialized_until = (
+            recurring.end_date
+            or recurring.contract.end_date
+            or _one_year_after(recurring.start_date)
+        )
+    RecurringSession.objects.bulk_update(series, ["materialized_until"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0016_seriesgenerationjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recurringsession",
+            name="materialized_until",
+            field=models.DateField(
+                blank=True,
+                help_text="Last day up to which the series has been materialized",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+"""Add Session.ends_at and fill it for existing sessions.
+
+The stored end time lets mark_taught set past planned sessions to taught with a
+single UPDATE on the (status, ends_at) index.
+"""
+
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill(apps, schema_editor):
+    Session = apps.get_model("lessons", "Session")
+    batch = []
+    for session in Session.objects.only("date", "start_time", "duration_minutes").iterator(
+        chunk_size=2000
+    ):
+        starts_at = timezone.make_aware(datetime.combine(session.date, session.start_time))
+        session.ends_at = starts_at + timedelta(minutes=session.duration_minutes)
+        batch.append(session)
+        if len(batch) >= 2000:
+            Session.objects.bulk_update(batch, ["ends_at"], batch_size=500)
+            batch = []
+    if batch:
+        Session.objects.bulk_update(batch, ["ends_at"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0017_recurringsession_materialized_until"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="session",
+            name="ends_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="End of the session (without travel times), derived from date and time",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(fields=["status", "ends_at"], name="lessons_les_status_ends_idx"),
+        ),
+    ]
@@ -0,0 +1,78 @@
+"""Add Session.starts_at, occupied_from and occupied_until and fill them.
+
+With the stored occupied interval (travel times included) overlap queries run in SQL
+on the (contract, occupied_from, occupied_until) index.
+"""
+
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill(apps, schema_editor):
+    Session = apps.get_model("lessons", "Session")
+    fields = ["starts_at", "ends_at", "occupied_from", "occupied_until"]
+    batch = []
+    for session in Session.objects.iterator(chunk_size=2000):
+        session.starts_at = timezone.make_aware(datetime.combine(session.date, session.start_time))
+        session.ends_at = session.starts_at + timedelta(minutes=session.duration_minutes)
+        session.occupied_from = session.starts_at - timedelta(
+            minutes=session.travel_time_before_minutes
+        )
+        session.occupied_until = session.ends_at + timedelta(
+            minutes=session.travel_time_after_minutes
+        )
+        batch.append(session)
+        if len(batch) >= 2000:
+            Session.objects.bulk_update(batch, fields, batch_size=500)
+            batch = []
+    if batch:
+        Session.objects.bulk_update(batch, fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0018_session_ends_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="session",
+            name="starts_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Start of the session, derived from date and time",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="session",
+            name="occupied_from",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Start of the occupied time block including travel time before",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="session",
+            name="occupied_until",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="End of the occupied time block including travel time after",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(
+                fields=["contract", "occupied_from", "occupied_until"],
+                name="lessons_les_contract_occ_idx",
+            ),
+        ),
+    ]
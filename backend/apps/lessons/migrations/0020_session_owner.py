@@ -0,0 +1,40 @@
+# Migration 1: Add owner to Session and RecurringSession as nullable
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0019_session_occupied_interval"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="session",
+            name="owner",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                help_text="Tutor who owns this session (the user of the contract's student)",
+                null=True,
+                on_delete=models.CASCADE,
+                related_name="sessions",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="recurringsession",
+            name="owner",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                help_text="Tutor who owns this series (the user of the contract's student)",
+                null=True,
+                on_delete=models.CASCADE,
+                related_name="recurring_sessions",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
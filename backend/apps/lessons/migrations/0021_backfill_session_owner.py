@@ -0,0 +1,30 @@
+# Migration 2: Data migration to backfill owner from contract.student.user
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_owner(apps, schema_editor):
+    Contract = apps.get_model("contracts", "Contract")
+    contract_owner = Subquery(
+        Contract.objects.filter(pk=OuterRef("contract_id")).values("student__user_id")[:1]
+    )
+    for model_name in ("Session", "RecurringSession"):
+        model = apps.get_model("lessons", model_name)
+        model.objects.filter(owner__isnull=True).update(owner_id=contract_owner)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0020_session_owner"),
+        ("contracts", "0004_alter_contract_options_and_more"),
+        ("students", "0005_student_user_required"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_owner, noop),
+    ]
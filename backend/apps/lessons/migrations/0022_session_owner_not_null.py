@@ -0,0 +1,51 @@
+# Migration 3: owner NOT NULL and owner-scoped indexes
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0021_backfill_session_owner"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="session",
+            name="owner",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Tutor who owns this session (the user of the contract's student)",
+                on_delete=models.CASCADE,
+                related_name="sessions",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="recurringsession",
+            name="owner",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Tutor who owns this series (the user of the contract's student)",
+                on_delete=models.CASCADE,
+                related_name="recurring_sessions",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(
+                fields=["owner", "date", "start_time"], name="lessons_les_owner_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(
+                fields=["owner", "status", "date"], name="lessons_les_owner_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringsession",
+            index=models.Index(fields=["owner", "is_active"], name="lessons_rec_owner_active_idx"),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0022_session_owner_not_null"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TutorSpaceLedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField(help_text="Session date")),
+                ("start_time", models.TimeField(help_text="Start time")),
+                (
+                    "session_created_at",
+                    models.DateTimeField(help_text="Creation time of the session"),
+                ),
+                (
+                    "minutes",
+                    models.PositiveIntegerField(help_text="Minutes the session adds to the pool"),
+                ),
+                (
+                    "minutes_before",
+                    models.PositiveIntegerField(
+                        help_text="Pool minutes of all sessions before this one in tier order"
+                    ),
+                ),
+                (
+                    "session",
+                    models.OneToOneField(
+                        help_text="Counted TutorSpace session",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tutorspace_ledger_entry",
+                        to="lessons.session",
+                    ),
+                ),
+                (
+                    "tutor",
+                    models.ForeignKey(
+                        help_text="Tutor whose tier pool the session belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tutorspace_ledger_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "TutorSpace Ledger Entry",
+                "verbose_name_plural": "TutorSpace Ledger Entries",
+                "indexes": [
+                    models.Index(
+                        fields=["tutor", "date", "start_time", "session_created_at", "session"],
+                        name="lessons_ledger_order_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Data migration: build the TutorSpace tier ledger from existing sessions
+
+from django.db import migrations
+
+
+def backfill_ledger(apps, schema_editor):
+    Session = apps.get_model("lessons", "Session")
+    TutorSpaceLedgerEntry = apps.get_model("lessons", "TutorSpaceLedgerEntry")
+    UserProfile = apps.get_model("core", "UserProfile")
+
+    tier_from = dict(
+        UserProfile.objects.filter(tutorspace_tier_count_from__isnull=False).values_list(
+            "user_id", "tutorspace_tier_count_from"
+        )
+    )
+    sessions = (
+        Session.objects.filter(
+            contract__institute__iexact="TutorSpace",
+            status__in=("taught", "paid"),
+            tutor_no_show=False,
+            duration_minutes__gt=0,
+        )
+        .order_by("owner_id", "date", "start_time", "created_at", "pk")
+        .values_list("pk", "owner_id", "date", "start_time", "created_at", "duration_minutes")
+    )
+    entries = []
+    pool = {}
+    for pk, tutor_id, day, start_time, created_at, minutes in sessions.iterator():
+        if tutor_id in tier_from and day < tier_from[tutor_id]:
+            continue
+        minutes_before = pool.get(tutor_id, 0)
+        pool[tutor_id] = minutes_before + minutes
+        entries.append(
+            TutorSpaceLedgerEntry(
+                tutor_id=tutor_id,
+                session_id=pk,
+                date=day,
+                start_time=start_time,
+                session_created_at=created_at,
+                minutes=minutes,
+                minutes_before=minutes_before,
+            )
+        )
+    TutorSpaceLedgerEntry.objects.bulk_create(entries, batch_size=500)
+
+
+def clear_ledger(apps, schema_editor):
+    apps.get_model("lessons", "TutorSpaceLedgerEntry").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0023_tutorspaceledgerentry"),
+        ("core", "0011_userprofile_tutorspace_tier_count_from"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ledger, clear_ledger),
+    ]
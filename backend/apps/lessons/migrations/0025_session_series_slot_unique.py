@@ -0,0 +1,39 @@
+# Unique (series, date, start time) for series sessions. Duplicates created by concurrent
+# materialization are detached from their series first (kept as single sessions).
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def detach_duplicate_series_sessions(apps, schema_editor):
+    Session = apps.get_model("lessons", "Session")
+    duplicates = (
+        Session.objects.filter(recurring_session__isnull=False)
+        .values("recurring_session_id", "date", "start_time")
+        .annotate(count=Count("pk"), first=Min("pk"))
+        .filter(count__gt=1)
+    )
+    for row in duplicates.iterator():
+        Session.objects.filter(
+            recurring_session_id=row["recurring_session_id"],
+            date=row["date"],
+            start_time=row["start_time"],
+        ).exclude(pk=row["first"]).update(recurring_session=None)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lessons", "0024_backfill_tutorspace_ledger"),
+    ]
+
+    operations = [
+        migrations.RunPython(detach_duplicate_series_sessions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="session",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("recurring_session__isnull", False)),
+                fields=("recurring_session", "date", "start_time"),
+                name="lessons_les_series_slot_uniq",
+            ),
+        ),
+    ]
@@ -1,11 +1,34 @@
+from datetime import datetime, timedelta
 from functools import cached_property
 
+from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.contracts.models import Contract
-from apps.lessons.recurring_models import RecurringSession  # noqa: F401
+from apps.lessons.recurring_models import RecurringSession, contract_owner_id  # noqa: F401
+
+# Fields that change the occupied interval of a session (trigger conflict store updates)
+SCHEDULE_FIELDS = frozenset(
+    {
+        "contract",
+        "date",
+        "start_time",
+        "duration_minutes",
+        "travel_time_before_minutes",
+        "travel_time_after_minutes",
+    }
+)
+
+# Stored datetime columns derived from the schedule fields (see Session.sync_time_columns)
+TIME_COLUMNS = ("starts_at", "ends_at", "occupied_from", "occupied_until")
+
+# Fields that decide whether and where a session counts in the TutorSpace tier pool
+TIER_FIELDS = frozenset(
+    {"contract", "date", "start_time", "duration_minutes", "status", "tutor_no_show"}
+)
 
 
 class Session(models.Model):
@@ -24,6 +47,13 @@ class Session(models.Model):
         related_name="sessions",
         help_text=_("Associated contract"),
     )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="sessions",
+        editable=False,
+        help_text=_("Tutor who owns this session (the user of the contract's student)"),
+    )
     date = models.DateField(help_text=_("Session date"))
     start_time = models.TimeField(help_text=_("Start time"))
     duration_minutes = models.PositiveIntegerField(
@@ -62,6 +92,30 @@ class Session(models.Model):
         db_index=True,
         help_text=_("Source: public_booking, contract_booking, or tutor"),
     )
+    starts_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Start of the session, derived from date and time"),
+    )
+    ends_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("End of the session (without travel times), derived from date and time"),
+    )
+    occupied_from = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Start of the occupied time block including travel time before"),
+    )
+    occupied_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("End of the occupied time block including travel time after"),
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -72,8 +126,24 @@ class Session(models.Model):
         verbose_name_plural = _("Sessions")
         indexes = [
             models.Index(fields=["date", "start_time"]),
+            models.Index(fields=["owner", "date", "start_time"], name="lessons_les_owner_date_idx"),
+            models.Index(fields=["owner", "status", "date"], name="lessons_les_owner_status_idx"),
             models.Index(fields=["status"]),
             models.Index(fields=["contract", "date"], name="lessons_les_contract_date_idx"),
+            models.Index(fields=["status", "ends_at"], name="lessons_les_status_ends_idx"),
+            models.Index(
+                fields=["contract", "occupied_from", "occupied_until"],
+                name="lessons_les_contract_occ_idx",
+            ),
+        ]
+        constraints = [
+            # Series writers skip existing dates under the series row lock; this is the
+            # database guard against inserting a series date twice
+            models.UniqueConstraint(
+                fields=["recurring_session", "date", "start_time"],
+                condition=models.Q(recurring_session__isnull=False),
+                name="lessons_les_series_slot_uniq",
+            ),
         ]
 
     def __str__(self):
@@ -90,10 +160,10 @@ class Session(models.Model):
 
     @cached_property
     def has_conflicts(self):
-        """Checks if this session has conflicts (cached per instance)."""
+        """Checks if this session has conflicts (cached per instance, read from the store)."""
         from apps.lessons.services import SessionConflictService
 
-        return SessionConflictService.has_conflicts(self)
+        return SessionConflictService.has_stored_conflicts(self)
 
     def invalidate_conflict_cache(self):
         self.__dict__.pop("has_conflicts", None)
@@ -104,10 +174,133 @@ class Session(models.Model):
 
         return SessionConflictService.check_conflicts(self)
 
+    def sync_time_columns(self):
+        """
+        Recomputes the stored datetime columns (TIME_COLUMNS) from the schedule fields.
+
+        save() calls this itself; bulk_create/bulk_update callers must call it before
+        writing.
+        """
+        day = self._meta.get_field("date").to_python(self.date)
+        start_time = self._meta.get_field("start_time").to_python(self.start_time)
+        self.starts_at = timezone.make_aware(datetime.combine(day, start_time))
+        self.ends_at = self.starts_at + timedelta(minutes=self.duration_minutes)
+        self.occupied_from = self.starts_at - timedelta(minutes=self.travel_time_before_minutes)
+        self.occupied_until = self.ends_at + timedelta(minutes=self.travel_time_after_minutes)
+
     def save(self, *args, **kwargs):
         self.invalidate_conflict_cache()
+        self.sync_time_columns()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "contract" in update_fields:
+            self.owner_id = contract_owner_id(self)
+        if update_fields is not None and not SCHEDULE_FIELDS.isdisjoint(update_fields):
+            kwargs["update_fields"] = {*update_fields, *TIME_COLUMNS}
+            if "contract" in update_fields:
+                kwargs["update_fields"].add("owner")
+        adding = self._state.adding
         super().save(*args, **kwargs)
 
+        if update_fields is None or not SCHEDULE_FIELDS.isdisjoint(update_fields):
+            from apps.lessons.services import SessionConflictService
+
+            SessionConflictService.sync_session_conflicts(self)
+        if update_fields is None or not TIER_FIELDS.isdisjoint(update_fields):
+            from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
+
+            TutorSpaceLedgerService.sync_sessions([self], new=adding)
+
+
+class SessionConflict(models.Model):
+    """Materialized overlap of a session with another session or a blocked time."""
+
+    TYPE_CHOICES = [
+        ("lesson", _("Lesson")),
+        ("blocked_time", _("Blocked time")),
+    ]
+
+    session = models.ForeignKey(
+        Session,
+        on_delete=models.CASCADE,
+        related_name="conflict_entries",
+        help_text=_("Session that has the conflict"),
+    )
+    conflict_type = models.CharField(
+        max_length=20, choices=TYPE_CHOICES, help_text=_("Type of the conflicting object")
+    )
+    other_session = models.ForeignKey(
+        Session,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text=_("Overlapping session (for lesson conflicts)"),
+    )
+    blocked_time = models.ForeignKey(
+        "blocked_times.BlockedTime",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text=_("Overlapping blocked time (for blocked time conflicts)"),
+    )
+    start_datetime = models.DateTimeField(help_text=_("Start of the conflicting interval"))
+    end_datetime = models.DateTimeField(help_text=_("End of the conflicting interval"))
+
+    class Meta:
+        verbose_name = _("Session Conflict")
+        verbose_name_plural = _("Session Conflicts")
+        indexes = [
+            models.Index(fields=["session", "conflict_type"], name="lessons_conflict_session_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.session_id} - {self.conflict_type}"
+
+
+class TutorSpaceLedgerEntry(models.Model):
+    """
+    Materialized position of a session in the TutorSpace tier pool of its tutor.
+
+    One row per session that advances the tiers (taught/paid, not tutor_no_show, on or after
+    the profile's tutorspace_tier_count_from). The tier order key (date, start_time,
+    created_at, pk) is copied from the session; minutes_before holds the pool minutes of all
+    earlier rows, so tier lookups read a single row instead of summing the history.
+    """
+
+    tutor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="tutorspace_ledger_entries",
+        help_text=_("Tutor whose tier pool the session belongs to"),
+    )
+    session = models.OneToOneField(
+        Session,
+        on_delete=models.CASCADE,
+        related_name="tutorspace_ledger_entry",
+        help_text=_("Counted TutorSpace session"),
+    )
+    date = models.DateField(help_text=_("Session date"))
+    start_time = models.TimeField(help_text=_("Start time"))
+    session_created_at = models.DateTimeField(help_text=_("Creation time of the session"))
+    minutes = models.PositiveIntegerField(help_text=_("Minutes the session adds to the pool"))
+    minutes_before = models.PositiveIntegerField(
+        help_text=_("Pool minutes of all sessions before this one in tier order")
+    )
+
+    class Meta:
+        verbose_name = _("TutorSpace Ledger Entry")
+        verbose_name_plural = _("TutorSpace Ledger Entries")
+        indexes = [
+            models.Index(
+                fields=["tutor", "date", "start_time", "session_created_at", "session"],
+                name="lessons_ledger_order_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.session_id} - {self.minutes_before}+{self.minutes}"
+
 
 class SessionDocument(models.Model):
     """Document uploaded for a session."""
@@ -37,7 +37,7 @@ class SessionQueryService:
             .order_by("date", "start_time")
         )
         if user:
-            qs = qs.filter(contract__student__user=user)
+            qs = qs.filter(owner=user)
         return qs
 
     @staticmethod
@@ -50,7 +50,7 @@ class SessionQueryService:
             .order_by("start_time")
         )
         if user:
-            qs = qs.filter(contract__student__user=user)
+            qs = qs.filter(owner=user)
         return qs
 
     @staticmethod
@@ -77,7 +77,7 @@ class SessionQueryService:
             .order_by("date", "start_time")
         )
         if user:
-            qs = qs.filter(contract__student__user=user)
+            qs = qs.filter(owner=user)
         return qs[:10]
 
 
@@ -2,14 +2,84 @@
 Service für Kontingent-Prüfung basierend auf ContractMonthlyPlan.
 """
 
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import date
-from typing import Optional
+from typing import Iterable, Optional
 
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
 from django.utils.translation import gettext as _
 
 from apps.contracts.models import ContractMonthlyPlan
 from apps.lessons.models import Lesson
 
+COUNTED_STATUSES = ("planned", "taught", "paid")
+
+
+class ContractQuotaIndex:
+    """
+    Kumulierte Kontingent-Daten eines Vertrags (Präfixsummen pro Monat).
+
+    Hält für jeden Monat mit Plan bzw. Lessons die Summe der geplanten Einheiten und
+    der nicht stornierten Lessons von Vertragsbeginn bis Monatsende. Die Prüfung einer
+    Lesson ist damit ein Lookup statt zweier Queries.
+
+    Ein Index gilt für eine Batch-Berechnung nach den Schreibzugriffen (Konfliktlisten,
+    Serien-Konfliktbericht); einzelne Prüfungen nutzen check_quota_conflict.
+    """
+
+    def __init__(self, contract, planned_by_month: dict, lessons_by_month: dict):
+        self.contract = contract
+        self._planned_months, self._planned_sums = self._prefix_sums(planned_by_month)
+        self._lesson_months, self._lesson_sums = self._prefix_sums(lessons_by_month)
+
+    @staticmethod
+    def _prefix_sums(values_by_month: dict) -> tuple[list, list]:
+        months = sorted(values_by_month)
+        sums = []
+        total = 0
+        for key in months:
+            total += values_by_month[key]
+            sums.append(total)
+        return months, sums
+
+    @staticmethod
+    def _cumulative(months: list, sums: list, year: int, month: int) -> Optional[int]:
+        position = bisect_right(months, (year, month))
+        return sums[position - 1] if position else None
+
+    def planned_total(self, year: int, month: int) -> Optional[int]:
+        """Geplante Einheiten bis einschließlich Monat (None, wenn kein Plan existiert)."""
+        return self._cumulative(self._planned_months, self._planned_sums, year, month)
+
+    def actual_total(self, year: int, month: int) -> int:
+        """Nicht stornierte Lessons von Vertragsbeginn bis Monatsende."""
+        return self._cumulative(self._lesson_months, self._lesson_sums, year, month) or 0
+
+    def check(self, lesson: Lesson, exclude_self: bool = True) -> Optional[dict]:
+        """
+        Wie ContractQuotaService.check_quota_conflict, aber ohne Queries.
+
+        Erwartet eine Lesson im Zustand der Datenbank (z. B. aus einem Queryset).
+        """
+        if not self.contract.has_monthly_planning_limit:
+            return None
+
+        lesson_year = lesson.date.year
+        lesson_month = lesson.date.month
+        planned_total = self.planned_total(lesson_year, lesson_month)
+        if planned_total is None:
+            return None
+
+        actual_lessons = self.actual_total(lesson_year, lesson_month)
+        if exclude_self and lesson.pk and lesson.status in COUNTED_STATUSES:
+            actual_lessons -= 1
+
+        return ContractQuotaService._conflict_result(
+            lesson_year, lesson_month, planned_total, actual_lessons
+        )
+
 
 class ContractQuotaService:
     """Service für Prüfung von Vertragskontingenten."""
@@ -73,7 +143,7 @@ class ContractQuotaService:
         # Get all lessons of this contract with date <= month end
         # Status: PLANNED, TAUGHT, PAID (no CANCELLED)
         lessons_query = Lesson.objects.filter(
-            contract=contract, date__lte=month_end, status__in=["planned", "taught", "paid"]
+            contract=contract, date__lte=month_end, status__in=COUNTED_STATUSES
         )
 
         if exclude_self and lesson.pk:
@@ -81,7 +151,15 @@ class ContractQuotaService:
 
         actual_lessons = lessons_query.count()
 
-        # Check: actual_lessons + 1 (the new lesson) > planned_total
+        return ContractQuotaService._conflict_result(
+            lesson_year, lesson_month, planned_total, actual_lessons
+        )
+
+    @staticmethod
+    def _conflict_result(
+        year: int, month: int, planned_total: int, actual_lessons: int
+    ) -> Optional[dict]:
+        """Baut das Konflikt-Dict, wenn actual_lessons + 1 (die neue Lesson) > planned_total."""
         if actual_lessons + 1 > planned_total:
             return {
                 "type": "quota",
@@ -90,19 +168,58 @@ class ContractQuotaService:
                     "By the end of {month:02d}.{year}, {planned} units are planned, "
                     "but {actual} hours are present/planned."
                 ).format(
-                    month=lesson_month,
-                    year=lesson_year,
+                    month=month,
+                    year=year,
                     planned=planned_total,
                     actual=actual_lessons + 1,
                 ),
                 "planned_total": planned_total,
                 "actual_total": actual_lessons + 1,
-                "month": lesson_month,
-                "year": lesson_year,
+                "month": month,
+                "year": year,
             }
 
         return None
 
+    @staticmethod
+    def build_indexes(contracts: Iterable) -> dict[int, ContractQuotaIndex]:
+        """
+        Baut Kontingent-Indizes für mehrere Verträge mit zwei gruppierten Queries.
+
+        Verträge ohne monatliches Planungslimit brauchen keinen Index und werden übersprungen.
+
+        Args:
+            contracts: Contract-Objekte
+
+        Returns:
+            Dict contract_id -> ContractQuotaIndex
+        """
+        contracts = {c.pk: c for c in contracts if c.has_monthly_planning_limit}
+        if not contracts:
+            return {}
+
+        planned = defaultdict(dict)
+        for contract_id, year, month, units in ContractMonthlyPlan.objects.filter(
+            contract_id__in=contracts
+        ).values_list("contract_id", "year", "month", "planned_units"):
+            planned[contract_id][(year, month)] = units
+
+        lessons = defaultdict(dict)
+        rows = (
+            Lesson.objects.filter(contract_id__in=contracts, status__in=COUNTED_STATUSES)
+            .annotate(year=ExtractYear("date"), month=ExtractMonth("date"))
+            .values("contract_id", "year", "month")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            lessons[row["contract_id"]][(row["year"], row["month"])] = row["count"]
+
+        return {
+            contract_id: ContractQuotaIndex(contract, planned[contract_id], lessons[contract_id])
+            for contract_id, contract in contracts.items()
+        }
+
     @staticmethod
     def has_quota_conflict(lesson: Lesson, exclude_self: bool = True) -> bool:
         """
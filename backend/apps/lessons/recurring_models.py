@@ -2,11 +2,27 @@
 Models for recurring sessions (series appointments).
 """
 
+from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from apps.contracts.models import Contract
+from apps.core.recurrence import Recurrence
+
+
+def contract_owner_id(instance) -> int | None:
+    """Tutor of the contract of a session or series; uses loaded relations, otherwise one query."""
+    if instance.contract_id is None:
+        return None
+    contract_field = type(instance).contract
+    if contract_field.is_cached(instance) and Contract.student.is_cached(instance.contract):
+        return instance.contract.student.user_id
+    return (
+        Contract.objects.filter(pk=instance.contract_id)
+        .values_list("student__user_id", flat=True)
+        .first()
+    )
 
 
 class RecurringSession(models.Model):
@@ -18,6 +34,13 @@ class RecurringSession(models.Model):
         related_name="recurring_sessions",
         help_text=_("Associated contract"),
     )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recurring_sessions",
+        editable=False,
+        help_text=_("Tutor who owns this series (the user of the contract's student)"),
+    )
     start_date = models.DateField(help_text=_("Series start date"))
     end_date = models.DateField(
         null=True, blank=True, help_text=_("Series end date (optional, empty = until contract end)")
@@ -54,6 +77,11 @@ class RecurringSession(models.Model):
     sunday = models.BooleanField(default=False, help_text=_("Sunday"))
     is_active = models.BooleanField(default=True, help_text=_("Is the series active?"))
     notes = models.TextField(blank=True, null=True, help_text=_("Notes for the series"))
+    materialized_until = models.DateField(
+        null=True,
+        blank=True,
+        help_text=_("Last day up to which the series has been materialized"),
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -62,11 +90,22 @@ class RecurringSession(models.Model):
         ordering = ["-start_date", "contract"]
         verbose_name = _("Recurring Session")
         verbose_name_plural = _("Recurring Sessions")
+        indexes = [
+            models.Index(fields=["owner", "is_active"], name="lessons_rec_owner_active_idx"),
+        ]
 
     def __str__(self):
         weekdays = self.get_active_weekdays_display()
         return f"{self.contract.student} - {weekdays} {self.start_time} (from {self.start_date})"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "contract" in update_fields:
+            self.owner_id = contract_owner_id(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "owner"}
+        super().save(*args, **kwargs)
+
     def get_active_weekdays(self):
         """Returns a list of active weekdays (0=Monday, 6=Sunday)."""
         weekdays = []
@@ -86,6 +125,13 @@ class RecurringSession(models.Model):
             weekdays.append(6)
         return weekdays
 
+    @property
+    def recurrence(self) -> Recurrence:
+        """Recurrence rule; bi-weekly weeks are 7-day blocks from the start date."""
+        return Recurrence.from_series(
+            self.recurrence_type, self.start_date, self.end_date, self.get_active_weekdays()
+        )
+
     def get_active_weekdays_display(self):
         """Returns a human-readable representation of active weekdays."""
         from django.utils.translation import gettext
@@ -103,5 +149,68 @@ class RecurringSession(models.Model):
         return ", ".join(active) if active else gettext("None")
 
 
+class SeriesGenerationJob(models.Model):
+    """Background job that generates the sessions of a series (processed by a worker)."""
+
+    STATUS_CHOICES = [
+        ("pending", _("Pending")),
+        ("running", _("Running")),
+        ("done", _("Done")),
+        ("failed", _("Failed")),
+    ]
+
+    recurring_session = models.ForeignKey(
+        RecurringSession,
+        on_delete=models.CASCADE,
+        related_name="generation_jobs",
+        help_text=_("Series whose sessions are generated"),
+    )
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default="pending", help_text=_("Job status")
+    )
+    check_conflicts = models.BooleanField(default=True, help_text=_("Report conflicts"))
+    total = models.PositiveIntegerField(default=0, help_text=_("Number of series dates"))
+    processed = models.PositiveIntegerField(default=0, help_text=_("Number of processed dates"))
+    created = models.PositiveIntegerField(default=0, help_text=_("Number of created sessions"))
+    skipped = models.PositiveIntegerField(default=0, help_text=_("Number of skipped dates"))
+    conflict_count = models.PositiveIntegerField(
+        default=0, help_text=_("Number of created sessions with conflicts")
+    )
+    error = models.TextField(blank=True, default="", help_text=_("Error message (if failed)"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = _("Series Generation Job")
+        verbose_name_plural = _("Series Generation Jobs")
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="lessons_genjob_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.recurring_session_id} - {self.status} ({self.processed}/{self.total})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def progress(self) -> dict:
+        """Progress data as returned by the polling endpoint."""
+        percent = int(100 * self.processed / self.total) if self.total else 0
+        return {
+            "id": self.pk,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "percent": 100 if self.status == "done" else percent,
+            "created": self.created,
+            "skipped": self.skipped,
+            "conflicts": self.conflict_count,
+            "error": self.error,
+        }
+
+
 # Alias for backwards compatibility during migration
 RecurringLesson = RecurringSession
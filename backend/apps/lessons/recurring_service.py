@@ -5,8 +5,14 @@ Service for recurring sessions (series appointments).
 from datetime import date, timedelta
 from typing import List
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.recurrence import horizon_end
 from apps.lessons.models import Session
-from apps.lessons.recurring_models import RecurringSession
+from apps.lessons.recurring_models import RecurringSession, contract_owner_id
 
 
 class RecurringSessionService:
@@ -17,7 +23,7 @@ class RecurringSessionService:
         recurring_session: RecurringSession, check_conflicts: bool = True, dry_run: bool = False
     ) -> dict:
         """
-        Generates sessions for a RecurringSession over the period [start_date, end_date].
+        Generates sessions for a RecurringSession from start_date to materialization_end.
 
         Args:
             recurring_session: The RecurringSession template
@@ -34,269 +40,312 @@ class RecurringSessionService:
         if not recurring_session.is_active:
             return {"created": 0, "skipped": 0, "conflicts": [], "preview": [], "sessions": []}
 
-        # Determine end date
-        end_date = recurring_session.end_date
-        if not end_date:
-            # If no end date, use contract end date or 1 year
-            if recurring_session.contract.end_date:
-                end_date = recurring_session.contract.end_date
-            else:
-                end_date = date(
-                    recurring_session.start_date.year + 1,
-                    recurring_session.start_date.month,
-                    recurring_session.start_date.day,
-                )
+        until = RecurringSessionService.materialization_end(recurring_session)
+        session_dates = recurring_session.recurrence.between(recurring_session.start_date, until)
+        result = RecurringSessionService._create_sessions(
+            recurring_session, session_dates, check_conflicts, dry_run
+        )
+        if not dry_run:
+            RecurringSessionService.mark_materialized(recurring_session, until)
+        return result
 
-        # Generate sessions based on recurrence_type
-        recurrence_type = recurring_session.recurrence_type
+    @staticmethod
+    def materialization_end(recurring_session: RecurringSession, today: date | None = None) -> date:
+        """
+        Returns the last day up to which a series is materialized now.
 
-        if recurrence_type == "weekly":
-            return RecurringSessionService._generate_weekly_sessions(
-                recurring_session, end_date, check_conflicts, dry_run
-            )
-        elif recurrence_type == "biweekly":
-            return RecurringSessionService._generate_biweekly_sessions(
-                recurring_session, end_date, check_conflicts, dry_run
-            )
-        elif recurrence_type == "monthly":
-            return RecurringSessionService._generate_monthly_sessions(
-                recurring_session, end_date, check_conflicts, dry_run
-            )
-        else:
-            # Fallback to weekly for unknown types
-            return RecurringSessionService._generate_weekly_sessions(
-                recurring_session, end_date, check_conflicts, dry_run
-            )
+        Series with an end date are materialized completely. Open-ended series only run
+        up to the rolling horizon (SERIES_HORIZON_WEEKS ahead), capped at the contract end;
+        materialize_series extends them later.
+        """
+        if recurring_session.end_date:
+            return recurring_session.end_date
+        if today is None:
+            today = timezone.localdate()
+        until = horizon_end(recurring_session.start_date, today, settings.SERIES_HORIZON_WEEKS)
+        contract_end = recurring_session.contract.end_date
+        return min(until, contract_end) if contract_end else until
 
     @staticmethod
-    def _generate_weekly_sessions(
-        recurring_session: RecurringSession, end_date: date, check_conflicts: bool, dry_run: bool
-    ) -> dict:
-        """Generates weekly sessions."""
-        active_weekdays = recurring_session.get_active_weekdays()
+    def get_session_dates(recurring_session: RecurringSession) -> List[date]:
+        """Returns the dates of a series from start_date to materialization_end."""
+        return recurring_session.recurrence.between(
+            recurring_session.start_date,
+            RecurringSessionService.materialization_end(recurring_session),
+        )
 
-        if not active_weekdays:
-            return {"created": 0, "skipped": 0, "conflicts": [], "preview": [], "sessions": []}
+    @staticmethod
+    def lock_series(recurring_session: RecurringSession) -> dict | None:
+        """
+        Locks the series row (SELECT ... FOR UPDATE) and returns its current state.
 
-        current_date = recurring_session.start_date
-        created = 0
-        skipped = 0
-        conflicts = []
-        preview = []
-        sessions = []  # Collect created sessions for email notifications
-        dates_checked = []
-
-        while current_date <= end_date:
-            weekday = current_date.weekday()  # 0=Monday, 6=Sunday
-
-            if weekday in active_weekdays:
-                dates_checked.append(str(current_date))
-                result = RecurringSessionService._create_session_if_not_exists(
-                    recurring_session, current_date, check_conflicts, dry_run
-                )
-                if result["created"]:
-                    created += 1
-                    if result.get("session"):
-                        if dry_run:
-                            preview.append(result["session"])
-                        else:
-                            # Collect created sessions for email notifications
-                            sessions.append(result["session"])
-                        if result.get("conflicts"):
-                            conflicts.extend(result["conflicts"])
-                elif result["skipped"]:
-                    skipped += 1
-
-            current_date += timedelta(days=1)
-
-        return {
-            "created": created,
-            "skipped": skipped,
-            "conflicts": conflicts,
-            "preview": preview if dry_run else [],
-            "sessions": sessions if not dry_run else [],
-        }
+        Serializes every writer of a series (request catch-up, materialize_series, job
+        chunks), so existing dates and materialized_until are read after the previous
+        writer committed. Only call inside transaction.atomic().
+
+        Returns:
+            Dict with 'is_active' and 'materialized_until', or None if the series is gone
+        """
+        return (
+            RecurringSession.objects.select_for_update()
+            .filter(pk=recurring_session.pk)
+            .values("is_active", "materialized_until")
+            .first()
+        )
+
+    @staticmethod
+    def mark_materialized(recurring_session: RecurringSession, until: date) -> None:
+        """Records the last materialized day (without save(), the series itself is unchanged)."""
+        RecurringSession.objects.filter(pk=recurring_session.pk).update(materialized_until=until)
+        recurring_session.materialized_until = until
 
     @staticmethod
-    def _generate_biweekly_sessions(
-        recurring_session: RecurringSession, end_date: date, check_conflicts: bool, dry_run: bool
+    def extend_materialization(
+        recurring_session: RecurringSession, today: date | None = None
     ) -> dict:
-        """Generates bi-weekly sessions (every 2 weeks)."""
-        active_weekdays = recurring_session.get_active_weekdays()
-        if not active_weekdays:
-            return {"created": 0, "skipped": 0, "conflicts": [], "preview": [], "sessions": []}
+        """
+        Materializes the dates between the last materialized day and the current horizon.
 
-        start_date = recurring_session.start_date
-        current_date = start_date
-        created = 0
-        skipped = 0
-        conflicts = []
-        preview = []
-        sessions = []  # Collect created sessions for email notifications
-
-        while current_date <= end_date:
-            weekday = current_date.weekday()
-
-            if weekday in active_weekdays:
-                # Only every 2nd week — consistent with _date_matches_recurring_pattern()
-                weeks_since_start = (current_date - start_date).days // 7
-                if weeks_since_start % 2 == 0:
-                    result = RecurringSessionService._create_session_if_not_exists(
-                        recurring_session, current_date, check_conflicts, dry_run
-                    )
-                    if result["created"]:
-                        created += 1
-                        if result.get("session"):
-                            if dry_run:
-                                preview.append(result["session"])
-                            else:
-                                # Collect created sessions for email notifications
-                                sessions.append(result["session"])
-                            if result.get("conflicts"):
-                                conflicts.extend(result["conflicts"])
-                    elif result["skipped"]:
-                        skipped += 1
-
-            current_date += timedelta(days=1)
-
-        return {
-            "created": created,
-            "skipped": skipped,
-            "conflicts": conflicts,
-            "preview": preview if dry_run else [],
-            "sessions": sessions if not dry_run else [],
-        }
+        The series row is locked and re-read first, so concurrent extensions of the same
+        series do not insert the same dates twice.
+
+        Returns:
+            Dict with 'created' and 'skipped' (see generate_sessions)
+        """
+        with transaction.atomic():
+            current = RecurringSessionService.lock_series(recurring_session)
+            if current is None:
+                return {"created": 0, "skipped": 0}
+            recurring_session.is_active = current["is_active"]
+            recurring_session.materialized_until = current["materialized_until"]
+
+            until = RecurringSessionService.materialization_end(recurring_session, today)
+            start = recurring_session.start_date
+            if recurring_session.materialized_until:
+                start = max(start, recurring_session.materialized_until + timedelta(days=1))
+            if not recurring_session.is_active or start > until:
+                return {"created": 0, "skipped": 0}
+
+            session_dates = recurring_session.recurrence.between(start, until)
+            result = RecurringSessionService._create_sessions(
+                recurring_session, session_dates, check_conflicts=False, dry_run=False, lock=False
+            )
+            RecurringSessionService.mark_materialized(recurring_session, until)
+        return {"created": result["created"], "skipped": result["skipped"]}
 
     @staticmethod
-    def _generate_monthly_sessions(
-        recurring_session: RecurringSession, end_date: date, check_conflicts: bool, dry_run: bool
-    ) -> dict:
-        """Generates monthly sessions (same calendar day every month)."""
-        active_weekdays = recurring_session.get_active_weekdays()
-        if not active_weekdays:
-            return {"created": 0, "skipped": 0, "conflicts": [], "preview": [], "sessions": []}
+    def extend_all_materializations(today: date | None = None, user=None) -> dict:
+        """
+        Extends every active series whose materialization lags behind the horizon.
+
+        The full sweep runs in materialize_series; the tutor's own calendar and dashboard
+        views catch up their series. Series with a pending or running SeriesGenerationJob
+        are left to the worker, which is still creating their sessions.
 
-        created = 0
-        skipped = 0
-        conflicts = []
-        preview = []
-        sessions = []  # Collect created sessions for email notifications
-
-        # Start with the start date
-        current_date = recurring_session.start_date
-        start_day = current_date.day  # Day of month (e.g., 15th)
-
-        from calendar import monthrange
-
-        while current_date <= end_date:
-            # Check if current date is the correct day of month
-            # AND if it is an active weekday
-            target_day = start_day
-            # If the day doesn't exist in the current month (e.g., Feb 31),
-            # use the last day of the month
-            last_day_of_month = monthrange(current_date.year, current_date.month)[1]
-            if start_day > last_day_of_month:
-                target_day = last_day_of_month
-
-            if current_date.day == target_day and current_date.weekday() in active_weekdays:
-                result = RecurringSessionService._create_session_if_not_exists(
-                    recurring_session, current_date, check_conflicts, dry_run
+        Args:
+            today: Optional date (default: today)
+            user: Optional tutor; only their series are extended
+
+        Returns:
+            Dict with 'series' (number of extended series) and 'created'
+        """
+        if today is None:
+            today = timezone.localdate()
+        min_horizon = today + timedelta(weeks=settings.SERIES_HORIZON_WEEKS)
+        candidates = (
+            RecurringSession.objects.filter(is_active=True)
+            .filter(Q(materialized_until__isnull=True) | Q(materialized_until__lt=min_horizon))
+            .filter(
+                Q(end_date__isnull=True)
+                | Q(materialized_until__isnull=True)
+                | Q(materialized_until__lt=F("end_date"))
+            )
+            .exclude(generation_jobs__status__in=("pending", "running"))
+            .select_related("contract__student")
+        )
+        if user is not None:
+            candidates = candidates.filter(owner=user)
+        series = created = 0
+        for recurring_session in candidates:
+            result = RecurringSessionService.extend_materialization(recurring_session, today)
+            series += 1
+            created += result["created"]
+        return {"series": series, "created": created}
+
+    @staticmethod
+    def unmaterialized_sessions(
+        recurring_sessions, start: date, end: date, existing=()
+    ) -> List[Session]:
+        """
+        Unsaved sessions for series dates in [start, end] that are not materialized yet.
+
+        Read-only counterpart of extend_materialization: booking pages count these dates
+        as busy before materialize_series has created them, without writing on a GET.
+        Dates already taken by a loaded session (same contract, date, start time) are
+        skipped.
+
+        Args:
+            recurring_sessions: RecurringSession templates (with contract loaded)
+            start: First day of the window
+            end: Last day of the window
+            existing: Sessions already loaded for the window
+
+        Returns:
+            List of Session instances (not saved)
+        """
+        taken = {(s.contract_id, s.date, s.start_time) for s in existing}
+        projected = []
+        for recurring_session in recurring_sessions:
+            if not recurring_session.is_active:
+                continue
+            first = max(start, recurring_session.start_date)
+            if recurring_session.materialized_until:
+                first = max(first, recurring_session.materialized_until + timedelta(days=1))
+            last = end
+            if recurring_session.end_date:
+                last = min(last, recurring_session.end_date)
+            elif recurring_session.contract.end_date:
+                last = min(last, recurring_session.contract.end_date)
+            if first > last:
+                continue
+            for session_date in recurring_session.recurrence.between(first, last):
+                key = (recurring_session.contract_id, session_date, recurring_session.start_time)
+                if key in taken:
+                    continue
+                taken.add(key)
+                projected.append(
+                    Session(
+                        contract=recurring_session.contract,
+                        owner_id=recurring_session.owner_id,
+                        date=session_date,
+                        start_time=recurring_session.start_time,
+                        duration_minutes=recurring_session.duration_minutes,
+                        travel_time_before_minutes=recurring_session.travel_time_before_minutes,
+                        travel_time_after_minutes=recurring_session.travel_time_after_minutes,
+                        status="planned",
+                        recurring_session=recurring_session,
+                    )
                 )
-                if result["created"]:
-                    created += 1
-                    if result.get("session"):
-                        if dry_run:
-                            preview.append(result["session"])
-                        else:
-                            # Collect created sessions for email notifications
-                            sessions.append(result["session"])
-                        if result.get("conflicts"):
-                            conflicts.extend(result["conflicts"])
-                elif result["skipped"]:
-                    skipped += 1
-
-            # Jump to next month
-            # Calculate the next month
-            if current_date.month == 12:
-                next_year = current_date.year + 1
-                next_month = 1
-            else:
-                next_year = current_date.year
-                next_month = current_date.month + 1
-
-            # Try the same day in the next month
-            last_day_next_month = monthrange(next_year, next_month)[1]
-            target_day_next = min(start_day, last_day_next_month)
-
-            try:
-                current_date = date(next_year, next_month, target_day_next)
-            except ValueError:
-                # Fallback: last day of month
-                current_date = date(next_year, next_month, last_day_next_month)
-
-        return {
-            "created": created,
-            "skipped": skipped,
-            "conflicts": conflicts,
-            "preview": preview if dry_run else [],
-            "sessions": sessions if not dry_run else [],
-        }
+        return projected
 
     @staticmethod
-    def _create_session_if_not_exists(
+    def _create_sessions(
         recurring_session: RecurringSession,
-        session_date: date,
+        session_dates: List[date],
         check_conflicts: bool,
         dry_run: bool,
+        lock: bool = True,
     ) -> dict:
-        """Helper method: Creates a session if it doesn't exist yet."""
-        # Check if a session already exists for this day
-        existing = Session.objects.filter(
-            contract=recurring_session.contract,
-            date=session_date,
-            start_time=recurring_session.start_time,
-        ).first()
-
-        if existing:
-            return {"created": False, "skipped": True}
-
-        # Create new session (without status - will be set automatically)
-        session = Session(
-            contract=recurring_session.contract,
-            date=session_date,
-            start_time=recurring_session.start_time,
-            duration_minutes=recurring_session.duration_minutes,
-            travel_time_before_minutes=recurring_session.travel_time_before_minutes,
-            travel_time_after_minutes=recurring_session.travel_time_after_minutes,
-            status="",  # Empty - will be set automatically
-            notes=recurring_session.notes,
-            recurring_session=recurring_session,
-        )
-
-        # Automatic status setting (before saving)
-        from apps.lessons.status_service import SessionStatusUpdater
+        """
+        Creates the sessions of a series for the given dates in one pass.
 
-        SessionStatusUpdater.update_status_for_session(session)
+        New sessions come from build_new_sessions, are inserted with bulk_create and
+        their conflicts are stored and read back in one batch. Existing dates are read
+        while the series row is locked (lock=False: the caller already holds the lock).
+        """
+        if dry_run:
+            new_sessions = RecurringSessionService.build_new_sessions(
+                recurring_session, session_dates
+            )
+            return {
+                "created": len(new_sessions),
+                "skipped": len(session_dates) - len(new_sessions),
+                "conflicts": [],
+                "preview": new_sessions,
+                "sessions": [],
+            }
+
+        from apps.lessons.availability_cache import bump_schedule_version
+        from apps.lessons.services import SessionConflictService
+        from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
+
+        with transaction.atomic():
+            if lock:
+                RecurringSessionService.lock_series(recurring_session)
+            new_sessions = RecurringSessionService.build_new_sessions(
+                recurring_session, session_dates
+            )
+            if new_sessions:
+                Session.objects.bulk_create(new_sessions, batch_size=500)
+                # bulk_create bypasses Session.save() and the post_save receivers
+                SessionConflictService.sync_new_sessions_conflicts(new_sessions)
+                TutorSpaceLedgerService.sync_sessions(new_sessions, new=True)
+
+        result = {
+            "created": len(new_sessions),
+            "skipped": len(session_dates) - len(new_sessions),
+            "conflicts": [],
+            "preview": [],
+            "sessions": new_sessions,
+        }
+        if not new_sessions:
+            return result
+        bump_schedule_version(recurring_session.owner_id)
+
+        if check_conflicts:
+            # The store was just written for the new sessions; reading it back avoids
+            # a second overlap computation
+            conflicts_by_session = SessionConflictService.get_stored_conflicts(new_sessions)
+            result["conflicts"] = [
+                {
+                    "session": session,
+                    "date": session.date,
+                    "conflicts": conflicts_by_session[session.pk],
+                }
+                for session in new_sessions
+                if conflicts_by_session.get(session.pk)
+            ]
 
-        result = {"created": True, "skipped": False, "session": session, "conflicts": []}
+        return result
 
-        if not dry_run:
-            session.save()
-            # Set status again after saving (if necessary)
-            SessionStatusUpdater.update_status_for_session(session)
-            session.refresh_from_db()  # Refresh to get updated status
+    @staticmethod
+    def build_new_sessions(
+        recurring_session: RecurringSession, session_dates: List[date]
+    ) -> List[Session]:
+        """
+        Builds unsaved sessions of a series for the dates that are not taken yet.
 
-            # Check conflicts
-            if check_conflicts:
-                from apps.lessons.services import SessionConflictService
+        Existing sessions (same contract, date and start time) are loaded with a single
+        query and skipped; statuses are set in memory.
+        """
+        from apps.lessons.status_service import SessionStatusUpdater
 
-                session_conflicts = SessionConflictService.check_conflicts(session)
-                if session_conflicts:
-                    result["conflicts"] = [
-                        {"session": session, "date": session_date, "conflicts": session_conflicts}
-                    ]
+        contract = recurring_session.contract
+        existing_dates = set()
+        if session_dates:
+            existing_dates = set(
+                Session.objects.filter(
+                    contract=contract,
+                    start_time=recurring_session.start_time,
+                    date__gte=session_dates[0],
+                    date__lte=session_dates[-1],
+                ).values_list("date", flat=True)
+            )
 
-        return result
+        owner_id = contract_owner_id(recurring_session)
+        new_sessions = []
+        for session_date in session_dates:
+            if session_date in existing_dates:
+                continue
+            # Create new session (without status - will be set automatically)
+            session = Session(
+                contract=contract,
+                owner_id=owner_id,
+                date=session_date,
+                start_time=recurring_session.start_time,
+                duration_minutes=recurring_session.duration_minutes,
+                travel_time_before_minutes=recurring_session.travel_time_before_minutes,
+                travel_time_after_minutes=recurring_session.travel_time_after_minutes,
+                status="",  # Empty - will be set automatically
+                notes=recurring_session.notes,
+                recurring_session=recurring_session,
+            )
+            # bulk_create does not call save()
+            session.sync_time_columns()
+            # Automatic status setting (unsaved session: no query)
+            SessionStatusUpdater.update_status_for_session(session)
+            new_sessions.append(session)
+        return new_sessions
 
     @staticmethod
     def preview_sessions(recurring_session: RecurringSession) -> List[Session]:
@@ -315,6 +364,25 @@ class RecurringSessionService:
         return result.get("preview", [])
 
 
+def extend_series_of_user(user, today: date | None = None) -> int:
+    """
+    Extends the lagging open-ended lesson and blocked-time series of one tutor.
+
+    Catch-up for the tutor's own calendar and dashboard views, for deployments without
+    materialize_series or the process_series_jobs worker; a single query per series type
+    when nothing lags. Anonymous booking pages stay read-only and project the missing
+    dates instead (unmaterialized_sessions).
+
+    Returns:
+        Number of created lessons and blocked times
+    """
+    from apps.blocked_times.recurring_service import RecurringBlockedTimeService
+
+    sessions = RecurringSessionService.extend_all_materializations(today=today, user=user)
+    blocked = RecurringBlockedTimeService.extend_all_materializations(today=today, user=user)
+    return sessions["created"] + blocked["created"]
+
+
 # Aliases for backwards compatibility
 RecurringLessonService = RecurringSessionService
 # Alias for method name
@@ -2,8 +2,11 @@
 Utility functions for finding recurring sessions that match a session.
 """
 
+from collections import defaultdict
 from datetime import date
 
+from django.db.models import Q
+
 from apps.lessons.models import Session
 from apps.lessons.recurring_models import RecurringSession
 
@@ -35,6 +38,48 @@ def find_matching_recurring_session(session: Session) -> RecurringSession | None
 find_matching_recurring_lesson = find_matching_recurring_session
 
 
+def find_matching_recurring_sessions(
+    sessions: list[Session],
+) -> dict[int, RecurringSession | None]:
+    """
+    Batch variant of find_matching_recurring_session.
+
+    Loads the series referenced via FK and all series of the contracts of legacy
+    sessions in a single query, then matches legacy sessions in memory.
+
+    Returns:
+        Dict session.id -> RecurringSession (or None)
+    """
+    fk_ids = {s.recurring_session_id for s in sessions if s.recurring_session_id is not None}
+    legacy_contract_ids = {s.contract_id for s in sessions if s.recurring_session_id is None}
+    if not fk_ids and not legacy_contract_ids:
+        return {}
+
+    candidates = list(
+        RecurringSession.objects.filter(Q(pk__in=fk_ids) | Q(contract_id__in=legacy_contract_ids))
+    )
+    by_id = {r.pk: r for r in candidates}
+    by_contract_and_time = defaultdict(list)
+    for recurring in candidates:
+        if recurring.contract_id in legacy_contract_ids:
+            by_contract_and_time[(recurring.contract_id, recurring.start_time)].append(recurring)
+
+    result = {}
+    for session in sessions:
+        if session.recurring_session_id is not None:
+            result[session.id] = by_id.get(session.recurring_session_id)
+            continue
+        result[session.id] = next(
+            (
+                recurring
+                for recurring in by_contract_and_time[(session.contract_id, session.start_time)]
+                if _date_matches_recurring_pattern(session.date, recurring)
+            ),
+            None,
+        )
+    return result
+
+
 def get_all_sessions_for_recurring(
     recurring: RecurringSession, original_start_time=None
 ) -> list[Session]:
@@ -49,7 +94,9 @@ def get_all_sessions_for_recurring(
     # When called during a series edit we must use the old start_time, so
     # fall through to pattern matching in that case.
     if original_start_time is None:
-        fk_sessions = list(Session.objects.filter(recurring_session=recurring))
+        fk_sessions = list(
+            Session.objects.filter(recurring_session=recurring).select_related("contract__student")
+        )
         if fk_sessions:
             return fk_sessions
 
@@ -61,7 +108,9 @@ def get_all_sessions_for_recurring(
     if not end_date and recurring.contract.end_date:
         end_date = recurring.contract.end_date
 
-    qs = Session.objects.filter(contract=recurring.contract, date__gte=start_date)
+    qs = Session.objects.filter(contract=recurring.contract, date__gte=start_date).select_related(
+        "contract__student"
+    )
     if end_date:
         qs = qs.filter(date__lte=end_date)
 
@@ -83,36 +132,4 @@ get_all_lessons_for_recurring = get_all_sessions_for_recurring
 
 def _date_matches_recurring_pattern(session_date: date, recurring: RecurringSession) -> bool:
     """Checks if a date matches the recurrence pattern of a RecurringSession."""
-    # Check if the date is within the period
-    if session_date < recurring.start_date:
-        return False
-
-    if recurring.end_date and session_date > recurring.end_date:
-        return False
-
-    # Check if the weekday is active
-    weekday = session_date.weekday()  # 0=Monday, 6=Sunday
-    active_weekdays = recurring.get_active_weekdays()
-
-    if weekday not in active_weekdays:
-        return False
-
-    # Check based on recurrence_type
-    if recurring.recurrence_type == "weekly":
-        # Every week - already checked by weekday
-        return True
-
-    elif recurring.recurrence_type == "biweekly":
-        # Every 2 weeks
-        weeks_since_start = (session_date - recurring.start_date).days // 7
-        return weeks_since_start % 2 == 0
-
-    elif recurring.recurrence_type == "monthly":
-        # Monthly - same calendar day, adjusted for months with fewer days
-        from calendar import monthrange
-
-        last_day = monthrange(session_date.year, session_date.month)[1]
-        target_day = min(recurring.start_date.day, last_day)
-        return session_date.day == target_day
-
-    return False
+    return recurring.recurrence.matches(session_date)
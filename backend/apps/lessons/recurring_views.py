@@ -5,8 +5,9 @@ Views für RecurringLesson-CRUD-Operationen.
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
 from django.views.generic import (
@@ -20,12 +21,31 @@ from django.views.generic import (
 
 from apps.lessons.models import Session
 from apps.lessons.recurring_forms import RecurringLessonForm
-from apps.lessons.recurring_models import RecurringLesson
+from apps.lessons.recurring_models import RecurringLesson, SeriesGenerationJob
 from apps.lessons.recurring_service import RecurringLessonService
 from apps.lessons.recurring_utils import get_all_sessions_for_recurring
+from apps.lessons.series_job_service import SeriesGenerationJobService
 from apps.lessons.views_calendar import get_last_calendar_url
 
 
+def _start_generation(request, recurring_lesson):
+    """
+    Startet die Generierung der Lessons einer Serie als Hintergrund-Job.
+
+    Läuft kein Worker (SERIES_GENERATION_ASYNC aus), ist der Job bei Rückgabe bereits
+    abgeschlossen; sonst wird ein Hinweis gesetzt und die Detailseite zeigt den Fortschritt.
+    """
+    job = SeriesGenerationJobService.enqueue(recurring_lesson, check_conflicts=True)
+    if job.status == "failed":
+        messages.error(request, _("Generating the lessons of this series failed."))
+    elif not job.is_finished:
+        messages.info(
+            request,
+            _("The lessons of this series are being generated in the background."),
+        )
+    return job
+
+
 class RecurringLessonListView(LoginRequiredMixin, ListView):
     """Liste aller wiederholenden Unterrichtsstunden."""
 
@@ -35,7 +55,7 @@ class RecurringLessonListView(LoginRequiredMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        return super().get_queryset().filter(contract__student__user=self.request.user)
+        return super().get_queryset().filter(owner=self.request.user)
 
 
 class RecurringLessonDetailView(LoginRequiredMixin, DetailView):
@@ -46,7 +66,7 @@ class RecurringLessonDetailView(LoginRequiredMixin, DetailView):
     context_object_name = "recurring_lesson"
 
     def get_queryset(self):
-        return super().get_queryset().filter(contract__student__user=self.request.user)
+        return super().get_queryset().filter(owner=self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -54,6 +74,12 @@ class RecurringLessonDetailView(LoginRequiredMixin, DetailView):
         preview = RecurringLessonService.preview_lessons(self.object)
         context["preview_count"] = len(preview)
         context["preview"] = preview[:10]  # Zeige nur erste 10
+        # Laufender bzw. wartender Generierungs-Job (Fortschrittsanzeige)
+        context["generation_job"] = (
+            self.object.generation_jobs.filter(status__in=["pending", "running"])
+            .order_by("-created_at")
+            .first()
+        )
         return context
 
 
@@ -81,20 +107,22 @@ class RecurringLessonCreateView(LoginRequiredMixin, CreateView):
         """Nach Erstellen: Generiere Lessons und weiter zum Kalender."""
         recurring_lesson = self.object
 
-        result = RecurringLessonService.generate_lessons(recurring_lesson, check_conflicts=True)
+        job = _start_generation(self.request, recurring_lesson)
+        if not job.is_finished:
+            return reverse("lessons:recurring_detail", kwargs={"pk": recurring_lesson.pk})
 
-        if result["created"] > 0:
+        if job.created > 0:
             messages.success(
                 self.request,
                 ngettext(
                     "Recurring lesson created and {count} lesson generated.",
                     "Recurring lesson created and {count} lessons generated.",
-                    result["created"],
-                ).format(count=result["created"]),
+                    job.created,
+                ).format(count=job.created),
             )
 
-        if result["conflicts"]:
-            conflict_count = len(result["conflicts"])
+        if job.conflict_count:
+            conflict_count = job.conflict_count
             messages.warning(
                 self.request,
                 ngettext(
@@ -119,7 +147,7 @@ class RecurringLessonUpdateView(LoginRequiredMixin, UpdateView):
     template_name = "lessons/recurringlesson_form.html"
 
     def get_queryset(self):
-        return super().get_queryset().filter(contract__student__user=self.request.user)
+        return super().get_queryset().filter(owner=self.request.user)
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -148,22 +176,25 @@ class RecurringLessonUpdateView(LoginRequiredMixin, UpdateView):
 
         response = super().form_valid(form)
 
-        result = RecurringLessonService.generate_lessons(recurring, check_conflicts=True)
+        job = _start_generation(self.request, recurring)
+        if not job.is_finished:
+            messages.success(self.request, _("Recurring lesson successfully updated."))
+            return redirect("lessons:recurring_detail", pk=recurring.pk)
 
-        if result["created"] > 0:
+        if job.created > 0:
             messages.success(
                 self.request,
                 ngettext(
                     "Recurring lesson updated and {count} lesson regenerated.",
                     "Recurring lesson updated and {count} lessons regenerated.",
-                    result["created"],
-                ).format(count=result["created"]),
+                    job.created,
+                ).format(count=job.created),
             )
         else:
             messages.success(self.request, _("Recurring lesson successfully updated."))
 
-        if result["conflicts"]:
-            conflict_count = len(result["conflicts"])
+        if job.conflict_count:
+            conflict_count = job.conflict_count
             messages.warning(
                 self.request,
                 ngettext(
@@ -187,7 +218,7 @@ class RecurringLessonDeleteView(LoginRequiredMixin, DeleteView):
     success_url = reverse_lazy("lessons:recurring_list")
 
     def get_queryset(self):
-        return super().get_queryset().filter(contract__student__user=self.request.user)
+        return super().get_queryset().filter(owner=self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -221,34 +252,34 @@ class RecurringLessonDeleteView(LoginRequiredMixin, DeleteView):
 @login_required
 def generate_lessons_from_recurring(request, pk):
     """Generiert Lessons aus einer RecurringLesson."""
-    recurring_lesson = get_object_or_404(
-        RecurringLesson, pk=pk, contract__student__user=request.user
-    )
+    recurring_lesson = get_object_or_404(RecurringLesson, pk=pk, owner=request.user)
 
-    result = RecurringLessonService.generate_lessons(recurring_lesson, check_conflicts=True)
+    job = _start_generation(request, recurring_lesson)
+    if not job.is_finished:
+        return redirect("lessons:recurring_detail", pk=pk)
 
-    if result["created"] > 0:
+    if job.created > 0:
         messages.success(
             request,
             ngettext(
                 "{count} lesson successfully created.",
                 "{count} lessons successfully created.",
-                result["created"],
-            ).format(count=result["created"]),
+                job.created,
+            ).format(count=job.created),
         )
 
-    if result["skipped"] > 0:
+    if job.skipped > 0:
         messages.info(
             request,
             ngettext(
                 "{count} lesson skipped (already exists).",
                 "{count} lessons skipped (already exist).",
-                result["skipped"],
-            ).format(count=result["skipped"]),
+                job.skipped,
+            ).format(count=job.skipped),
         )
 
-    if result["conflicts"]:
-        conflict_count = len(result["conflicts"])
+    if job.conflict_count:
+        conflict_count = job.conflict_count
         messages.warning(
             request,
             ngettext(
@@ -259,8 +290,7 @@ def generate_lessons_from_recurring(request, pk):
         )
 
     # Weiterleitung zum Kalender, falls Lessons erstellt wurden
-    if result["created"] > 0:
-        from django.urls import reverse
+    if job.created > 0:
         from django.utils import timezone
 
         today = timezone.localdate()
@@ -272,6 +302,13 @@ def generate_lessons_from_recurring(request, pk):
     return redirect("lessons:recurring_detail", pk=pk)
 
 
+@login_required
+def series_generation_job_status(request, pk):
+    """Fortschritt eines Generierungs-Jobs als JSON (wird von der Detailseite gepollt)."""
+    job = get_object_or_404(SeriesGenerationJob, pk=pk, recurring_session__owner=request.user)
+    return JsonResponse(job.progress())
+
+
 class RecurringLessonBulkEditView(LoginRequiredMixin, TemplateView):
     """Bulk-Edit-Ansicht für mehrere Serientermine."""
 
@@ -280,7 +317,7 @@ class RecurringLessonBulkEditView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["recurring_lessons"] = RecurringLesson.objects.filter(
-            contract__student__user=self.request.user
+            owner=self.request.user
         ).order_by("contract__student", "start_date")
         return context
 
@@ -295,7 +332,7 @@ class RecurringLessonBulkEditView(LoginRequiredMixin, TemplateView):
 
         recurring_lessons = RecurringLesson.objects.filter(
             pk__in=recurring_ids,
-            contract__student__user=request.user,
+            owner=request.user,
         )
 
         if action == "delete":
@@ -0,0 +1,153 @@
+"""
+Service for applying a series edit as a minimal diff of inserts, updates and deletes.
+"""
+
+from typing import List
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.contracts.institute_utils import is_tutorspace_institute
+from apps.core.recurrence import Recurrence
+from apps.lessons.models import TIME_COLUMNS, Session, SessionConflict
+from apps.lessons.recurring_models import RecurringSession
+from apps.lessons.recurring_service import RecurringSessionService
+
+# Session fields taken over from the series template
+SERIES_FIELDS = (
+    "start_time",
+    "duration_minutes",
+    "travel_time_before_minutes",
+    "travel_time_after_minutes",
+    "notes",
+)
+
+
+class SeriesDiffService:
+    """Computes and applies the changes a series edit requires for its sessions."""
+
+    @staticmethod
+    def diff(
+        recurring_session: RecurringSession,
+        sessions: List[Session],
+        old_recurrence: Recurrence,
+    ) -> dict:
+        """
+        Compares the old rule with the (already updated) series and its sessions.
+
+        - deletes: sessions on weekdays that were removed from the series
+        - updates: remaining sessions whose template fields differ (changed in memory,
+          status recalculated)
+        - inserts: unsaved sessions for dates on weekdays that were added to the series
+
+        Sessions whose values already match the template are left alone.
+
+        Args:
+            recurring_session: The series with its new values
+            sessions: Current sessions of the series (before the edit)
+            old_recurrence: Recurrence of the series before the edit
+
+        Returns:
+            Dict with 'inserts', 'updates' and 'deletes' (lists of Session objects)
+        """
+        from apps.lessons.status_service import SessionStatusUpdater
+
+        new_recurrence = recurring_session.recurrence
+        deletes = []
+        updates = []
+        for session in sessions:
+            if session.date.weekday() not in new_recurrence.byday:
+                deletes.append(session)
+                continue
+            changed = False
+            for field in SERIES_FIELDS:
+                value = getattr(recurring_session, field)
+                if getattr(session, field) != value:
+                    setattr(session, field, value)
+                    changed = True
+            if changed:
+                session.sync_time_columns()
+                SessionStatusUpdater.update_status_for_session(session, save=False)
+                updates.append(session)
+
+        added_weekdays = set(new_recurrence.byday) - set(old_recurrence.byday)
+        inserts = []
+        if added_weekdays and recurring_session.is_active:
+            new_dates = [
+                d
+                for d in RecurringSessionService.get_session_dates(recurring_session)
+                if d.weekday() in added_weekdays
+            ]
+            inserts = RecurringSessionService.build_new_sessions(recurring_session, new_dates)
+
+        return {"inserts": inserts, "updates": updates, "deletes": deletes}
+
+    @staticmethod
+    def apply(
+        recurring_session: RecurringSession,
+        sessions: List[Session],
+        old_recurrence: Recurrence,
+    ) -> dict:
+        """
+        Applies a series edit to its sessions in one transaction.
+
+        Deletes, updates and inserts are each executed as a single bulk operation.
+        The conflict store is then rebuilt for all changed sessions in one pass, so
+        overlaps are computed once per affected day instead of once per session.
+
+        Returns:
+            Dict with:
+            - 'created', 'updated', 'deleted': Number of affected sessions
+            - 'conflicts': List of {'session', 'date', 'conflicts'} for changed sessions
+        """
+        from apps.lessons.availability_cache import bump_schedule_version
+        from apps.lessons.services import SessionConflictService
+        from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
+
+        with transaction.atomic():
+            # Inserts are computed under the series lock, like the materialization writers
+            RecurringSessionService.lock_series(recurring_session)
+            changes = SeriesDiffService.diff(recurring_session, sessions, old_recurrence)
+            inserts, updates, deletes = changes["inserts"], changes["updates"], changes["deletes"]
+            if deletes:
+                # Stored conflicts of deleted sessions are removed by cascade
+                Session.objects.filter(pk__in=[s.pk for s in deletes]).delete()
+            if updates:
+                SessionConflict.objects.filter(
+                    Q(session__in=updates) | Q(other_session__in=updates)
+                ).delete()
+                now = timezone.now()
+                for session in updates:
+                    session.updated_at = now
+                Session.objects.bulk_update(
+                    updates, [*SERIES_FIELDS, *TIME_COLUMNS, "status", "updated_at"], batch_size=500
+                )
+            if inserts:
+                Session.objects.bulk_create(inserts, batch_size=500)
+            # Updated sessions have no stored entries any more, like freshly inserted ones
+            SessionConflictService.sync_new_sessions_conflicts(updates + inserts)
+            # Only sessions of a TutorSpace series enter the tier ledger
+            if is_tutorspace_institute(recurring_session.contract.institute):
+                TutorSpaceLedgerService.sync_sessions(updates)
+                TutorSpaceLedgerService.sync_sessions(inserts, new=True)
+
+        if inserts or updates or deletes:
+            bump_schedule_version(recurring_session.owner_id)
+
+        changed = sorted(updates + inserts, key=lambda s: (s.date, s.start_time))
+        conflicts_by_session = SessionConflictService.get_stored_conflicts(changed)
+        return {
+            "created": len(inserts),
+            "updated": len(updates),
+            "deleted": len(deletes),
+            "conflicts": [
+                {
+                    "session": session,
+                    "date": session.date,
+                    "conflicts": conflicts_by_session[session.pk],
+                }
+                for session in changed
+                if conflicts_by_session.get(session.pk)
+            ],
+        }
@@ -0,0 +1,147 @@
+"""
+Service for background generation of series sessions.
+
+Views enqueue a SeriesGenerationJob and return immediately; the worker command
+`process_series_jobs` claims pending jobs and generates the sessions in chunks, so the
+progress endpoint can report how far a long series has got.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.lessons.recurring_models import RecurringSession, SeriesGenerationJob
+from apps.lessons.recurring_service import RecurringSessionService
+
+logger = logging.getLogger(__name__)
+
+# Dates per chunk; each chunk is committed together with the job progress
+CHUNK_SIZE = 100
+# Running jobs without progress for this long are considered abandoned by their worker
+STALE_AFTER = timedelta(minutes=10)
+
+
+class SeriesGenerationJobService:
+    """Service for enqueueing, claiming and running SeriesGenerationJobs."""
+
+    @staticmethod
+    def enqueue(
+        recurring_session: RecurringSession, check_conflicts: bool = True
+    ) -> SeriesGenerationJob:
+        """
+        Creates a generation job for a series.
+
+        A pending job of the same series is reused. Without a background worker
+        (SERIES_GENERATION_ASYNC disabled) the job is run right away.
+        """
+        job = (
+            SeriesGenerationJob.objects.filter(
+                recurring_session=recurring_session, status="pending"
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            job = SeriesGenerationJob.objects.create(
+                recurring_session=recurring_session, check_conflicts=check_conflicts
+            )
+        if not settings.SERIES_GENERATION_ASYNC:
+            job.status = "running"
+            job.save(update_fields=["status", "updated_at"])
+            SeriesGenerationJobService.run(job)
+        return job
+
+    @staticmethod
+    def claim_next(now=None) -> Optional[SeriesGenerationJob]:
+        """
+        Claims the oldest pending job (or an abandoned running job) for this worker.
+
+        Rows locked by other workers are skipped (select_for_update(skip_locked=True)).
+        """
+        if now is None:
+            now = timezone.now()
+        with transaction.atomic():
+            job = (
+                SeriesGenerationJob.objects.select_for_update(skip_locked=True)
+                .filter(Q(status="pending") | Q(status="running", updated_at__lt=now - STALE_AFTER))
+                .order_by("created_at")
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = "running"
+            job.save(update_fields=["status", "updated_at"])
+        return job
+
+    @staticmethod
+    def run(job: SeriesGenerationJob, chunk_size: int = CHUNK_SIZE) -> SeriesGenerationJob:
+        """
+        Generates the sessions of a claimed job chunk by chunk.
+
+        Sessions and progress of a chunk are committed together, so a job taken over
+        from an abandoned worker resumes after the last committed chunk.
+        """
+        recurring_session = RecurringSession.objects.select_related("contract__student").get(
+            pk=job.recurring_session_id
+        )
+        try:
+            session_dates = []
+            until = RecurringSessionService.materialization_end(recurring_session)
+            if recurring_session.is_active:
+                session_dates = recurring_session.recurrence.between(
+                    recurring_session.start_date, until
+                )
+            job.total = len(session_dates)
+            job.save(update_fields=["total", "updated_at"])
+
+            while job.processed < job.total:
+                chunk = session_dates[job.processed : job.processed + chunk_size]
+                with transaction.atomic():
+                    result = RecurringSessionService._create_sessions(
+                        recurring_session, chunk, job.check_conflicts, dry_run=False
+                    )
+                    job.processed += len(chunk)
+                    job.created += result["created"]
+                    job.skipped += result["skipped"]
+                    job.conflict_count += len(result["conflicts"])
+                    job.save(
+                        update_fields=[
+                            "processed",
+                            "created",
+                            "skipped",
+                            "conflict_count",
+                            "updated_at",
+                        ]
+                    )
+            if recurring_session.is_active:
+                RecurringSessionService.mark_materialized(recurring_session, until)
+            job.status = "done"
+        except Exception as exc:
+            logger.exception("Series generation job %s failed", job.pk)
+            job.status = "failed"
+            job.error = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return job
+
+    @staticmethod
+    def process_pending(limit: Optional[int] = None) -> int:
+        """
+        Runs pending jobs until the queue is empty (or limit jobs were run).
+
+        Returns:
+            Number of processed jobs
+        """
+        count = 0
+        while limit is None or count < limit:
+            job = SeriesGenerationJobService.claim_next()
+            if job is None:
+                break
+            SeriesGenerationJobService.run(job)
+            count += 1
+        return count
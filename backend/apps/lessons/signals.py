@@ -0,0 +1,106 @@
+"""
+Invalidation of cached public booking weeks (and derived session columns of fixture loads),
+and upkeep of the TutorSpace tier ledger.
+
+Receivers instead of save() overrides because series and contract updates delete
+sessions/blocked times via querysets and cascades, which never call Model.delete().
+"""
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.blocked_times.models import BlockedTime
+from apps.blocked_times.recurring_models import RecurringBlockedTime
+from apps.contracts.institute_utils import is_tutorspace_institute
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.availability_cache import bump_schedule_version
+from apps.lessons.models import Session, TutorSpaceLedgerEntry
+from apps.lessons.recurring_models import RecurringSession, contract_owner_id
+from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
+
+
+@receiver(pre_save, sender=Session)
+@receiver(pre_save, sender=RecurringSession)
+def sync_derived_columns_on_raw_save(sender, instance, raw, **kwargs):
+    # loaddata saves with raw=True and skips the save() overrides
+    if not raw:
+        return
+    if instance.owner_id is None:
+        instance.owner_id = contract_owner_id(instance)
+    if sender is Session:
+        instance.sync_time_columns()
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+@receiver(post_save, sender=RecurringSession)
+@receiver(post_delete, sender=RecurringSession)
+def invalidate_week_cache_for_session(sender, instance, **kwargs):
+    bump_schedule_version(instance.owner_id)
+
+
+@receiver(post_save, sender=BlockedTime)
+@receiver(post_delete, sender=BlockedTime)
+@receiver(post_save, sender=RecurringBlockedTime)
+@receiver(post_delete, sender=RecurringBlockedTime)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_week_cache_for_user(sender, instance, **kwargs):
+    bump_schedule_version(instance.user_id)
+
+
+@receiver(post_delete, sender=TutorSpaceLedgerEntry)
+def shift_tutorspace_ledger_after_delete(sender, instance, origin=None, **kwargs):
+    # Rebuilds replace the rows of a tutor as a whole; every other removal (session
+    # deleted or left the pool) moves the later rows of the tutor back down
+    if isinstance(origin, QuerySet) and origin.model is TutorSpaceLedgerEntry:
+        return
+    key = (instance.date, instance.start_time, instance.session_created_at, instance.session_id)
+    TutorSpaceLedgerService.shift_after(instance.tutor_id, key, -instance.minutes)
+
+
+# Rebuilds are O(history) of the tutor: pre_save compares with the stored row, so ordinary
+# profile and contract edits leave the ledger alone
+
+
+@receiver(pre_save, sender=UserProfile)
+def detect_tier_count_from_change(sender, instance, update_fields=None, **kwargs):
+    instance._tier_count_from_changed = False
+    if update_fields is not None and "tutorspace_tier_count_from" not in update_fields:
+        return
+    stored = None
+    if instance.pk is not None:
+        stored = (
+            UserProfile.objects.filter(pk=instance.pk)
+            .values_list("tutorspace_tier_count_from", flat=True)
+            .first()
+        )
+    instance._tier_count_from_changed = stored != instance.tutorspace_tier_count_from
+
+
+@receiver(post_save, sender=UserProfile)
+def rebuild_tutorspace_ledger_for_profile(sender, instance, **kwargs):
+    if getattr(instance, "_tier_count_from_changed", False):
+        instance._tier_count_from_changed = False
+        TutorSpaceLedgerService.rebuild([instance.user_id])
+
+
+@receiver(pre_save, sender=Contract)
+def detect_tutorspace_institute_change(sender, instance, update_fields=None, **kwargs):
+    # New contracts have no sessions yet
+    instance._tutorspace_institute_changed = False
+    if instance.pk is None or (update_fields is not None and "institute" not in update_fields):
+        return
+    stored = Contract.objects.filter(pk=instance.pk).values_list("institute", flat=True).first()
+    instance._tutorspace_institute_changed = is_tutorspace_institute(
+        stored
+    ) != is_tutorspace_institute(instance.institute)
+
+
+@receiver(post_save, sender=Contract)
+def rebuild_tutorspace_ledger_for_contract(sender, instance, **kwargs):
+    if getattr(instance, "_tutorspace_institute_changed", False):
+        instance._tutorspace_institute_changed = False
+        TutorSpaceLedgerService.rebuild([instance.student.user_id])
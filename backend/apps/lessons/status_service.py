@@ -5,9 +5,12 @@ Service for automatically updating session statuses based on date/time.
 from datetime import datetime, timedelta
 
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
-from apps.lessons.models import Session
+from apps.contracts.institute_utils import TUTORSPACE_INSTITUTE_NAME
+from apps.lessons.models import TIME_COLUMNS, Session
+from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
 
 
 class SessionStatusUpdater:
@@ -19,7 +22,7 @@ class SessionStatusUpdater:
     """
 
     @staticmethod
-    def update_status_for_session(session: Session) -> bool:
+    def update_status_for_session(session: Session, save: bool = True) -> bool:
         """
         Updates the status of a single session based on date/time.
 
@@ -30,6 +33,7 @@ class SessionStatusUpdater:
 
         Args:
             session: The session instance
+            save: If False, the status is only set in memory (e.g. before bulk_update)
 
         Returns:
             True if status was changed, False otherwise
@@ -59,13 +63,13 @@ class SessionStatusUpdater:
             status_changed = True
 
         # Save only if session is already saved (has PK)
-        if status_changed and session.pk:
+        if status_changed and session.pk and save:
             session.save(update_fields=["status", "updated_at"])
 
         return status_changed
 
     @staticmethod
-    def update_past_sessions_to_taught(now=None) -> int:
+    def update_past_sessions_to_taught(now=None, user=None) -> int:
         """
         Sets all sessions with status 'planned' to 'taught' whose end time
         is in the past.
@@ -73,10 +77,17 @@ class SessionStatusUpdater:
         Rules:
         - Only sessions with status 'planned' are updated
         - Sessions with status 'paid' or 'cancelled' are NOT changed
-        - End time = start_datetime + duration_minutes (without travel times)
+        - End time = stored ends_at (start_datetime + duration_minutes, without travel times)
+
+        The update is a single SQL UPDATE on the (status, ends_at) index. The full sweep
+        runs in the mark_taught command; views only catch up the sessions of the
+        current user. TutorSpace sessions among them enter the tier ledger: they are
+        locked first (skipping rows a concurrent run holds), and only the locked rows are
+        updated and added to the ledger.
 
         Args:
             now: Optional datetime object (default: timezone.now())
+            user: Optional tutor; only their sessions are updated
 
         Returns:
             Number of updated sessions
@@ -84,33 +95,40 @@ class SessionStatusUpdater:
         if now is None:
             now = timezone.now()
 
-        # Wrap the entire operation in a transaction, as select_for_update() requires a transaction
-        with transaction.atomic():
-            # Load all sessions with status 'planned'
-            # Use select_for_update for thread-safety (optional, but clean)
-            sessions = Session.objects.filter(status="planned").select_for_update(skip_locked=True)
-
-            updated_sessions = []
-
-            for session in sessions:
-                # Calculate end_datetime (only session duration, without travel times)
-                start_datetime = timezone.make_aware(
-                    datetime.combine(session.date, session.start_time)
-                )
-                end_datetime = start_datetime + timedelta(minutes=session.duration_minutes)
+        sessions = Session.objects.filter(status="planned")
+        if user is not None:
+            sessions = sessions.filter(owner=user)
 
-                # If end time is in the past, mark for update
-                if end_datetime < now:
+        with transaction.atomic():
+            SessionStatusUpdater._fill_missing_time_columns(sessions)
+            past = sessions.filter(ends_at__lt=now)
+            tutorspace = Q(contract__institute__iexact=TUTORSPACE_INSTITUTE_NAME)
+            # Rows locked by a concurrent run (mark_taught vs. a view catch-up) are left to
+            # it; otherwise both would add the same sessions to the ledger
+            tutorspace_sessions = list(
+                past.filter(tutorspace)
+                .select_for_update(skip_locked=True, of=("self",))
+                .select_related("contract")
+            )
+            updated = past.exclude(tutorspace).update(status="taught", updated_at=now)
+            if tutorspace_sessions:
+                updated += Session.objects.filter(
+                    pk__in=[session.pk for session in tutorspace_sessions]
+                ).update(status="taught", updated_at=now)
+                for session in tutorspace_sessions:
                     session.status = "taught"
-                    updated_sessions.append(session)
-
-            # Bulk update for performance
-            if updated_sessions:
-                Session.objects.bulk_update(
-                    updated_sessions, fields=["status", "updated_at"], batch_size=100
-                )
+                # The UPDATE bypasses Session.save(); planned sessions have no ledger rows yet
+                TutorSpaceLedgerService.sync_sessions(tutorspace_sessions, new=True)
+            return updated
 
-        return len(updated_sessions)
+    @staticmethod
+    def _fill_missing_time_columns(sessions) -> None:
+        """Stores the datetime columns for sessions written without save() (e.g. raw SQL)."""
+        missing = list(sessions.filter(ends_at__isnull=True))
+        for session in missing:
+            session.sync_time_columns()
+        if missing:
+            Session.objects.bulk_update(missing, fields=TIME_COLUMNS, batch_size=500)
 
 
 # Aliases for backwards compatibility
@@ -228,3 +228,75 @@ class ContractQuotaServiceTest(TestCase):
 
         # Sollte kein Konflikt sein: 2 + 1 = 3 <= 3
         self.assertIsNone(conflict)
+
+
+class ContractQuotaIndexTest(TestCase):
+    """Tests für den Kontingent-Index (Präfixsummen pro Vertrag)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="indexuser", password="testpass123")
+        self.student = Student.objects.create(
+            user=self.user, first_name="Erika", last_name="Musterfrau"
+        )
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=30.00,
+            start_date=date(2025, 8, 1),
+            end_date=date(2025, 12, 31),
+            is_active=True,
+        )
+        ContractMonthlyPlan.objects.create(
+            contract=self.contract, year=2025, month=8, planned_units=2
+        )
+        ContractMonthlyPlan.objects.create(
+            contract=self.contract, year=2025, month=10, planned_units=3
+        )
+        statuses = ["planned", "taught", "cancelled", "paid", "planned", "planned", "planned"]
+        days = [
+            date(2025, 8, 4),
+            date(2025, 8, 11),
+            date(2025, 8, 18),
+            date(2025, 8, 25),
+            date(2025, 9, 1),
+            date(2025, 10, 6),
+            date(2025, 11, 3),
+        ]
+        for lesson_date, status in zip(days, statuses, strict=True):
+            Lesson.objects.create(
+                contract=self.contract,
+                date=lesson_date,
+                start_time=time(14, 0),
+                duration_minutes=60,
+                status=status,
+            )
+
+    def test_index_matches_service(self):
+        """Index liefert dieselben Ergebnisse wie die Einzelprüfung."""
+        index = ContractQuotaService.build_indexes([self.contract])[self.contract.pk]
+        for lesson in Lesson.objects.filter(contract=self.contract):
+            self.assertEqual(
+                ContractQuotaService.check_quota_conflict(lesson), index.check(lesson), lesson
+            )
+
+    def test_index_uses_two_queries(self):
+        """Aufbau für beliebig viele Lessons mit zwei Queries, Lookup ohne Query."""
+        lessons = list(Lesson.objects.filter(contract=self.contract))
+        with self.assertNumQueries(2):
+            index = ContractQuotaService.build_indexes([self.contract])[self.contract.pk]
+        with self.assertNumQueries(0):
+            for lesson in lessons:
+                index.check(lesson)
+
+    def test_prefix_sums(self):
+        """Kumulierte Summen bis einschließlich Monat."""
+        index = ContractQuotaService.build_indexes([self.contract])[self.contract.pk]
+        self.assertEqual(index.actual_total(2025, 10), 5)
+        self.assertIsNone(index.planned_total(2025, 7))
+        self.assertEqual(index.planned_total(2025, 9), 2)
+
+    def test_contract_without_limit_has_no_index(self):
+        """Ohne Planungslimit wird kein Index gebaut."""
+        self.contract.has_monthly_planning_limit = False
+        self.contract.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(ContractQuotaService.build_indexes([self.contract]), {})
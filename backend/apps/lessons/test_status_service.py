@@ -4,13 +4,16 @@ Tests für LessonStatusUpdater.
 
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
+from io import StringIO
 
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 
+from apps.contracts.institute_utils import TUTORSPACE_INSTITUTE_NAME
 from apps.contracts.models import Contract
-from apps.lessons.models import Lesson
+from apps.lessons.models import Lesson, TutorSpaceLedgerEntry
 from apps.lessons.status_service import LessonStatusUpdater
 from apps.students.models import Student
 
@@ -189,3 +192,103 @@ class LessonStatusUpdaterTest(TestCase):
         self.assertEqual(updated_count, 1)
         lesson.refresh_from_db()
         self.assertEqual(lesson.status, "taught")
+
+    def _past_lesson(self, contract=None):
+        return Lesson.objects.create(
+            contract=contract or self.contract,
+            date=timezone.localdate() - timedelta(days=3),
+            start_time=time(14, 0),
+            duration_minutes=60,
+            status="planned",
+        )
+
+    def test_update_past_lessons_only_for_user(self):
+        """Test: Mit user werden nur die Lessons dieses Tutors aktualisiert."""
+        other_user = User.objects.create_user(username="otheruser", password="testpass123")
+        other_student = Student.objects.create(user=other_user, first_name="Eva", last_name="B")
+        other_contract = Contract.objects.create(
+            student=other_student,
+            hourly_rate=Decimal("25.00"),
+            unit_duration_minutes=60,
+            start_date=date(2025, 1, 1),
+        )
+        own = self._past_lesson()
+        foreign = self._past_lesson(other_contract)
+
+        updated_count = LessonStatusUpdater.update_past_lessons_to_taught(user=self.user)
+
+        self.assertEqual(updated_count, 1)
+        own.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual((own.status, foreign.status), ("taught", "planned"))
+
+    def test_update_past_lessons_is_single_update(self):
+        """Test: Die Anzahl der Queries hängt nicht von der Anzahl der Lessons ab."""
+        for _ in range(5):
+            self._past_lesson()
+
+        # Prüfung auf fehlendes ends_at, TutorSpace-Lessons für das Ledger + ein UPDATE
+        # (plus Savepoint und Release)
+        with self.assertNumQueries(5):
+            updated_count = LessonStatusUpdater.update_past_lessons_to_taught()
+
+        self.assertEqual(updated_count, 5)
+
+    def test_update_past_lessons_tutorspace_rows_enter_ledger_once(self):
+        """Test: TutorSpace-Lessons werden gesperrt aktualisiert und einmal ins Ledger übernommen."""
+        tutorspace_contract = Contract.objects.create(
+            student=self.student,
+            institute=TUTORSPACE_INSTITUTE_NAME,
+            hourly_rate=Decimal("13.00"),
+            unit_duration_minutes=60,
+            start_date=date(2025, 1, 1),
+            is_active=True,
+        )
+        tutorspace_lesson = self._past_lesson(contract=tutorspace_contract)
+        self._past_lesson()
+
+        self.assertEqual(LessonStatusUpdater.update_past_lessons_to_taught(), 2)
+        # Ein zweiter Lauf (z. B. Dashboard nach mark_taught) findet nichts mehr
+        self.assertEqual(LessonStatusUpdater.update_past_lessons_to_taught(), 0)
+
+        tutorspace_lesson.refresh_from_db()
+        self.assertEqual(tutorspace_lesson.status, "taught")
+        self.assertEqual(
+            list(TutorSpaceLedgerEntry.objects.values_list("session_id", flat=True)),
+            [tutorspace_lesson.pk],
+        )
+
+    def test_ends_at_follows_schedule_changes(self):
+        """Test: ends_at wird bei save() (auch mit update_fields) neu berechnet."""
+        lesson = self._past_lesson()
+        start = timezone.make_aware(datetime.combine(lesson.date, time(14, 0)))
+        self.assertEqual(lesson.ends_at, start + timedelta(minutes=60))
+
+        lesson.start_time = time(16, 0)
+        lesson.save(update_fields=["start_time"])
+
+        lesson.refresh_from_db()
+        self.assertEqual(lesson.ends_at, start + timedelta(hours=2, minutes=60))
+
+    def test_missing_ends_at_is_filled(self):
+        """Test: Lessons ohne ends_at (z. B. per loaddata geladen) werden nachberechnet."""
+        lesson = self._past_lesson()
+        Lesson.objects.filter(pk=lesson.pk).update(ends_at=None)
+
+        updated_count = LessonStatusUpdater.update_past_lessons_to_taught()
+
+        self.assertEqual(updated_count, 1)
+        lesson.refresh_from_db()
+        self.assertIsNotNone(lesson.ends_at)
+        self.assertEqual(lesson.status, "taught")
+
+    def test_mark_taught_command(self):
+        """Test: Der Befehl mark_taught aktualisiert alle vergangenen Lessons."""
+        lesson = self._past_lesson()
+        out = StringIO()
+
+        call_command("mark_taught", stdout=out)
+
+        self.assertIn("Marked 1 session(s) as taught.", out.getvalue())
+        lesson.refresh_from_db()
+        self.assertEqual(lesson.status, "taught")
@@ -0,0 +1,95 @@
+"""
+Tests for the minute occupancy map used by the slot computation.
+"""
+
+import random
+from datetime import date, time, timedelta
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from apps.lessons.availability import (
+    DayOccupancy,
+    earliest_bookable_minute,
+    iter_free_slots,
+    merge_intervals,
+    minute_to_time,
+)
+from apps.lessons.booking_service import BookingService
+
+
+class DayOccupancyTest(SimpleTestCase):
+    """DayOccupancy must agree with the interval overlap test."""
+
+    def test_matches_interval_scan(self):
+        rng = random.Random(42)
+        target = date(2030, 1, 7)
+        working_hours = [{"start": "08:00", "end": "12:00"}, {"start": "13:15", "end": "21:40"}]
+        for _ in range(50):
+            occupied = []
+            for _ in range(rng.randint(0, 8)):
+                start = rng.randint(7 * 60, 22 * 60)
+                length = rng.randint(1, 180)
+                end = min(start + length, 24 * 60 - 1)
+                occupied.append(
+                    (time(start // 60, start % 60, rng.choice([0, 30])), time(end // 60, end % 60))
+                )
+            occupied_slots = {target: sorted(occupied)}
+            for duration in (30, 45, 60, 90):
+                expected = []
+                for period in working_hours:
+                    h, m = map(int, period["start"].split(":"))
+                    current = h * 60 + m
+                    h, m = map(int, period["end"].split(":"))
+                    period_end = h * 60 + m
+                    while current + duration <= period_end:
+                        slot_start = time(current // 60, current % 60)
+                        end_minute = current + duration
+                        slot_end = time(end_minute // 60, end_minute % 60)
+                        if BookingService.is_time_slot_available(
+                            target, slot_start, slot_end, occupied_slots
+                        ):
+                            expected.append((slot_start, slot_end))
+                        current += 30
+                self.assertEqual(
+                    BookingService.get_available_time_slots(
+                        target, working_hours, occupied_slots, slot_duration_minutes=duration
+                    ),
+                    expected,
+                )
+
+    def test_iter_free_slots_matches_occupancy_map(self):
+        rng = random.Random(7)
+        working_hours = [{"start": "13:15", "end": "21:40"}, {"start": "08:00", "end": "12:00"}]
+        for _ in range(50):
+            occupied = []
+            for _ in range(rng.randint(0, 8)):
+                start = rng.randint(7 * 60, 22 * 60)
+                end = min(start + rng.randint(1, 180), 24 * 60 - 1)
+                occupied.append((time(start // 60, start % 60, 30), time(end // 60, end % 60)))
+            for duration in (30, 60, 90):
+                expected = sorted(DayOccupancy(occupied).free_slots(working_hours, duration))
+                lazy = [
+                    (minute_to_time(start), minute_to_time(end))
+                    for start, end in iter_free_slots(
+                        merge_intervals(occupied), working_hours, duration
+                    )
+                ]
+                self.assertEqual(lazy, expected)
+
+    def test_end_of_day_block(self):
+        occupancy = DayOccupancy([(time(22, 0), time.max)])
+        self.assertFalse(occupancy.is_free(23 * 60, 23 * 60 + 30))
+        self.assertTrue(occupancy.is_free(21 * 60, 22 * 60))
+
+    def test_invalid_working_hours_are_skipped(self):
+        occupancy = DayOccupancy()
+        slots = occupancy.free_slots(
+            [{"start": "bad", "end": "10:00"}, {"start": "09:00", "end": "10:00"}], 60
+        )
+        self.assertEqual(slots, [(time(9, 0), time(10, 0))])
+
+    def test_earliest_bookable_minute(self):
+        today = timezone.localdate()
+        self.assertIsNone(earliest_bookable_minute(today - timedelta(days=2)))
+        self.assertEqual(earliest_bookable_minute(today + timedelta(days=2)), 0)
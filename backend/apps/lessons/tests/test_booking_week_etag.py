@@ -0,0 +1,83 @@
+"""
+Tests for ETag / If-None-Match on the booking week APIs.
+"""
+
+from datetime import time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.models import Lesson
+from apps.lessons.utils_dates import get_week_start
+from apps.students.models import Student
+
+
+class BookingWeekEtagTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tutor = User.objects.create_user(username="tutor", password="test")
+        self.profile, _ = UserProfile.objects.get_or_create(user=self.tutor)
+        self.profile.public_booking_token = "tok-etag"
+        self.profile.default_working_hours = {"monday": [{"start": "09:00", "end": "12:00"}]}
+        self.profile.save()
+        self.student = Student.objects.create(user=self.tutor, first_name="A", last_name="B")
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=30,
+            unit_duration_minutes=60,
+            start_date=timezone.localdate(),
+        )
+        self.monday = get_week_start(timezone.localdate()) + timedelta(days=14)
+        self.client = Client()
+        self.public_url = "/lessons/public-booking/tok-etag/week/"
+        self.student_url = reverse(
+            "lessons:student_booking_week_api", args=[self.contract.booking_token]
+        )
+        self.student_params = {
+            "year": self.monday.year,
+            "month": self.monday.month,
+            "day": self.monday.day,
+        }
+
+    def test_public_week_returns_304_for_matching_etag(self):
+        params = {"week_start": self.monday.isoformat()}
+        first = self.client.get(self.public_url, params)
+        etag = first["ETag"]
+        self.assertTrue(etag.startswith('"'))
+
+        cache.clear()  # ETag must not depend on the process-local cache
+        second = self.client.get(self.public_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second["ETag"], etag)
+
+    def test_public_week_etag_changes_after_lesson_created(self):
+        params = {"week_start": self.monday.isoformat()}
+        etag = self.client.get(self.public_url, params)["ETag"]
+        Lesson.objects.create(
+            contract=self.contract, date=self.monday, start_time=time(9, 0), duration_minutes=60
+        )
+        resp = self.client.get(self.public_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_student_week_returns_304_for_matching_etag(self):
+        etag = self.client.get(self.student_url, self.student_params)["ETag"]
+        resp = self.client.get(self.student_url, self.student_params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_student_week_etag_changes_after_contract_update(self):
+        etag = self.client.get(self.student_url, self.student_params)["ETag"]
+        self.contract.unit_duration_minutes = 90
+        self.contract.save()
+        resp = self.client.get(self.student_url, self.student_params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["week_data"]["unit_duration_minutes"], 90)
+
+    def test_student_week_invalid_date_returns_400(self):
+        resp = self.client.get(self.student_url, {"year": 2025, "month": 2, "day": 30})
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,104 @@
+"""
+Tests for batched feature/series resolution in _get_busy_intervals_for_week.
+"""
+
+from datetime import time, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.booking_service import BookingService
+from apps.lessons.models import Lesson
+from apps.lessons.recurring_models import RecurringSession
+from apps.lessons.recurring_utils import (
+    find_matching_recurring_session,
+    find_matching_recurring_sessions,
+)
+from apps.lessons.utils_dates import get_week_start
+from apps.students.models import Student
+
+
+class BusyIntervalsBatchTest(TestCase):
+    def setUp(self):
+        self.tutor = User.objects.create_user(username="tutor", password="test")
+        profile, _ = UserProfile.objects.get_or_create(user=self.tutor)
+        profile.is_premium = True
+        profile.save()
+        self.student = Student.objects.create(user=self.tutor, first_name="Max", last_name="T")
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=30,
+            unit_duration_minutes=60,
+            start_date=timezone.localdate(),
+        )
+        self.monday = get_week_start(timezone.localdate()) + timedelta(days=14)
+        self.series = RecurringSession.objects.create(
+            contract=self.contract,
+            start_date=self.monday,
+            start_time=time(9, 0),
+            duration_minutes=60,
+            monday=True,
+            tuesday=True,
+            wednesday=True,
+            thursday=True,
+            friday=True,
+        )
+        self.legacy_series = RecurringSession.objects.create(
+            contract=self.contract,
+            start_date=self.monday,
+            start_time=time(14, 0),
+            duration_minutes=60,
+            monday=True,
+            wednesday=True,
+        )
+
+    def _create_lessons(self, days):
+        for i in range(days):
+            d = self.monday + timedelta(days=i)
+            Lesson.objects.create(
+                contract=self.contract,
+                date=d,
+                start_time=time(9, 0),
+                duration_minutes=60,
+                recurring_session=self.series,
+            )
+            # Legacy rows without FK: only Mon/Wed match the 14:00 series
+            Lesson.objects.create(
+                contract=self.contract, date=d, start_time=time(14, 0), duration_minutes=60
+            )
+
+    def _busy(self, tutor=None):
+        tutor = tutor or User.objects.get(pk=self.tutor.pk)  # no cached profile
+        return BookingService._get_busy_intervals_for_week(
+            self.monday, self.monday + timedelta(days=6), tutor, self.student.id
+        )
+
+    def test_query_count_independent_of_lesson_count(self):
+        self._create_lessons(1)
+        tutor = User.objects.get(pk=self.tutor.pk)
+        with self.assertNumQueries(6):
+            self._busy(tutor)
+        Lesson.objects.all().delete()
+        self._create_lessons(7)
+        tutor = User.objects.get(pk=self.tutor.pk)
+        with self.assertNumQueries(6):
+            busy = self._busy(tutor)
+        self.assertEqual(sum(len(v) for v in busy.values()), 14)
+        self.assertTrue(all(i["reschedulable"] for v in busy.values() for i in v))
+
+    def test_series_membership_matches_single_lookup(self):
+        self._create_lessons(7)
+        lessons = list(Lesson.objects.filter(contract=self.contract))
+        batch = find_matching_recurring_sessions(lessons)
+        for lesson in lessons:
+            self.assertEqual(batch[lesson.id], find_matching_recurring_session(lesson))
+
+        busy = self._busy()
+        monday = {i["start"]: i for i in busy[self.monday]}
+        tuesday = {i["start"]: i for i in busy[self.monday + timedelta(days=1)]}
+        self.assertEqual(monday["09:00"]["recurring_lesson_id"], self.series.id)
+        self.assertEqual(monday["14:00"]["recurring_lesson_id"], self.legacy_series.id)
+        self.assertFalse(tuesday["14:00"]["in_series"])
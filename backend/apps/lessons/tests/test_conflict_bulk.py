@@ -0,0 +1,120 @@
+"""
+Tests for batch conflict detection (SessionConflictService.check_conflicts_bulk).
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.contracts.models import Contract
+from apps.lessons.models import Lesson
+from apps.lessons.services import LessonConflictService
+from apps.lessons.week_service import WeekService
+from apps.students.models import Student
+
+
+class ConflictBulkTest(TestCase):
+    """Bulk conflict check must match the per-session check."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulkuser", password="password")
+        self.other_user = User.objects.create_user(username="otheruser", password="password")
+        self.student = Student.objects.create(user=self.user, first_name="Bulk", last_name="A")
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=Decimal("30.00"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+        )
+        other_student = Student.objects.create(
+            user=self.other_user, first_name="Other", last_name="B"
+        )
+        self.other_contract = Contract.objects.create(
+            student=other_student,
+            hourly_rate=Decimal("30.00"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+        )
+
+    def _lesson(self, day, hour, minute=0, contract=None, **kwargs):
+        return Lesson.objects.create(
+            contract=contract or self.contract,
+            date=day,
+            start_time=time(hour, minute),
+            duration_minutes=60,
+            **kwargs,
+        )
+
+    def _assert_same_as_single(self, lessons):
+        bulk = LessonConflictService.check_conflicts_bulk(lessons)
+        for lesson in lessons:
+            single = LessonConflictService.check_conflicts(lesson)
+            got = bulk.get(lesson.pk, [])
+            self.assertEqual(
+                [(c["type"], c["object"].pk, c["message"]) for c in single],
+                [(c["type"], c["object"].pk, c["message"]) for c in got],
+            )
+            self.assertEqual([c["start"] for c in single], [c["start"] for c in got])
+
+    def test_bulk_matches_single_check(self):
+        day = date(2023, 3, 6)
+        lessons = [
+            self._lesson(day, 10),
+            self._lesson(day, 10, 30),
+            self._lesson(day, 11, 15),
+            self._lesson(day, 14, travel_time_before_minutes=45),
+            self._lesson(date(2023, 3, 7), 9),
+            self._lesson(day, 10, contract=self.other_contract),
+        ]
+        BlockedTime.objects.create(
+            user=self.user,
+            title="Lecture",
+            start_datetime=timezone.make_aware(datetime(2023, 3, 6, 13, 0)),
+            end_datetime=timezone.make_aware(datetime(2023, 3, 6, 13, 30)),
+        )
+        BlockedTime.objects.create(
+            user=self.user,
+            title="Trip",
+            start_datetime=timezone.make_aware(datetime(2023, 3, 5, 18, 0)),
+            end_datetime=timezone.make_aware(datetime(2023, 3, 7, 9, 30)),
+        )
+        BlockedTime.objects.create(
+            user=self.other_user,
+            title="Foreign",
+            start_datetime=timezone.make_aware(datetime(2023, 3, 6, 10, 0)),
+            end_datetime=timezone.make_aware(datetime(2023, 3, 6, 12, 0)),
+        )
+
+        self._assert_same_as_single(lessons)
+
+    def test_touching_intervals_do_not_conflict(self):
+        day = date(2023, 3, 8)
+        lessons = [self._lesson(day, 10), self._lesson(day, 11)]
+        self.assertEqual(LessonConflictService.check_conflicts_bulk(lessons), {})
+
+    def test_query_count_independent_of_session_count(self):
+        self.contract.has_monthly_planning_limit = False
+        self.contract.save()
+        day = date(2023, 3, 13)
+        for i in range(10):
+            self._lesson(day, 8 + i)
+        lessons = list(
+            Lesson.objects.filter(contract=self.contract).select_related(
+                "contract", "contract__student"
+            )
+        )
+        # One sessions query and one blocked-time query per owner
+        with self.assertNumQueries(2):
+            LessonConflictService.check_conflicts_bulk(lessons)
+
+    def test_week_data_uses_bulk_conflicts(self):
+        day = date(2023, 3, 20)
+        first = self._lesson(day, 10)
+        second = self._lesson(day, 10, 30)
+        week_data = WeekService.get_week_data(2023, 3, 20, user=self.user)
+        self.assertIn(first.pk, week_data["conflicts_by_lesson"])
+        self.assertIn(second.pk, week_data["conflicts_by_lesson"])
@@ -0,0 +1,129 @@
+"""
+Tests for the materialized SessionConflict store.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.contracts.models import Contract
+from apps.lessons.models import Lesson, SessionConflict
+from apps.lessons.services import LessonConflictService
+from apps.students.models import Student
+
+
+class ConflictStoreTest(TestCase):
+    """The store is maintained on session and blocked-time writes."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="storeuser", password="password")
+        self.student = Student.objects.create(user=self.user, first_name="Store", last_name="A")
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=Decimal("30.00"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+        self.day = date(2023, 5, 10)
+
+    def _lesson(self, hour, minute=0):
+        return Lesson.objects.create(
+            contract=self.contract,
+            date=self.day,
+            start_time=time(hour, minute),
+            duration_minutes=60,
+        )
+
+    def test_overlapping_sessions_are_stored_in_both_directions(self):
+        first = self._lesson(10)
+        second = self._lesson(10, 30)
+
+        self.assertTrue(
+            SessionConflict.objects.filter(session=first, other_session=second).exists()
+        )
+        self.assertTrue(
+            SessionConflict.objects.filter(session=second, other_session=first).exists()
+        )
+        self.assertTrue(Lesson.objects.get(pk=first.pk).has_conflicts)
+
+    def test_moving_session_removes_stale_entries(self):
+        first = self._lesson(10)
+        second = self._lesson(10, 30)
+
+        second.start_time = time(15, 0)
+        second.save()
+
+        self.assertFalse(SessionConflict.objects.exists())
+        self.assertFalse(Lesson.objects.get(pk=first.pk).has_conflicts)
+
+    def test_deleting_session_cascades(self):
+        first = self._lesson(10)
+        second = self._lesson(10, 30)
+
+        second.delete()
+
+        self.assertFalse(SessionConflict.objects.filter(session=first).exists())
+
+    def test_blocked_time_write_and_delete(self):
+        lesson = self._lesson(10)
+        blocked_time = BlockedTime.objects.create(
+            user=self.user,
+            title="Lecture",
+            start_datetime=timezone.make_aware(datetime(2023, 5, 10, 10, 30)),
+            end_datetime=timezone.make_aware(datetime(2023, 5, 10, 11, 30)),
+        )
+        self.assertTrue(
+            SessionConflict.objects.filter(session=lesson, blocked_time=blocked_time).exists()
+        )
+
+        blocked_time.start_datetime = timezone.make_aware(datetime(2023, 5, 10, 12, 0))
+        blocked_time.end_datetime = timezone.make_aware(datetime(2023, 5, 10, 13, 0))
+        blocked_time.save()
+        self.assertFalse(SessionConflict.objects.filter(session=lesson).exists())
+
+        blocked_time.start_datetime = timezone.make_aware(datetime(2023, 5, 10, 9, 0))
+        blocked_time.save()
+        self.assertTrue(SessionConflict.objects.filter(session=lesson).exists())
+
+        blocked_time.delete()
+        self.assertFalse(SessionConflict.objects.filter(session=lesson).exists())
+
+    def test_stored_conflicts_match_live_check(self):
+        lessons = [self._lesson(10), self._lesson(10, 30), self._lesson(11, 15)]
+        BlockedTime.objects.create(
+            user=self.user,
+            title="Lecture",
+            start_datetime=timezone.make_aware(datetime(2023, 5, 10, 11, 0)),
+            end_datetime=timezone.make_aware(datetime(2023, 5, 10, 12, 0)),
+        )
+
+        stored = LessonConflictService.get_stored_conflicts(lessons)
+        for lesson in lessons:
+            live = LessonConflictService.check_conflicts(lesson)
+            self.assertEqual(
+                [(c["type"], c["object"].pk, c["message"]) for c in live],
+                [(c["type"], c["object"].pk, c["message"]) for c in stored.get(lesson.pk, [])],
+            )
+
+    def test_stored_conflicts_read_with_one_query(self):
+        lessons = [self._lesson(8 + i) for i in range(6)] + [self._lesson(8, 30)]
+        with self.assertNumQueries(1):
+            LessonConflictService.get_stored_conflicts(lessons)
+
+    def test_rebuild_command_restores_store(self):
+        self._lesson(10)
+        self._lesson(10, 30)
+        SessionConflict.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_session_conflicts", stdout=out)
+
+        self.assertEqual(SessionConflict.objects.count(), 2)
+        self.assertIn("2", out.getvalue())
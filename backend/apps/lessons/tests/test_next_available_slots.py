@@ -0,0 +1,91 @@
+"""
+Tests for the "next available slot" search and its public API.
+"""
+
+import json
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.booking_service import BookingService
+from apps.lessons.models import Lesson
+from apps.lessons.utils_dates import get_week_start
+from apps.students.models import Student
+
+
+class FindNextAvailableSlotsTest(TestCase):
+    def setUp(self):
+        self.tutor = User.objects.create_user(username="tutor", password="test")
+        self.profile, _ = UserProfile.objects.get_or_create(user=self.tutor)
+        self.profile.public_booking_token = "tok-next"
+        self.profile.default_working_hours = {"monday": [{"start": "09:00", "end": "11:00"}]}
+        self.profile.save()
+        student = Student.objects.create(user=self.tutor, first_name="A", last_name="B")
+        self.contract = Contract.objects.create(
+            student=student,
+            hourly_rate=30,
+            unit_duration_minutes=60,
+            start_date=timezone.localdate(),
+        )
+        self.monday = get_week_start(timezone.localdate()) + timedelta(days=14)
+        self.after = timezone.make_aware(datetime.combine(self.monday, time(0, 0)))
+
+    def test_returns_slots_in_order_and_skips_occupied(self):
+        Lesson.objects.create(
+            contract=self.contract, date=self.monday, start_time=time(9, 0), duration_minutes=60
+        )
+        slots = BookingService.find_next_available_slots(self.tutor, 60, after=self.after, limit=3)
+        next_monday = self.monday + timedelta(days=7)
+        self.assertEqual(
+            slots,
+            [
+                (self.monday, time(10, 0), time(11, 0)),
+                (next_monday, time(9, 0), time(10, 0)),
+                (next_monday, time(9, 30), time(10, 30)),
+            ],
+        )
+
+    def test_stops_after_limit_without_loading_further_weeks(self):
+        with self.assertNumQueries(5):  # profile + one chunk (lessons, blocked, recurring, series)
+            slots = BookingService.find_next_available_slots(
+                self.tutor, 60, after=self.after, limit=2
+            )
+        self.assertEqual(len(slots), 2)
+
+    def test_blocked_time_across_search_horizon(self):
+        BlockedTime.objects.create(
+            user=self.tutor,
+            title="Holiday",
+            start_datetime=self.after,
+            end_datetime=self.after + timedelta(days=20),
+        )
+        slots = BookingService.find_next_available_slots(self.tutor, 60, after=self.after, limit=1)
+        self.assertEqual(slots, [(self.monday + timedelta(days=21), time(9, 0), time(10, 0))])
+
+    def test_no_working_hours_returns_empty(self):
+        self.profile.default_working_hours = {}
+        self.profile.save()
+        self.assertEqual(BookingService.find_next_available_slots(self.tutor, 60), [])
+
+    def test_public_api(self):
+        resp = Client().get(
+            "/lessons/public-booking/tok-next/next-slots/",
+            {"after": self.monday.isoformat(), "limit": 2},
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            json.loads(resp.content)["slots"],
+            [
+                {"date": self.monday.isoformat(), "start": "09:00", "end": "10:00"},
+                {"date": self.monday.isoformat(), "start": "09:30", "end": "10:30"},
+            ],
+        )
+
+    def test_public_api_invalid_after_returns_400(self):
+        resp = Client().get("/lessons/public-booking/tok-next/next-slots/", {"after": "nope"})
+        self.assertEqual(resp.status_code, 400)
@@ -66,6 +66,15 @@ class LessonOwnershipIsolationTest(TestCase):
             status="planned",
         )
 
+    def test_owner_is_the_tutor_of_the_contract(self):
+        self.assertEqual(self.lesson_a.owner, self.tutor_a)
+        self.assertEqual(self.lesson_b.owner, self.tutor_b)
+
+        self.lesson_a.contract = self.contract_b
+        self.lesson_a.save(update_fields=["contract"])
+        self.lesson_a.refresh_from_db()
+        self.assertEqual(self.lesson_a.owner, self.tutor_b)
+
     def test_tutor_a_list_shows_only_own_lessons(self):
         self.client.force_login(self.tutor_a)
         response = self.client.get(reverse("lessons:list"))
@@ -205,6 +214,18 @@ class RecurringLessonOwnershipIsolationTest(TestCase):
             is_active=True,
         )
 
+    def test_series_and_generated_lessons_get_the_owner(self):
+        from apps.lessons.recurring_service import RecurringLessonService
+
+        self.assertEqual(self.recurring_a.owner, self.tutor_a)
+        RecurringLessonService.generate_lessons(self.recurring_a, check_conflicts=False)
+        owners = set(
+            Lesson.objects.filter(recurring_session=self.recurring_a).values_list(
+                "owner", flat=True
+            )
+        )
+        self.assertEqual(owners, {self.tutor_a.pk})
+
     def test_tutor_a_recurring_list_shows_only_own(self):
         self.client.force_login(self.tutor_a)
         response = self.client.get(reverse("lessons:recurring_list"))
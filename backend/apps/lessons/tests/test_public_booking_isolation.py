@@ -13,6 +13,7 @@ from django.urls import reverse
 
 from apps.contracts.models import Contract
 from apps.core.models import UserProfile
+from apps.lessons.booking_service import BookingService
 from apps.lessons.models import Lesson
 from apps.students.booking_code_service import set_booking_code
 from apps.students.models import Student
@@ -259,3 +260,10 @@ class PublicBookingTutorTokenIsolationTest(TestCase):
             self.assertNotIn(self.student_b.pk, ids)
         if data.get("result") == "exact_match":
             self.assertNotEqual(data.get("student", {}).get("id"), self.student_b.pk)
+
+    def test_contract_occupied_slots_only_contain_owner_data(self):
+        """Occupied slots for contract booking ignore other tutors' lessons."""
+        occupied = BookingService.get_occupied_time_slots(
+            self.contract_a.id, date(2025, 1, 6), date(2025, 1, 12)
+        )
+        self.assertEqual(occupied[date(2025, 1, 6)], [(time(10, 0), time(11, 0))])
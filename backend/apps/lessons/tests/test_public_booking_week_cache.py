@@ -0,0 +1,118 @@
+"""
+Tests for the cached public booking week payload and its write-driven invalidation.
+"""
+
+import json
+from datetime import datetime, time, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.models import Lesson
+from apps.lessons.utils_dates import get_week_start
+from apps.students.models import Student
+
+
+class PublicBookingWeekCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tutor = User.objects.create_user(username="tutor", password="test")
+        self.profile, _ = UserProfile.objects.get_or_create(user=self.tutor)
+        self.profile.public_booking_token = "tok-cache"
+        self.profile.default_working_hours = {"monday": [{"start": "09:00", "end": "12:00"}]}
+        self.profile.save()
+        self.student = Student.objects.create(user=self.tutor, first_name="A", last_name="B")
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=30,
+            unit_duration_minutes=60,
+            start_date=timezone.localdate(),
+        )
+        self.monday = get_week_start(timezone.localdate()) + timedelta(days=14)
+        self.client = Client()
+        self.week_url = "/lessons/public-booking/tok-cache/week/"
+
+    def _monday_slots(self):
+        resp = self.client.get(self.week_url, {"week_start": self.monday.isoformat()})
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(resp.content)["week_data"]["days"][0]["available_slots"]
+
+    def test_repeated_request_is_served_from_cache(self):
+        self.assertEqual(len(self._monday_slots()), 5)
+        # Tutor lookup, ETag fingerprint (5 aggregates) and schedule version; no slot queries
+        with self.assertNumQueries(7):
+            self.assertEqual(len(self._monday_slots()), 5)
+
+    def test_lesson_save_and_delete_invalidate(self):
+        self._monday_slots()
+        lesson = Lesson.objects.create(
+            contract=self.contract, date=self.monday, start_time=time(9, 0), duration_minutes=60
+        )
+        self.assertNotIn(["09:00", "10:00"], self._monday_slots())
+
+        Lesson.objects.filter(pk=lesson.pk).delete()
+        self.assertIn(["09:00", "10:00"], self._monday_slots())
+
+    def test_write_in_another_process_invalidates(self):
+        """Each web worker has its own LocMemCache; the version must still be shared."""
+        worker_a = LocMemCache("worker-a", {})
+        worker_b = LocMemCache("worker-b", {})
+        with mock.patch("apps.lessons.views_public_booking.cache", worker_a):
+            self._monday_slots()
+        with mock.patch("apps.lessons.views_public_booking.cache", worker_b):
+            Lesson.objects.create(
+                contract=self.contract, date=self.monday, start_time=time(9, 0), duration_minutes=60
+            )
+        with mock.patch("apps.lessons.views_public_booking.cache", worker_a):
+            self.assertNotIn(["09:00", "10:00"], self._monday_slots())
+
+    def test_etag_is_checked_against_database_on_cache_hit(self):
+        """A cache entry that missed an invalidation must not answer 304 for the old week."""
+        resp = self.client.get(self.week_url, {"week_start": self.monday.isoformat()})
+        etag = resp["ETag"]
+        with mock.patch("apps.lessons.signals.bump_schedule_version"):
+            Lesson.objects.create(
+                contract=self.contract, date=self.monday, start_time=time(9, 0), duration_minutes=60
+            )
+
+        resp = self.client.get(
+            self.week_url, {"week_start": self.monday.isoformat()}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_blocked_time_invalidates(self):
+        self._monday_slots()
+        BlockedTime.objects.create(
+            user=self.tutor,
+            title="Block",
+            start_datetime=timezone.make_aware(datetime.combine(self.monday, time(10, 0))),
+            end_datetime=timezone.make_aware(datetime.combine(self.monday, time(12, 0))),
+        )
+        self.assertEqual(self._monday_slots(), [["09:00", "10:00"]])
+
+    def test_profile_save_invalidates(self):
+        self._monday_slots()
+        self.profile.default_working_hours = {"monday": [{"start": "09:00", "end": "10:00"}]}
+        self.profile.save()
+        self.assertEqual(self._monday_slots(), [["09:00", "10:00"]])
+
+    def test_verified_student_is_not_served_from_cache(self):
+        self._monday_slots()
+        session = self.client.session
+        session["public_booking_student_id"] = self.student.id
+        session["public_booking_tutor_token"] = "tok-cache"
+        session.save()
+        Lesson.objects.create(
+            contract=self.contract, date=self.monday, start_time=time(9, 0), duration_minutes=60
+        )
+        resp = self.client.get(self.week_url, {"week_start": self.monday.isoformat()})
+        busy = json.loads(resp.content)["week_data"]["days"][0]["busy_intervals"]
+        self.assertTrue(busy[0]["own"])
@@ -133,3 +133,33 @@ class PublicBookingWeekNavigationTest(TestCase):
             {"week_start": "2025-02-30"},
         )
         self.assertEqual(resp.status_code, 200)
+
+    def test_range_api_matches_single_week_api(self):
+        """Multi-week API returns consecutive weeks identical to the single-week API."""
+        resp = self.client.get(
+            "/lessons/public-booking/tok-nav/weeks/", {"week_start": "2025-01-08", "weeks": 3}
+        )
+        self.assertEqual(resp.status_code, 200)
+        weeks = json.loads(resp.content)["weeks"]
+        self.assertEqual(
+            [w["week_start"] for w in weeks], ["2025-01-06", "2025-01-13", "2025-01-20"]
+        )
+        single = json.loads(self._get_week_via_param("2025-01-13").content)["week_data"]
+        self.assertEqual(weeks[1], single)
+
+    def test_range_api_caps_weeks_and_query_count(self):
+        """Week count is capped; queries do not grow with the number of weeks."""
+        with self.assertNumQueries(6):
+            resp = self.client.get(
+                "/lessons/public-booking/tok-nav/weeks/", {"week_start": "2025-01-06", "weeks": 1}
+            )
+        self.assertEqual(len(json.loads(resp.content)["weeks"]), 1)
+        with self.assertNumQueries(6):
+            resp = self.client.get(
+                "/lessons/public-booking/tok-nav/weeks/", {"week_start": "2025-01-06", "weeks": 50}
+            )
+        self.assertEqual(len(json.loads(resp.content)["weeks"]), BookingService.MAX_RANGE_WEEKS)
+
+    def test_range_api_invalid_params_return_400(self):
+        resp = self.client.get("/lessons/public-booking/tok-nav/weeks/", {"weeks": "x"})
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,127 @@
+"""
+Tests for bulk generation of series sessions (one existence query, bulk_create).
+"""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.availability_cache import get_schedule_version
+from apps.lessons.models import Lesson, SessionConflict
+from apps.lessons.recurring_models import RecurringLesson
+from apps.lessons.recurring_service import RecurringLessonService
+from apps.lessons.services import LessonConflictService
+from apps.students.models import Student
+
+
+class RecurringBulkGenerationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="bulkuser", password="password")
+        self.student = Student.objects.create(user=self.user, first_name="Bulk", last_name="A")
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=Decimal("30.00"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+
+    def _series(self, start_date, end_date, **weekdays):
+        return RecurringLesson.objects.create(
+            contract=self.contract,
+            start_date=start_date,
+            end_date=end_date,
+            start_time=time(14, 0),
+            duration_minutes=60,
+            recurrence_type="weekly",
+            **weekdays,
+        )
+
+    def test_query_count_does_not_grow_with_series_length(self):
+        short = self._series(date(2023, 1, 2), date(2023, 1, 15), monday=True, thursday=True)
+        with self.assertNumQueries(10):
+            RecurringLessonService.generate_lessons(short, check_conflicts=True)
+
+        Lesson.objects.all().delete()
+        half_year = self._series(date(2024, 1, 1), date(2024, 6, 30), monday=True, thursday=True)
+        with self.assertNumQueries(10):
+            result = RecurringLessonService.generate_lessons(half_year, check_conflicts=True)
+        self.assertEqual(result["created"], 52)
+
+    def test_result_shape_statuses_and_skips(self):
+        today = timezone.localdate()
+        start = today - timedelta(days=today.weekday()) - timedelta(weeks=2)
+        Lesson.objects.create(
+            contract=self.contract,
+            date=start + timedelta(weeks=1),
+            start_time=time(14, 0),
+            duration_minutes=60,
+        )
+        series = self._series(start, start + timedelta(weeks=4), monday=True)
+
+        result = RecurringLessonService.generate_lessons(series, check_conflicts=True)
+
+        self.assertEqual(result["created"], 4)
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual(result["preview"], [])
+        self.assertEqual(result["conflicts"], [])
+        statuses = {s.date: s.status for s in result["sessions"]}
+        self.assertEqual(statuses[start], "taught")
+        self.assertEqual(statuses[start + timedelta(weeks=4)], "planned")
+        self.assertTrue(
+            all(s.pk and s.recurring_session_id == series.pk for s in result["sessions"])
+        )
+
+    def test_dry_run_saves_nothing(self):
+        series = self._series(date(2023, 3, 6), date(2023, 3, 27), monday=True)
+        result = RecurringLessonService.generate_lessons(series, dry_run=True)
+        self.assertEqual(result["created"], 4)
+        self.assertEqual(len(result["preview"]), 4)
+        self.assertFalse(Lesson.objects.exists())
+
+    def test_conflicts_are_reported_and_stored(self):
+        existing = Lesson.objects.create(
+            contract=self.contract,
+            date=date(2023, 3, 13),
+            start_time=time(14, 30),
+            duration_minutes=60,
+        )
+        blocked = BlockedTime.objects.create(
+            user=self.user,
+            title="Lecture",
+            start_datetime=timezone.make_aware(datetime(2023, 3, 20, 13, 0)),
+            end_datetime=timezone.make_aware(datetime(2023, 3, 20, 14, 30)),
+        )
+        series = self._series(date(2023, 3, 6), date(2023, 3, 27), monday=True)
+        # The schedule version lives on the profile (public booking needs one anyway)
+        UserProfile.objects.get_or_create(user=self.user)
+        version = get_schedule_version(self.user.id)
+
+        result = RecurringLessonService.generate_lessons(series, check_conflicts=True)
+
+        self.assertEqual(
+            [c["date"] for c in result["conflicts"]], [date(2023, 3, 13), date(2023, 3, 20)]
+        )
+        for entry in result["conflicts"]:
+            live = LessonConflictService.check_conflicts(entry["session"])
+            self.assertEqual(
+                [(c["type"], c["object"].pk) for c in live],
+                [(c["type"], c["object"].pk) for c in entry["conflicts"]],
+            )
+        march_13 = Lesson.objects.get(date=date(2023, 3, 13), start_time=time(14, 0))
+        self.assertTrue(
+            SessionConflict.objects.filter(session=existing, other_session=march_13).exists()
+        )
+        self.assertTrue(
+            SessionConflict.objects.filter(session=march_13, other_session=existing).exists()
+        )
+        self.assertTrue(SessionConflict.objects.filter(blocked_time=blocked).exists())
+        self.assertNotEqual(get_schedule_version(self.user.id), version)
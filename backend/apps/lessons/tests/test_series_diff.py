@@ -0,0 +1,139 @@
+"""
+Tests for the series diff engine (minimal inserts/updates/deletes for series edits).
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.contracts.models import Contract
+from apps.lessons.models import Lesson, SessionConflict
+from apps.lessons.recurring_models import RecurringLesson
+from apps.lessons.recurring_service import RecurringLessonService
+from apps.lessons.recurring_utils import get_all_lessons_for_recurring
+from apps.lessons.series_diff_service import SeriesDiffService
+from apps.lessons.services import LessonConflictService
+from apps.students.models import Student
+
+
+class SeriesDiffServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="difftutor", password="test")
+        student = Student.objects.create(user=self.user, first_name="Diff", last_name="A")
+        self.contract = Contract.objects.create(
+            student=student,
+            hourly_rate=Decimal("30"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+
+    def _series(self, end_date):
+        recurring = RecurringLesson.objects.create(
+            contract=self.contract,
+            start_date=date(2023, 1, 2),
+            end_date=end_date,
+            start_time=time(10, 0),
+            duration_minutes=60,
+            monday=True,
+            wednesday=True,
+        )
+        RecurringLessonService.generate_lessons(recurring, check_conflicts=False)
+        return recurring
+
+    def _edit(self, recurring, start_time=time(10, 0), notes=None, weekdays=None):
+        """Applies an edit like LessonUpdateView (template saved first, then the diff)."""
+        sessions = get_all_lessons_for_recurring(
+            recurring, original_start_time=recurring.start_time
+        )
+        old_recurrence = recurring.recurrence
+        recurring.start_time = start_time
+        recurring.notes = notes
+        for day, active in (weekdays or {}).items():
+            setattr(recurring, day, active)
+        recurring.save()
+        return SeriesDiffService.apply(recurring, sessions, old_recurrence)
+
+    def test_weekday_change_deletes_updates_and_inserts(self):
+        recurring = self._series(date(2023, 1, 29))  # 4 Mondays, 4 Wednesdays
+
+        result = self._edit(
+            recurring, start_time=time(15, 0), weekdays={"wednesday": False, "friday": True}
+        )
+
+        self.assertEqual((result["deleted"], result["updated"], result["created"]), (4, 4, 4))
+        lessons = Lesson.objects.filter(contract=self.contract)
+        self.assertEqual(sorted({les.date.weekday() for les in lessons}), [0, 4])
+        self.assertTrue(all(les.start_time == time(15, 0) for les in lessons))
+        self.assertTrue(all(les.status == "taught" for les in lessons))
+        self.assertTrue(
+            all(les.recurring_session_id == recurring.pk for les in lessons if les.date.weekday())
+        )
+
+    def test_unchanged_sessions_are_left_alone(self):
+        recurring = self._series(date(2023, 1, 29))
+        result = self._edit(recurring)
+        self.assertEqual((result["deleted"], result["updated"], result["created"]), (0, 0, 0))
+
+        # Only the lesson that was edited individually differs from the template
+        Lesson.objects.filter(date=date(2023, 1, 9)).update(notes="moved room")
+        result = self._edit(recurring)
+        self.assertEqual((result["deleted"], result["updated"], result["created"]), (0, 1, 0))
+        self.assertIsNone(Lesson.objects.get(date=date(2023, 1, 9)).notes)
+
+    def test_query_count_does_not_grow_with_series_length(self):
+        for end_date in (date(2023, 1, 15), date(2023, 6, 30)):
+            Lesson.objects.all().delete()
+            recurring = self._series(end_date)
+            sessions = get_all_lessons_for_recurring(
+                recurring, original_start_time=recurring.start_time
+            )
+            old_recurrence = recurring.recurrence
+            recurring.start_time = time(16, 0)
+            with self.assertNumQueries(9):
+                SeriesDiffService.apply(recurring, sessions, old_recurrence)
+            self.assertEqual(Lesson.objects.filter(start_time=time(16, 0)).count(), len(sessions))
+
+    def test_conflict_store_matches_live_check(self):
+        recurring = self._series(date(2023, 1, 29))
+        single = Lesson.objects.create(
+            contract=self.contract,
+            date=date(2023, 1, 16),
+            start_time=time(14, 30),
+            duration_minutes=60,
+        )
+        BlockedTime.objects.create(
+            user=self.user,
+            title="Lecture",
+            start_datetime=timezone.make_aware(datetime(2023, 1, 20, 14, 30)),
+            end_datetime=timezone.make_aware(datetime(2023, 1, 20, 15, 30)),
+        )
+        # Conflicts at 10:00 on Jan 16 are stale after moving the series to 14:00
+        other = Lesson.objects.create(
+            contract=self.contract,
+            date=date(2023, 1, 16),
+            start_time=time(10, 30),
+            duration_minutes=30,
+        )
+
+        result = self._edit(
+            recurring, start_time=time(14, 0), weekdays={"wednesday": False, "friday": True}
+        )
+
+        self.assertEqual(
+            [entry["date"] for entry in result["conflicts"]], [date(2023, 1, 16), date(2023, 1, 20)]
+        )
+        for lesson in Lesson.objects.filter(contract=self.contract):
+            stored = LessonConflictService.get_stored_conflicts([lesson]).get(lesson.pk, [])
+            live = LessonConflictService.check_conflicts(lesson)
+            self.assertEqual(
+                [(c["type"], c["object"].pk) for c in stored],
+                [(c["type"], c["object"].pk) for c in live],
+                lesson.date,
+            )
+        self.assertFalse(SessionConflict.objects.filter(session=other).exists())
+        self.assertTrue(SessionConflict.objects.filter(session=single).exists())
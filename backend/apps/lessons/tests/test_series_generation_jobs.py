@@ -0,0 +1,137 @@
+"""
+Tests for background series generation (job queue, worker command, progress endpoint).
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.contracts.models import Contract
+from apps.lessons.models import Lesson
+from apps.lessons.recurring_models import RecurringLesson, SeriesGenerationJob
+from apps.lessons.series_job_service import SeriesGenerationJobService
+from apps.students.models import Student
+
+
+class SeriesGenerationJobTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="jobuser", password="password")
+        self.other = User.objects.create_user(username="otheruser", password="password")
+        student = Student.objects.create(user=self.user, first_name="Job", last_name="A")
+        contract = Contract.objects.create(
+            student=student,
+            hourly_rate=Decimal("30.00"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+        # 2023-01-02 (Monday) to 2023-03-26: 12 Mondays, 12 Thursdays
+        self.series = RecurringLesson.objects.create(
+            contract=contract,
+            start_date=date(2023, 1, 2),
+            end_date=date(2023, 3, 26),
+            start_time=time(14, 0),
+            duration_minutes=60,
+            recurrence_type="weekly",
+            monday=True,
+            thursday=True,
+        )
+        self.client.force_login(self.user)
+
+    def _status(self, job, user=None):
+        if user:
+            self.client.force_login(user)
+        return self.client.get(reverse("lessons:recurring_job_status", kwargs={"pk": job.pk}))
+
+    @override_settings(SERIES_GENERATION_ASYNC=True)
+    def test_request_enqueues_and_worker_generates(self):
+        response = self.client.post(
+            reverse("lessons:recurring_generate", kwargs={"pk": self.series.pk})
+        )
+
+        self.assertRedirects(
+            response,
+            reverse("lessons:recurring_detail", kwargs={"pk": self.series.pk}),
+            fetch_redirect_response=False,
+        )
+        self.assertFalse(Lesson.objects.exists())
+        job = SeriesGenerationJob.objects.get(recurring_session=self.series)
+        self.assertEqual(self._status(job).json()["status"], "pending")
+        detail = self.client.get(reverse("lessons:recurring_detail", kwargs={"pk": self.series.pk}))
+        self.assertContains(detail, "generation-progress")
+
+        out = StringIO()
+        call_command("process_series_jobs", "--once", stdout=out)
+
+        self.assertIn("Processed 1 job(s).", out.getvalue())
+        self.assertEqual(Lesson.objects.filter(recurring_session=self.series).count(), 24)
+        progress = self._status(job).json()
+        self.assertEqual(progress["status"], "done")
+        self.assertEqual((progress["processed"], progress["total"]), (24, 24))
+        self.assertEqual((progress["created"], progress["skipped"]), (24, 0))
+        self.assertEqual(progress["percent"], 100)
+
+    @override_settings(SERIES_GENERATION_ASYNC=True)
+    def test_pending_job_is_reused(self):
+        first = SeriesGenerationJobService.enqueue(self.series)
+        second = SeriesGenerationJobService.enqueue(self.series)
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(SeriesGenerationJobService.process_pending(), 1)
+        self.assertIsNone(SeriesGenerationJobService.claim_next())
+
+    def test_without_worker_the_job_runs_in_the_request(self):
+        response = self.client.post(
+            reverse("lessons:recurring_generate", kwargs={"pk": self.series.pk})
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Lesson.objects.filter(recurring_session=self.series).count(), 24)
+        job = SeriesGenerationJob.objects.get(recurring_session=self.series)
+        self.assertEqual((job.status, job.created), ("done", 24))
+
+    def test_chunks_commit_progress_and_abandoned_job_resumes(self):
+        job = SeriesGenerationJob.objects.create(recurring_session=self.series)
+        # A previous worker committed the first chunk of 10 dates and died
+        SeriesGenerationJobService.run(job, chunk_size=10)
+        Lesson.objects.filter(date__gte=date(2023, 2, 6)).delete()
+        job.status = "running"
+        job.processed = 10
+        job.created = 10
+        job.save()
+        SeriesGenerationJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        claimed = SeriesGenerationJobService.claim_next()
+        SeriesGenerationJobService.run(claimed, chunk_size=10)
+
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, "done")
+        self.assertEqual((claimed.processed, claimed.created, claimed.skipped), (24, 24, 0))
+        self.assertEqual(Lesson.objects.filter(recurring_session=self.series).count(), 24)
+
+    def test_failed_job_records_error(self):
+        job = SeriesGenerationJob.objects.create(recurring_session=self.series, status="running")
+
+        with patch(
+            "apps.lessons.series_job_service.RecurringSessionService._create_sessions",
+            side_effect=RuntimeError("database unavailable"),
+        ):
+            SeriesGenerationJobService.run(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "database unavailable")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_progress_endpoint_is_owner_only(self):
+        job = SeriesGenerationJob.objects.create(recurring_session=self.series)
+        self.assertEqual(self._status(job).status_code, 200)
+        self.assertEqual(self._status(job, user=self.other).status_code, 404)
@@ -0,0 +1,221 @@
+"""
+Tests for rolling-horizon materialization of open-ended series.
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.blocked_times.recurring_models import RecurringBlockedTime
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.models import Lesson
+from apps.lessons.recurring_models import RecurringLesson, SeriesGenerationJob
+from apps.lessons.recurring_service import RecurringLessonService
+from apps.students.models import Student
+
+
+@override_settings(SERIES_HORIZON_WEEKS=4)
+class SeriesHorizonTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="horizontutor", password="test")
+        student = Student.objects.create(user=self.user, first_name="Open", last_name="Ended")
+        self.contract = Contract.objects.create(
+            student=student,
+            hourly_rate=Decimal("30"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+        self.today = timezone.localdate()
+        self.monday = self.today - timedelta(days=self.today.weekday())
+
+    def _series(self, **kwargs):
+        defaults = {
+            "contract": self.contract,
+            "start_date": self.monday,
+            "start_time": time(14, 0),
+            "duration_minutes": 60,
+            "monday": True,
+        }
+        defaults.update(kwargs)
+        return RecurringLesson.objects.create(**defaults)
+
+    def _mondays(self, start, end):
+        return len(range(0, (end - start).days + 1, 7))
+
+    def test_open_ended_series_stops_at_horizon(self):
+        series = self._series()
+        horizon = self.today + timedelta(weeks=4)
+        expected = self._mondays(self.monday, horizon)
+        self.assertEqual(len(RecurringLessonService.preview_lessons(series)), expected)
+
+        result = RecurringLessonService.generate_lessons(series, check_conflicts=False)
+
+        self.assertEqual(result["created"], expected)
+        series.refresh_from_db()
+        self.assertEqual(series.materialized_until, horizon)
+
+    def test_contract_end_and_explicit_end_date(self):
+        self.contract.end_date = self.today + timedelta(weeks=2)
+        self.contract.save()
+        series = self._series()
+        self.assertEqual(
+            RecurringLessonService.materialization_end(series), self.today + timedelta(weeks=2)
+        )
+
+        fixed = self._series(start_time=time(9, 0), end_date=self.monday + timedelta(weeks=20))
+        result = RecurringLessonService.generate_lessons(fixed, check_conflicts=False)
+        self.assertEqual(result["created"], 21)
+
+    def test_future_series_is_materialized_from_its_start(self):
+        start = self.monday + timedelta(weeks=10)
+        series = self._series(start_date=start)
+        result = RecurringLessonService.generate_lessons(series, check_conflicts=False)
+        self.assertEqual(result["created"], 5)
+
+    def test_extension_only_adds_new_dates(self):
+        series = self._series()
+        RecurringLessonService.generate_lessons(series, check_conflicts=False)
+        # A lesson deleted by the tutor must not come back
+        deleted_date = self.monday + timedelta(weeks=1)
+        Lesson.objects.filter(date=deleted_date).delete()
+
+        later = self.today + timedelta(weeks=3)
+        result = RecurringLessonService.extend_materialization(series, later)
+
+        self.assertEqual(result["created"], 3)
+        self.assertFalse(Lesson.objects.filter(date=deleted_date).exists())
+        self.assertEqual(series.materialized_until, later + timedelta(weeks=4))
+        self.assertEqual(RecurringLessonService.extend_materialization(series, later)["created"], 0)
+
+    def test_command_extends_sessions_and_blocked_times(self):
+        series = self._series()
+        RecurringLessonService.generate_lessons(series, check_conflicts=False)
+        inactive = self._series(start_time=time(9, 0), is_active=False)
+        lagging = RecurringBlockedTime.objects.create(
+            user=self.user,
+            title="Lecture",
+            start_date=self.monday,
+            start_time=time(8, 0),
+            end_time=time(9, 0),
+            tuesday=True,
+            materialized_until=self.monday,
+        )
+        RecurringLesson.objects.filter(pk=series.pk).update(materialized_until=self.monday)
+
+        out = StringIO()
+        call_command("materialize_series", stdout=out)
+
+        self.assertIn("Extended 1 session series", out.getvalue())
+        horizon = self.today + timedelta(weeks=4)
+        self.assertEqual(
+            Lesson.objects.filter(recurring_session=series).count(),
+            self._mondays(self.monday, horizon),
+        )
+        self.assertFalse(Lesson.objects.filter(contract=self.contract, start_time=time(9, 0)))
+        self.assertEqual(
+            BlockedTime.objects.filter(title="Lecture").count(),
+            self._mondays(self.monday + timedelta(days=1), horizon),
+        )
+        lagging.refresh_from_db()
+        self.assertEqual(lagging.materialized_until, horizon)
+        self.assertFalse(RecurringLesson.objects.get(pk=inactive.pk).materialized_until)
+
+    def test_week_view_extends_lagging_series_of_the_user(self):
+        series = self._series()
+        RecurringLesson.objects.filter(pk=series.pk).update(materialized_until=self.monday)
+        other = User.objects.create_user(username="othertutor", password="test")
+        other_blocked = RecurringBlockedTime.objects.create(
+            user=other,
+            title="Other",
+            start_date=self.monday,
+            start_time=time(8, 0),
+            end_time=time(9, 0),
+            tuesday=True,
+            materialized_until=self.monday,
+        )
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("lessons:week"))
+
+        self.assertEqual(response.status_code, 200)
+        horizon = self.today + timedelta(weeks=4)
+        series.refresh_from_db()
+        self.assertEqual(series.materialized_until, horizon)
+        self.assertEqual(
+            Lesson.objects.filter(recurring_session=series).count(),
+            self._mondays(self.monday + timedelta(weeks=1), horizon),
+        )
+        other_blocked.refresh_from_db()
+        self.assertEqual(other_blocked.materialized_until, self.monday)
+        self.assertFalse(BlockedTime.objects.filter(title="Other").exists())
+
+    def test_extension_rereads_series_under_lock(self):
+        series = self._series()
+        RecurringLessonService.generate_lessons(series, check_conflicts=False)
+        stale = RecurringLesson.objects.get(pk=series.pk)
+        RecurringLesson.objects.filter(pk=series.pk).update(materialized_until=self.monday)
+        later = self.today + timedelta(weeks=2)
+        RecurringLessonService.extend_materialization(series, later)
+        # A lesson deleted after the extension must not come back from a stale instance
+        deleted_date = series.materialized_until - timedelta(
+            days=series.materialized_until.weekday()
+        )
+        self.assertTrue(Lesson.objects.filter(date=deleted_date).exists())
+        Lesson.objects.filter(date=deleted_date).delete()
+        stale.materialized_until = self.monday
+
+        result = RecurringLessonService.extend_materialization(stale, later)
+
+        self.assertEqual(result["created"], 0)
+        self.assertFalse(Lesson.objects.filter(date=deleted_date).exists())
+
+    def test_series_with_pending_job_is_left_to_the_worker(self):
+        series = self._series()
+        SeriesGenerationJob.objects.create(recurring_session=series)
+
+        result = RecurringLessonService.extend_all_materializations(user=self.user)
+
+        self.assertEqual(result["series"], 0)
+        self.assertFalse(Lesson.objects.filter(recurring_session=series).exists())
+
+    def test_series_date_is_unique_in_database(self):
+        series = self._series()
+        RecurringLessonService.generate_lessons(series, check_conflicts=False)
+        lesson = Lesson.objects.filter(recurring_session=series).first()
+        lesson.pk = None
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Lesson.objects.bulk_create([lesson])
+
+    def test_booking_pages_show_unmaterialized_dates_as_busy_without_writing(self):
+        profile, _ = UserProfile.objects.get_or_create(user=self.user)
+        profile.public_booking_token = "tok-horizon"
+        profile.default_working_hours = {"monday": [{"start": "13:00", "end": "16:00"}]}
+        profile.save()
+        series = self._series()
+        RecurringLessonService.generate_lessons(series, check_conflicts=False)
+        count = Lesson.objects.count()
+        beyond = self.monday + timedelta(weeks=10)
+
+        public = self.client.get(
+            "/lessons/public-booking/tok-horizon/week/", {"week_start": beyond.isoformat()}
+        ).json()["week_data"]
+        student = self.client.get(
+            reverse("lessons:student_booking_week_api", args=[self.contract.booking_token]),
+            {"year": beyond.year, "month": beyond.month, "day": beyond.day},
+        ).json()["week_data"]
+
+        for week in (public, student):
+            self.assertEqual(
+                week["days"][0]["available_slots"], [["13:00", "14:00"], ["15:00", "16:00"]]
+            )
+        self.assertEqual(Lesson.objects.count(), count)
@@ -0,0 +1,166 @@
+"""
+Tests for the stored datetime columns of Session (starts_at, ends_at, occupied interval).
+"""
+
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core import serializers
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.blocked_times.models import BlockedTime
+from apps.contracts.models import Contract
+from apps.lessons.models import TIME_COLUMNS, Lesson, SessionConflict
+from apps.lessons.recurring_models import RecurringLesson
+from apps.lessons.recurring_service import RecurringLessonService
+from apps.lessons.recurring_utils import get_all_lessons_for_recurring
+from apps.lessons.series_diff_service import SeriesDiffService
+from apps.lessons.services import LessonConflictService
+from apps.students.models import Student
+
+
+def aware(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+class SessionTimeColumnsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="columnuser", password="password")
+        student = Student.objects.create(user=self.user, first_name="Column", last_name="A")
+        self.contract = Contract.objects.create(
+            student=student,
+            hourly_rate=Decimal("30.00"),
+            unit_duration_minutes=60,
+            start_date=date(2023, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+        self.day = date(2023, 5, 10)
+
+    def _lesson(self, hour, minute=0, **kwargs):
+        return Lesson.objects.create(
+            contract=self.contract,
+            date=self.day,
+            start_time=time(hour, minute),
+            duration_minutes=60,
+            **kwargs,
+        )
+
+    def assertColumns(self, lesson, starts_at, ends_at, occupied_from, occupied_until):
+        lesson.refresh_from_db()
+        self.assertEqual(
+            (lesson.starts_at, lesson.ends_at, lesson.occupied_from, lesson.occupied_until),
+            (starts_at, ends_at, occupied_from, occupied_until),
+        )
+
+    def test_columns_follow_saves(self):
+        lesson = self._lesson(10, travel_time_before_minutes=15, travel_time_after_minutes=30)
+        self.assertColumns(
+            lesson,
+            aware(self.day, 10),
+            aware(self.day, 11),
+            aware(self.day, 9, 45),
+            aware(self.day, 11, 30),
+        )
+
+        lesson.travel_time_after_minutes = 0
+        lesson.save(update_fields=["travel_time_after_minutes"])
+        self.assertColumns(
+            lesson,
+            aware(self.day, 10),
+            aware(self.day, 11),
+            aware(self.day, 9, 45),
+            aware(self.day, 11),
+        )
+
+    def test_bulk_series_paths_fill_columns(self):
+        recurring = RecurringLesson.objects.create(
+            contract=self.contract,
+            start_date=date(2023, 1, 2),
+            end_date=date(2023, 1, 15),
+            start_time=time(10, 0),
+            duration_minutes=60,
+            travel_time_after_minutes=10,
+            monday=True,
+        )
+        RecurringLessonService.generate_lessons(recurring, check_conflicts=False)
+        first = Lesson.objects.get(date=date(2023, 1, 2))
+        self.assertColumns(
+            first,
+            aware(first.date, 10),
+            aware(first.date, 11),
+            aware(first.date, 10),
+            aware(first.date, 11, 10),
+        )
+
+        sessions = get_all_lessons_for_recurring(recurring, original_start_time=time(10, 0))
+        old_recurrence = recurring.recurrence
+        recurring.start_time = time(15, 0)
+        recurring.save()
+        SeriesDiffService.apply(recurring, sessions, old_recurrence)
+        self.assertColumns(
+            first,
+            aware(first.date, 15),
+            aware(first.date, 16),
+            aware(first.date, 15),
+            aware(first.date, 16, 10),
+        )
+
+    def test_fixture_loads_fill_derived_columns(self):
+        lesson = self._lesson(10)
+        # A fixture written before the columns existed
+        data = json.loads(serializers.serialize("json", [lesson]))
+        for column in (*TIME_COLUMNS, "owner"):
+            del data[0]["fields"][column]
+        Lesson.objects.filter(pk=lesson.pk).update(**dict.fromkeys(TIME_COLUMNS))
+
+        for obj in serializers.deserialize("json", json.dumps(data)):
+            obj.save()
+
+        self.assertEqual(Lesson.objects.get(pk=lesson.pk).owner, self.user)
+        self.assertColumns(
+            lesson,
+            aware(self.day, 10),
+            aware(self.day, 11),
+            aware(self.day, 10),
+            aware(self.day, 11),
+        )
+
+    def test_overlap_queries_use_the_occupied_interval(self):
+        lesson = self._lesson(10, travel_time_after_minutes=30)
+        neighbour = self._lesson(11, 15)
+        BlockedTime.objects.create(
+            user=self.user,
+            title="Bus",
+            start_datetime=aware(self.day, 11, 20),
+            end_datetime=aware(self.day, 11, 40),
+        )
+
+        conflicts = LessonConflictService.check_conflicts(lesson)
+
+        self.assertEqual(
+            [(c["type"], c["object"].pk) for c in conflicts],
+            [("lesson", neighbour.pk), ("blocked_time", BlockedTime.objects.get().pk)],
+        )
+        self.assertEqual(
+            set(
+                SessionConflict.objects.filter(blocked_time__isnull=False).values_list(
+                    "session_id", flat=True
+                )
+            ),
+            {lesson.pk, neighbour.pk},
+        )
+
+    def test_travel_time_across_midnight_conflicts_with_blocked_time(self):
+        lesson = self._lesson(23, 30, travel_time_after_minutes=45)
+        next_day = self.day + timedelta(days=1)
+        BlockedTime.objects.create(
+            user=self.user,
+            title="Early call",
+            start_datetime=aware(next_day, 0, 45),
+            end_datetime=aware(next_day, 1, 0),
+        )
+
+        self.assertTrue(SessionConflict.objects.filter(session=lesson).exists())
@@ -0,0 +1,107 @@
+"""
+Tests for the single-pass slot check and locked reservation in book_lesson_api.
+"""
+
+import json
+from datetime import time, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.booking_service import BookingService
+from apps.lessons.models import Lesson
+from apps.lessons.utils_dates import get_week_start
+from apps.students.booking_code_service import set_booking_code
+from apps.students.models import Student
+
+
+class SlotReservationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tutor = User.objects.create_user(username="tutor", password="test")
+        self.profile, _ = UserProfile.objects.get_or_create(user=self.tutor)
+        self.profile.public_booking_token = "tok-res"
+        self.profile.default_working_hours = {"monday": [{"start": "09:00", "end": "12:00"}]}
+        self.profile.save()
+        self.student = Student.objects.create(user=self.tutor, first_name="Max", last_name="T")
+        self.booking_code = set_booking_code(self.student)
+        self.contract = Contract.objects.create(
+            student=self.student,
+            hourly_rate=30,
+            unit_duration_minutes=60,
+            start_date=timezone.localdate(),
+        )
+        self.monday = get_week_start(timezone.localdate()) + timedelta(days=14)
+        Lesson.objects.create(
+            contract=self.contract, date=self.monday, start_time=time(9, 0), duration_minutes=60
+        )
+        self.client = Client()
+
+    def _book(self, start, end):
+        return self.client.post(
+            reverse("lessons:public_booking_book_lesson"),
+            data=json.dumps(
+                {
+                    "student_id": self.student.id,
+                    "booking_code": self.booking_code,
+                    "tutor_token": "tok-res",
+                    "date": self.monday.isoformat(),
+                    "start_time": start,
+                    "end_time": end,
+                }
+            ),
+            content_type="application/json",
+        )
+
+    def test_check_slot_occupied_returns_alternatives(self):
+        result = BookingService.check_slot(
+            self.monday, time(9, 30), time(10, 30), user=self.tutor, profile=self.profile
+        )
+        self.assertFalse(result["available"])
+        self.assertEqual(result["reason"], "occupied")
+        self.assertEqual(
+            result["alternative_slots"],
+            [(time(10, 0), time(11, 0)), (time(10, 30), time(11, 30)), (time(11, 0), time(12, 0))],
+        )
+
+    def test_check_slot_travel_policy(self):
+        self.profile.default_booking_location = "vor_ort"
+        self.profile.travel_policy = {
+            "enabled": True,
+            "no_go_windows": [{"weekday": 0, "start_time": "11:00", "end_time": "12:00"}],
+        }
+        result = BookingService.check_slot(
+            self.monday, time(11, 0), time(12, 0), user=self.tutor, profile=self.profile
+        )
+        self.assertEqual(result["reason"], "travel_policy")
+        self.assertEqual(result["alternative_slots"], [(time(10, 0), time(11, 0))])
+
+    def test_check_slot_excludes_lesson(self):
+        lesson = Lesson.objects.get(contract=self.contract)
+        result = BookingService.check_slot(
+            self.monday, time(9, 0), time(10, 0), user=self.tutor, exclude_lesson_id=lesson.id
+        )
+        self.assertTrue(result["available"])
+        self.assertEqual(result["alternative_slots"], [])
+
+    def test_booking_occupied_slot_returns_alternatives(self):
+        resp = self._book("09:00", "10:00")
+        self.assertEqual(resp.status_code, 400)
+        data = resp.json()
+        self.assertEqual(data["alternative_slots"][0], ["10:00", "11:00"])
+        self.assertEqual(Lesson.objects.count(), 1)
+
+    def test_booking_locks_tutor_schedule(self):
+        with patch.object(
+            BookingService, "lock_tutor_schedule", wraps=BookingService.lock_tutor_schedule
+        ) as lock:
+            resp = self._book("10:00", "11:00")
+        self.assertEqual(resp.status_code, 200)
+        lock.assert_called_once_with(self.tutor)
+        self.assertEqual(Lesson.objects.get(pk=resp.json()["lesson_id"]).contract, self.contract)
@@ -16,6 +16,7 @@ from apps.contracts.models import Contract
 from apps.core.models import UserProfile
 from apps.lessons.booking_service import BookingService
 from apps.lessons.travel_policy import (
+    TravelPolicy,
     get_synthetic_occupied_for_date,
     is_slot_allowed_by_policy,
 )
@@ -140,6 +141,53 @@ class TravelPolicySyntheticOccupiedTest(TestCase):
         )
 
 
+class CompiledTravelPolicyTest(TestCase):
+    """TravelPolicy: pre-merged blocks per weekday, allows() matches the linear overlap test."""
+
+    POLICY = {
+        "enabled": True,
+        "buffer_rules": [
+            {"weekday": 0, "start_time": "14:00", "end_time": "15:00", "buffer_minutes": 30},
+            {"weekday": 0, "start_time": "15:00", "end_time": "16:00", "buffer_minutes": 0},
+        ],
+        "no_go_windows": [{"weekday": 0, "start_time": "08:00", "end_time": "09:00"}],
+    }
+
+    def test_blocks_are_merged_per_weekday(self):
+        compiled = TravelPolicy(self.POLICY)
+        monday = date(2025, 1, 6)
+        self.assertEqual(
+            compiled.blocks_for(monday),
+            [(time(8, 0), time(9, 0)), (time(13, 30), time(16, 0))],
+        )
+        self.assertEqual(compiled.blocks_for(monday + timedelta(days=1)), [])
+
+    def test_allows_matches_linear_scan(self):
+        compiled = TravelPolicy(self.POLICY)
+        monday = date(2025, 1, 6)
+        blocks = compiled.blocks_for(monday)
+        for start_minute in range(6 * 60, 18 * 60, 15):
+            start = time(start_minute // 60, start_minute % 60)
+            end = time((start_minute + 60) // 60, (start_minute + 60) % 60)
+            expected = all(end <= bs or start >= be for bs, be in blocks)
+            self.assertEqual(compiled.allows(monday, start, end), expected, start)
+
+    def test_for_profile_is_cached_per_policy_version(self):
+        profile = UserProfile(default_booking_location="vor_ort", travel_policy=self.POLICY)
+        first = TravelPolicy.for_profile(profile)
+        self.assertIs(TravelPolicy.for_profile(profile), first)
+        profile.travel_policy = {**self.POLICY, "no_go_windows": []}
+        changed = TravelPolicy.for_profile(profile)
+        self.assertIsNot(changed, first)
+        self.assertTrue(changed.allows(date(2025, 1, 6), time(8, 0), time(9, 0)))
+
+    def test_for_profile_online_is_disabled(self):
+        profile = UserProfile(default_booking_location="online", travel_policy=self.POLICY)
+        compiled = TravelPolicy.for_profile(profile)
+        self.assertFalse(compiled.enabled)
+        self.assertTrue(compiled.allows(date(2025, 1, 6), time(8, 0), time(9, 0)))
+
+
 class TravelPolicyBookingServiceTest(TestCase):
     """Vor-Ort with policy reduces available slots; online unchanged."""
 
@@ -0,0 +1,164 @@
+"""
+Tests for the TutorSpace tier ledger (cumulative pool minutes per counted session).
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.contracts.institute_utils import TUTORSPACE_INSTITUTE_NAME
+from apps.contracts.models import Contract
+from apps.contracts.services import get_institute_tier_progress
+from apps.contracts.tutorspace_compensation import calculate_tutorspace_amount_for_session
+from apps.core.models import UserProfile
+from apps.lessons.models import Lesson, TutorSpaceLedgerEntry
+from apps.lessons.recurring_models import RecurringLesson
+from apps.lessons.recurring_service import RecurringLessonService
+from apps.lessons.status_service import LessonStatusUpdater
+from apps.lessons.tutorspace_ledger import TutorSpaceLedgerService
+from apps.students.models import Student
+
+
+class TutorSpaceLedgerTest(TestCase):
+    def setUp(self):
+        self.tutor = User.objects.create_user(username="ledgertutor", password="test")
+        student = Student.objects.create(user=self.tutor, first_name="Ledger", last_name="A")
+        self.contract = Contract.objects.create(
+            student=student,
+            institute=TUTORSPACE_INSTITUTE_NAME,
+            hourly_rate=Decimal("13.00"),
+            unit_duration_minutes=60,
+            start_date=date(2025, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+        self.other_contract = Contract.objects.create(
+            student=student,
+            institute="Abacus",
+            hourly_rate=Decimal("20.00"),
+            unit_duration_minutes=60,
+            start_date=date(2025, 1, 1),
+            has_monthly_planning_limit=False,
+        )
+
+    def _lesson(self, day, hour=10, duration=60, status="taught", **kwargs):
+        kwargs.setdefault("contract", self.contract)
+        return Lesson.objects.create(
+            date=date(2025, 1, day),
+            start_time=time(hour, 0),
+            duration_minutes=duration,
+            status=status,
+            **kwargs,
+        )
+
+    def _ledger(self):
+        return list(
+            TutorSpaceLedgerEntry.objects.order_by(
+                "date", "start_time", "session_created_at"
+            ).values_list("session_id", "minutes_before", "minutes")
+        )
+
+    def assertLedgerConsistent(self, expected_minutes):
+        """The incrementally maintained ledger equals a rebuild from scratch."""
+        maintained = self._ledger()
+        TutorSpaceLedgerService.rebuild()
+        self.assertEqual(maintained, self._ledger())
+        self.assertEqual([minutes for _, _, minutes in maintained], expected_minutes)
+
+    def test_saves_keep_ledger_in_tier_order(self):
+        late = self._lesson(20, duration=45)
+        early = self._lesson(5)
+        middle = self._lesson(10, duration=90)
+        self._lesson(12, status="planned")
+        self._lesson(14, contract=self.other_contract)
+        self.assertLedgerConsistent([60, 90, 45])
+
+        middle.tutor_no_show = True
+        middle.save(update_fields=["tutor_no_show"])
+        self.assertLedgerConsistent([60, 45])
+
+        late.date = date(2025, 1, 2)
+        late.save()
+        self.assertLedgerConsistent([45, 60])
+
+        early.status = "planned"
+        early.save()
+        self.assertLedgerConsistent([45])
+
+        middle.tutor_no_show = False
+        middle.save()
+        late.delete()
+        self.assertLedgerConsistent([90])
+
+    def test_bulk_writes_and_tier_from_update_ledger(self):
+        self._lesson(3)
+        self._lesson(6, status="planned")
+        self.assertEqual(LessonStatusUpdater.update_past_lessons_to_taught(), 1)
+        recurring = RecurringLesson.objects.create(
+            contract=self.contract,
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 31),
+            start_time=time(16, 0),
+            duration_minutes=30,
+            monday=True,
+        )
+        RecurringLessonService.generate_lessons(recurring, check_conflicts=False)
+        self.assertLedgerConsistent([60, 60, 30, 30, 30, 30])
+
+        UserProfile.objects.update_or_create(
+            user=self.tutor, defaults={"tutorspace_tier_count_from": date(2025, 1, 10)}
+        )
+        self.assertLedgerConsistent([30, 30, 30])
+
+        self.contract.institute = "Other"
+        self.contract.save()
+        self.assertLedgerConsistent([])
+
+    def test_lookups_do_not_depend_on_history_length(self):
+        start_day = date(2024, 1, 1)
+        Lesson.objects.bulk_create(
+            [
+                Lesson(
+                    contract=self.contract,
+                    owner=self.tutor,
+                    date=start_day + timedelta(days=i),
+                    start_time=time(10, 0),
+                    duration_minutes=60,
+                    status="taught",
+                )
+                for i in range(300)
+            ]
+        )
+        call_command("rebuild_tutorspace_ledger", stdout=StringIO())
+        lesson = self._lesson(5, hour=12, status="planned")
+
+        with self.assertNumQueries(2):
+            amount = calculate_tutorspace_amount_for_session(lesson, tutor=self.tutor)
+        # 300 hours before the lesson: 151..450 tier
+        self.assertEqual(amount, Decimal("15.00"))
+        self.assertEqual(get_institute_tier_progress(self.tutor, "TutorSpace")["total_hours"], 300)
+
+    def test_only_tier_relevant_changes_rebuild(self):
+        self._lesson(5)
+        profile = UserProfile.objects.create(user=self.tutor)
+        rebuild = "apps.lessons.signals.TutorSpaceLedgerService.rebuild"
+
+        with mock.patch(rebuild) as rebuilt:
+            profile.default_working_hours = {"monday": [{"start": "09:00", "end": "12:00"}]}
+            profile.save()
+            self.contract.hourly_rate = Decimal("14.00")
+            self.contract.save()
+            self.other_contract.institute = "Other"
+            self.other_contract.save()
+        rebuilt.assert_not_called()
+
+        with mock.patch(rebuild) as rebuilt:
+            profile.tutorspace_tier_count_from = date(2025, 1, 10)
+            profile.save()
+            self.other_contract.institute = TUTORSPACE_INSTITUTE_NAME
+            self.other_contract.save()
+        self.assertEqual(rebuilt.call_args_list, [mock.call([self.tutor.id])] * 2)
@@ -6,7 +6,10 @@ Unterstützt zwei Transportmodi:
 Erzeugt synthetische „belegte“ Zeiten, die in die Slot-Berechnung einfließen.
 """
 
+import json
+from bisect import bisect_right
 from datetime import date, time, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
 
@@ -94,6 +97,105 @@ def _apply_fahrrad_buffer(
     return blocks
 
 
+_WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+class TravelPolicy:
+    """
+    Kompilierte Travel-Policy: pro Wochentag vorab verschmolzene, sortierte Blöcke.
+
+    Die „HH:MM“-Strings werden einmal beim Kompilieren geparst; blocks_for() ist danach
+    ein Lookup, allows() eine Binärsuche über die Block-Enden (O(log n)).
+    """
+
+    def __init__(
+        self,
+        travel_policy: Dict[str, Any] | None,
+        working_hours: Dict[int, List[Any]] | None = None,
+    ):
+        """
+        Args:
+            travel_policy: UserProfile.travel_policy
+            working_hours: Wochentag (0=Montag) -> Arbeitszeiten des Tages, nur für
+                Fahrrad-Modus nötig (Liste (time, time) oder [{"start","end"}])
+        """
+        policy = travel_policy or {}
+        self.enabled = bool(policy.get("enabled"))
+        self._blocks: List[List[Tuple[time, time]]] = [[] for _ in range(7)]
+        if self.enabled:
+            working_hours = working_hours or {}
+            for weekday in range(7):
+                self._blocks[weekday] = self._compile_day(
+                    policy, weekday, working_hours.get(weekday) or []
+                )
+        self._starts = [[start for start, _end in day] for day in self._blocks]
+        self._ends = [[end for _start, end in day] for day in self._blocks]
+
+    @staticmethod
+    def _compile_day(
+        policy: Dict[str, Any], weekday: int, working_hours_for_day: List[Any]
+    ) -> List[Tuple[time, time]]:
+        mode = policy.get("transport_mode") or "oepnv"
+        if mode == "fahrrad":
+            if not working_hours_for_day:
+                return []
+            intervals: List[Tuple[time, time]] = (
+                _working_hours_to_times(working_hours_for_day)
+                if isinstance(working_hours_for_day[0], dict)
+                else working_hours_for_day
+            )
+            buffer_min = max(0, int(policy.get("fahrrad_buffer_minutes", 25)))
+            blocks = _apply_fahrrad_buffer(intervals, buffer_min)
+        else:
+            blocks = []
+            for rule in policy.get("buffer_rules") or []:
+                blocks.extend(_apply_buffer_rule(rule, weekday))
+            for window in policy.get("no_go_windows") or []:
+                blocks.extend(_apply_no_go(window, weekday))
+        return _merge_overlapping(blocks)
+
+    @classmethod
+    def for_profile(cls, profile: Any) -> "TravelPolicy":
+        """
+        Kompilierte Policy eines Profils; nur bei Vor-Ort-Buchung aktiv.
+
+        Gecacht pro Inhalt von travel_policy und default_working_hours, d. h. jede
+        geänderte Policy-Version wird genau einmal kompiliert.
+        """
+        if not profile or getattr(profile, "default_booking_location", "online") != "vor_ort":
+            return _DISABLED_POLICY
+        policy = getattr(profile, "travel_policy", None) or {}
+        if not policy.get("enabled"):
+            return _DISABLED_POLICY
+        return _compile_for_profile(
+            json.dumps(policy, sort_keys=True),
+            json.dumps(getattr(profile, "default_working_hours", None) or {}, sort_keys=True),
+        )
+
+    def blocks_for(self, target_date: date) -> List[Tuple[time, time]]:
+        """Synthetisch belegte Blöcke an target_date (sortiert, verschmolzen)."""
+        return list(self._blocks[target_date.weekday()])
+
+    def allows(self, target_date: date, start_time: time, end_time: time) -> bool:
+        """True, wenn [start_time, end_time) keinen Policy-Block überlappt."""
+        weekday = target_date.weekday()
+        starts = self._starts[weekday]
+        i = bisect_right(self._ends[weekday], start_time)
+        return i == len(starts) or starts[i] >= end_time
+
+
+_DISABLED_POLICY = TravelPolicy(None)
+
+
+@lru_cache(maxsize=256)
+def _compile_for_profile(policy_json: str, working_hours_json: str) -> TravelPolicy:
+    working_hours = json.loads(working_hours_json)
+    return TravelPolicy(
+        json.loads(policy_json),
+        {i: working_hours.get(name) or [] for i, name in enumerate(_WEEKDAY_NAMES)},
+    )
+
+
 def get_synthetic_occupied_for_date(
     target_date: date,
     travel_policy: Dict[str, Any],
@@ -107,32 +209,12 @@ def get_synthetic_occupied_for_date(
       Arbeitsblocks; working_hours_for_date erforderlich (Liste (time, time) oder
       [{"start":"HH:MM","end":"HH:MM"}]).
     Weekday: 0=Monday (Python date.weekday()).
+    Für wiederholte Abfragen TravelPolicy.for_profile() verwenden.
     """
     if not travel_policy or not travel_policy.get("enabled"):
         return []
-    mode = travel_policy.get("transport_mode") or "oepnv"
-
-    if mode == "fahrrad":
-        if not working_hours_for_date:
-            return []
-        intervals: List[Tuple[time, time]] = (
-            _working_hours_to_times(working_hours_for_date)
-            if working_hours_for_date and isinstance(working_hours_for_date[0], dict)
-            else working_hours_for_date
-        )
-        buffer_min = max(0, int(travel_policy.get("fahrrad_buffer_minutes", 25)))
-        blocks = _apply_fahrrad_buffer(intervals, buffer_min)
-    else:
-        day_weekday = target_date.weekday()
-        blocks = []
-        for rule in travel_policy.get("buffer_rules") or []:
-            blocks.extend(_apply_buffer_rule(rule, day_weekday))
-        for window in travel_policy.get("no_go_windows") or []:
-            blocks.extend(_apply_no_go(window, day_weekday))
-
-    if not blocks:
-        return []
-    return _merge_overlapping(blocks)
+    compiled = TravelPolicy(travel_policy, {target_date.weekday(): working_hours_for_date or []})
+    return compiled.blocks_for(target_date)
 
 
 def _merge_overlapping(blocks: List[Tuple[time, time]]) -> List[Tuple[time, time]]:
@@ -163,13 +245,8 @@ def is_slot_allowed_by_policy(
     """
     if not travel_policy or not travel_policy.get("enabled"):
         return True
-    blocks = get_synthetic_occupied_for_date(
-        target_date, travel_policy, working_hours_for_date=working_hours_for_date
-    )
-    for block_start, block_end in blocks:
-        if not (end_time <= block_start or start_time >= block_end):
-            return False
-    return True
+    compiled = TravelPolicy(travel_policy, {target_date.weekday(): working_hours_for_date or []})
+    return compiled.allows(target_date, start_time, end_time)
 
 
 def travel_policy_active(profile: Any) -> bool:
@@ -0,0 +1,289 @@
+"""
+Service for the TutorSpace tier ledger (TutorSpaceLedgerEntry).
+
+Session saves keep the ledger up to date: a session entering the tier pool is inserted
+at its position and moves the rows after it up by its minutes, a session leaving the pool
+is removed and the rows after it move back down. Bulk writes pass their sessions to
+sync_sessions; a changed tutorspace_tier_count_from or contract institute rebuilds the
+ledger of the tutor.
+"""
+
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from apps.contracts.institute_utils import TUTORSPACE_INSTITUTE_NAME, is_tutorspace_institute
+from apps.contracts.models import Contract
+from apps.core.models import UserProfile
+from apps.lessons.models import Session, TutorSpaceLedgerEntry
+
+# Statuses whose sessions advance the TutorSpace tiers
+COUNTED_STATUSES = ("taught", "paid")
+# Tier order of the ledger rows (matches the tier order key of tutorspace_compensation)
+LEDGER_ORDER = ("date", "start_time", "session_created_at", "session_id")
+
+
+def order_key(session) -> tuple:
+    """(date, start_time, created_at, pk) of a session, date and time as Python values."""
+    return (
+        Session._meta.get_field("date").to_python(session.date),
+        Session._meta.get_field("start_time").to_python(session.start_time),
+        session.created_at,
+        session.pk,
+    )
+
+
+def _before(key: tuple) -> Q:
+    """Ledger rows strictly before the order key."""
+    day, start_time, created_at, session_id = key
+    q = Q(date__lt=day) | Q(date=day, start_time__lt=start_time)
+    if created_at is None:
+        # Unsaved sessions sort after all saved sessions of the same slot
+        return q | Q(date=day, start_time=start_time)
+    return (
+        q
+        | Q(date=day, start_time=start_time, session_created_at__lt=created_at)
+        | Q(
+            date=day,
+            start_time=start_time,
+            session_created_at=created_at,
+            session_id__lt=session_id,
+        )
+    )
+
+
+def _after(key: tuple) -> Q:
+    """Ledger rows strictly after the order key of a saved session."""
+    day, start_time, created_at, session_id = key
+    return (
+        Q(date__gt=day)
+        | Q(date=day, start_time__gt=start_time)
+        | Q(date=day, start_time=start_time, session_created_at__gt=created_at)
+        | Q(
+            date=day,
+            start_time=start_time,
+            session_created_at=created_at,
+            session_id__gt=session_id,
+        )
+    )
+
+
+class TutorSpaceLedgerService:
+    """Service for reading and maintaining the TutorSpace tier ledger."""
+
+    @staticmethod
+    def minutes_before(tutor_id: int, session) -> int:
+        """
+        Pool minutes of the tutor before the session in tier order.
+
+        Reads the closest earlier ledger row (one index lookup), independent of the length
+        of the tutor's history. Works for sessions outside the pool (planned, no-show,
+        unsaved) as well.
+        """
+        row = (
+            TutorSpaceLedgerEntry.objects.filter(tutor_id=tutor_id)
+            .filter(_before(order_key(session)))
+            .order_by(*(f"-{field}" for field in LEDGER_ORDER))
+            .values_list("minutes_before", "minutes")
+            .first()
+        )
+        return sum(row) if row else 0
+
+    @staticmethod
+    def total_minutes(tutor_id: int) -> int:
+        """Pool minutes of all counted TutorSpace sessions of the tutor."""
+        row = (
+            TutorSpaceLedgerEntry.objects.filter(tutor_id=tutor_id)
+            .order_by(*(f"-{field}" for field in LEDGER_ORDER))
+            .values_list("minutes_before", "minutes")
+            .first()
+        )
+        return sum(row) if row else 0
+
+    @staticmethod
+    def shift_after(tutor_id: int, key: tuple, minutes: int) -> None:
+        """Moves the ledger rows after the order key by the given minutes."""
+        TutorSpaceLedgerEntry.objects.filter(tutor_id=tutor_id).filter(_after(key)).update(
+            minutes_before=F("minutes_before") + minutes
+        )
+
+    @staticmethod
+    def lock_tutors(tutor_ids: Iterable[int]) -> None:
+        """
+        Locks the UserProfile rows of the tutors (SELECT ... FOR UPDATE).
+
+        Serializes ledger writes per tutor: two concurrent saves would otherwise read the
+        same prefix and leave minutes_before wrong for good. Same lock as
+        BookingService.lock_tutor_schedule; only call inside transaction.atomic().
+        """
+        list(
+            UserProfile.objects.select_for_update()
+            .filter(user_id__in=set(tutor_ids))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    @staticmethod
+    def _existing_entries(sessions: list) -> dict:
+        """Ledger rows of the sessions, by session pk."""
+        return {
+            entry.session_id: entry
+            for entry in TutorSpaceLedgerEntry.objects.filter(
+                session_id__in=[s.pk for s in sessions]
+            )
+        }
+
+    @staticmethod
+    def _counted_minutes(sessions: list) -> dict:
+        """
+        Determines which sessions belong to the tier pool.
+
+        Returns:
+            Dict session pk -> minutes for counted sessions
+        """
+        candidates = [
+            s
+            for s in sessions
+            if s.pk
+            and s.status in COUNTED_STATUSES
+            and not s.tutor_no_show
+            and (s.duration_minutes or 0) > 0
+        ]
+        if not candidates:
+            return {}
+
+        institutes = {
+            s.contract_id: s.contract.institute for s in candidates if Session.contract.is_cached(s)
+        }
+        missing = {s.contract_id for s in candidates} - institutes.keys()
+        if missing:
+            institutes.update(
+                Contract.objects.filter(pk__in=missing).values_list("pk", "institute")
+            )
+        candidates = [s for s in candidates if is_tutorspace_institute(institutes[s.contract_id])]
+        if not candidates:
+            return {}
+
+        tier_from = dict(
+            UserProfile.objects.filter(user_id__in={s.owner_id for s in candidates}).values_list(
+                "user_id", "tutorspace_tier_count_from"
+            )
+        )
+        return {
+            s.pk: int(s.duration_minutes)
+            for s in candidates
+            if tier_from.get(s.owner_id) is None or order_key(s)[0] >= tier_from[s.owner_id]
+        }
+
+    @staticmethod
+    def sync_sessions(sessions: Iterable[Session], new: bool = False) -> None:
+        """
+        Brings the ledger rows of saved sessions in line with their current values.
+
+        Unchanged rows are left alone; changed ones are removed and inserted again at their
+        (new) position, with the tutors locked (lock_tutors). Called by Session.save() and
+        by bulk writes that bypass it.
+
+        Args:
+            sessions: Saved sessions
+            new: The sessions were just inserted, so they have no ledger rows yet
+        """
+        sessions = [s for s in sessions if s.pk]
+        counted = TutorSpaceLedgerService._counted_minutes(sessions)
+        existing = {}
+        if not new and sessions:
+            existing = TutorSpaceLedgerService._existing_entries(sessions)
+        if not counted and not existing:
+            return
+
+        with transaction.atomic():
+            TutorSpaceLedgerService.lock_tutors(
+                {s.owner_id for s in sessions} | {e.tutor_id for e in existing.values()}
+            )
+            if not new:
+                # Re-read under the lock: a concurrent write may have moved the rows
+                existing = TutorSpaceLedgerService._existing_entries(sessions)
+            for session in sessions:
+                entry = existing.get(session.pk)
+                minutes = counted.get(session.pk)
+                key = order_key(session)
+                if (
+                    entry is not None
+                    and minutes is not None
+                    and (entry.tutor_id, entry.minutes) == (session.owner_id, minutes)
+                    and (entry.date, entry.start_time, entry.session_created_at, entry.session_id)
+                    == key
+                ):
+                    continue
+                if entry is not None:
+                    # The post_delete receiver moves the rows after it back down
+                    entry.delete()
+                if minutes is not None:
+                    minutes_before = TutorSpaceLedgerService.minutes_before(
+                        session.owner_id, session
+                    )
+                    TutorSpaceLedgerService.shift_after(session.owner_id, key, minutes)
+                    TutorSpaceLedgerEntry.objects.create(
+                        tutor_id=session.owner_id,
+                        session_id=session.pk,
+                        date=key[0],
+                        start_time=key[1],
+                        session_created_at=key[2],
+                        minutes=minutes,
+                        minutes_before=minutes_before,
+                    )
+
+    @staticmethod
+    def rebuild(tutor_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recomputes the ledger from scratch (all tutors or the given ones).
+
+        Used when tutorspace_tier_count_from or a contract institute changes, and after
+        writes that bypass save() (e.g. fixture loading).
+
+        Returns:
+            Number of ledger rows
+        """
+        with transaction.atomic():
+            if tutor_ids is not None:
+                tutor_ids = list(tutor_ids)
+                # Sessions are read under the lock, so no concurrent sync is lost
+                TutorSpaceLedgerService.lock_tutors(tutor_ids)
+            sessions = Session.objects.filter(
+                contract__institute__iexact=TUTORSPACE_INSTITUTE_NAME,
+                status__in=COUNTED_STATUSES,
+                tutor_no_show=False,
+                duration_minutes__gt=0,
+            )
+            stored = TutorSpaceLedgerEntry.objects.all()
+            profiles = UserProfile.objects.filter(tutorspace_tier_count_from__isnull=False)
+            if tutor_ids is not None:
+                sessions = sessions.filter(owner_id__in=tutor_ids)
+                stored = stored.filter(tutor_id__in=tutor_ids)
+                profiles = profiles.filter(user_id__in=tutor_ids)
+            tier_from = dict(profiles.values_list("user_id", "tutorspace_tier_count_from"))
+
+            entries = []
+            pool = {}
+            for pk, tutor_id, day, start_time, created_at, minutes in sessions.order_by(
+                "owner_id", "date", "start_time", "created_at", "pk"
+            ).values_list("pk", "owner_id", "date", "start_time", "created_at", "duration_minutes"):
+                if tutor_id in tier_from and day < tier_from[tutor_id]:
+                    continue
+                minutes_before = pool.get(tutor_id, 0)
+                pool[tutor_id] = minutes_before + minutes
+                entries.append(
+                    TutorSpaceLedgerEntry(
+                        tutor_id=tutor_id,
+                        session_id=pk,
+                        date=day,
+                        start_time=start_time,
+                        session_created_at=created_at,
+                        minutes=minutes,
+                        minutes_before=minutes_before,
+                    )
+                )
+            stored.delete()
+            TutorSpaceLedgerEntry.objects.bulk_create(entries, batch_size=500)
+            return len(entries)
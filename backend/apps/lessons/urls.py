@@ -45,6 +45,11 @@ urlpatterns = [
         recurring_views.generate_lessons_from_recurring,
         name="recurring_generate",
     ),
+    path(
+        "recurring/jobs/<int:pk>/",
+        recurring_views.series_generation_job_status,
+        name="recurring_job_status",
+    ),
     path(
         "recurring/bulk-edit/",
         recurring_views.RecurringLessonBulkEditView.as_view(),
@@ -82,6 +87,16 @@ urlpatterns = [
         views_public_booking.public_booking_week_api,
         name="public_booking_week_api",
     ),
+    path(
+        "public-booking/<str:tutor_token>/weeks/",
+        views_public_booking.public_booking_range_api,
+        name="public_booking_range_api",
+    ),
+    path(
+        "public-booking/<str:tutor_token>/next-slots/",
+        views_public_booking.public_booking_next_slots_api,
+        name="public_booking_next_slots_api",
+    ),
     path(
         "public-booking/api/search-student/",
         views_public_booking.search_student_api,
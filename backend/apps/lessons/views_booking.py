@@ -9,6 +9,7 @@ from django.contrib import messages
 from django.http import Http404, JsonResponse
 from django.shortcuts import redirect
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
@@ -17,6 +18,7 @@ from django.views.decorators.http import require_http_methods
 from django.views.generic import TemplateView
 
 from apps.contracts.models import Contract
+from apps.lessons.availability_cache import apply_week_etag, week_etag
 from apps.lessons.booking_service import BookingService
 from apps.lessons.email_service import send_booking_notification
 from apps.lessons.models import Lesson
@@ -26,6 +28,7 @@ from apps.lessons.recurring_utils import (
     find_matching_recurring_session,
     get_all_sessions_for_recurring,
 )
+from apps.lessons.utils_dates import get_week_start
 
 
 @method_decorator(ensure_csrf_cookie, name="dispatch")
@@ -684,7 +687,9 @@ def _get_week_data_json(contract, year: int, month: int, day: int):
 def student_booking_week_api(request, token):
     """API for fetching week booking data (for AJAX week navigation)."""
     try:
-        contract = Contract.objects.get(booking_token=token, is_active=True)
+        contract = Contract.objects.select_related("student").get(
+            booking_token=token, is_active=True
+        )
     except Contract.DoesNotExist:
         return JsonResponse({"success": False, "message": _("Booking link not found.")}, status=404)
 
@@ -692,11 +697,22 @@ def student_booking_week_api(request, token):
         year = int(request.GET.get("year", timezone.now().year))
         month = int(request.GET.get("month", timezone.now().month))
         day = int(request.GET.get("day", timezone.now().day))
+        week_start = get_week_start(date(year, month, day))
     except (ValueError, TypeError):
         return JsonResponse({"success": False, "message": _("Invalid date.")}, status=400)
 
+    etag = week_etag(
+        contract.student.user_id,
+        week_start,
+        student_id=contract.student_id,
+        contract_id=contract.id,
+    )
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return apply_week_etag(not_modified, etag)
+
     data = _get_week_data_json(contract, year, month, day)
-    return JsonResponse({"success": True, "week_data": data})
+    return apply_week_etag(JsonResponse({"success": True, "week_data": data}), etag)
 
 
 @csrf_exempt
@@ -13,6 +13,7 @@ from django.views.generic import ListView, TemplateView
 
 from apps.lessons.calendar_service import CalendarService
 from apps.lessons.models import Lesson
+from apps.lessons.recurring_service import extend_series_of_user
 from apps.lessons.services import LessonConflictService, LessonQueryService
 from apps.lessons.status_service import LessonStatusUpdater
 from apps.lessons.week_service import WeekService
@@ -43,8 +44,10 @@ class WeekView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Automatic status update for past lessons
-        LessonStatusUpdater.update_past_lessons_to_taught()
+        # Catch up the user's open-ended series (full sweep: materialize_series)
+        extend_series_of_user(self.request.user)
+        # Catch up the status of the user's past lessons (full sweep: mark_taught)
+        LessonStatusUpdater.update_past_lessons_to_taught(user=self.request.user)
 
         # Year, month and day from URL parameters (fallback: current date)
         year_param = self.request.GET.get("year")
@@ -161,8 +164,10 @@ class LessonMonthView(LoginRequiredMixin, ListView):
         month = int(self.kwargs.get("month", timezone.now().month))
 
         # Add conflict info
-        for lesson in context["lessons"]:
-            lesson.conflicts = LessonConflictService.check_conflicts(lesson)
+        lessons = context["lessons"]
+        conflicts_by_lesson = LessonConflictService.get_stored_conflicts(lessons)
+        for lesson in lessons:
+            lesson.conflicts = conflicts_by_lesson.get(lesson.pk, [])
 
         context["year"] = year
         context["month"] = month
@@ -177,8 +182,10 @@ class CalendarView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Automatic status update for past lessons
-        LessonStatusUpdater.update_past_lessons_to_taught()
+        # Catch up the user's open-ended series (full sweep: materialize_series)
+        extend_series_of_user(self.request.user)
+        # Catch up the status of the user's past lessons (full sweep: mark_taught)
+        LessonStatusUpdater.update_past_lessons_to_taught(user=self.request.user)
 
         # Year and month from URL parameters (fallback: current date)
         now = timezone.now()
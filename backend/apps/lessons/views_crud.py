@@ -22,6 +22,7 @@ from apps.lessons.recurring_utils import (
     find_matching_recurring_lesson,
     get_all_lessons_for_recurring,
 )
+from apps.lessons.series_diff_service import SeriesDiffService
 from apps.lessons.services import LessonConflictService, recalculate_conflicts_for_affected_lessons
 from apps.lessons.status_service import LessonStatusService
 from apps.lessons.views_calendar import get_last_calendar_url
@@ -44,7 +45,7 @@ class LessonListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         """Filter lessons by user and optionally by date range."""
-        queryset = super().get_queryset().filter(contract__student__user=self.request.user)
+        queryset = super().get_queryset().filter(owner=self.request.user)
 
         # Filter by date range if provided
         start_date = self.request.GET.get("start_date")
@@ -66,7 +67,7 @@ class LessonDetailView(LoginRequiredMixin, DetailView):
     context_object_name = "lesson"
 
     def get_queryset(self):
-        return super().get_queryset().filter(contract__student__user=self.request.user)
+        return super().get_queryset().filter(owner=self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -280,7 +281,7 @@ class LessonUpdateView(LoginRequiredMixin, UpdateView):
     template_name = "lessons/lesson_form.html"
 
     def get_queryset(self):
-        return super().get_queryset().filter(contract__student__user=self.request.user)
+        return super().get_queryset().filter(owner=self.request.user)
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -311,8 +312,9 @@ class LessonUpdateView(LoginRequiredMixin, UpdateView):
                 with transaction.atomic():
                     recurring = matching_recurring
 
-                    # IMPORTANT: Save the original start_time BEFORE we change it!
+                    # IMPORTANT: Save the original start_time and rule BEFORE we change them!
                     original_start_time = recurring.start_time
+                    old_recurrence = recurring.recurrence
 
                     # IMPORTANT: Find all lessons of this series BEFORE we change RecurringLesson!
                     # (Otherwise we won't find them anymore, as they still have the old start_time)
@@ -320,12 +322,6 @@ class LessonUpdateView(LoginRequiredMixin, UpdateView):
                         recurring, original_start_time=original_start_time
                     )
 
-                    # Check if weekdays have changed
-                    new_weekdays = form.cleaned_data.get("recurrence_weekdays", [])
-                    new_weekdays_set = {int(wd) for wd in new_weekdays}
-                    old_weekdays_set = set(recurring.get_active_weekdays())
-                    weekdays_changed = new_weekdays_set != old_weekdays_set
-
                     # Update RecurringLesson with new values
                     recurring.start_time = form.cleaned_data["start_time"]
                     recurring.duration_minutes = form.cleaned_data["duration_minutes"]
@@ -338,6 +334,7 @@ class LessonUpdateView(LoginRequiredMixin, UpdateView):
                     recurring.notes = form.cleaned_data["notes"]
 
                     # Update weekdays
+                    new_weekdays = form.cleaned_data.get("recurrence_weekdays", [])
                     if new_weekdays:
                         recurring.monday = "0" in new_weekdays
                         recurring.tuesday = "1" in new_weekdays
@@ -349,84 +346,44 @@ class LessonUpdateView(LoginRequiredMixin, UpdateView):
 
                     recurring.save()
 
-                    if weekdays_changed:
-                        deleted_count = 0
-                        for lesson in all_lessons:
-                            lesson_weekday = lesson.date.weekday()
-                            if lesson_weekday not in new_weekdays_set:
-                                lesson.delete()
-                                deleted_count += 1
-                            else:
-                                lesson.start_time = recurring.start_time
-                                lesson.duration_minutes = recurring.duration_minutes
-                                lesson.travel_time_before_minutes = (
-                                    recurring.travel_time_before_minutes
-                                )
-                                lesson.travel_time_after_minutes = (
-                                    recurring.travel_time_after_minutes
-                                )
-                                lesson.notes = recurring.notes
-                                LessonStatusService.update_status_for_lesson(lesson)
-                                lesson.save()
-                                recalculate_conflicts_for_affected_lessons(lesson)
-
-                        # Generate new lessons for the new weekdays
-                        result = RecurringLessonService.generate_lessons(
-                            recurring, check_conflicts=True, dry_run=False
-                        )
+                    # Minimal set of deletes, updates and inserts, applied in bulk
+                    result = SeriesDiffService.apply(recurring, all_lessons, old_recurrence)
+                    weekdays_changed = recurring.recurrence.byday != old_recurrence.byday
 
-                        if result.get("conflicts"):
+                    # Check for conflicts after update; rollback if any
+                    if result["conflicts"]:
+                        if weekdays_changed:
                             raise ValueError(
                                 _("{count} conflict(s) detected. No changes were made.").format(
-                                    count=len(result.get("conflicts", []))
+                                    count=len(result["conflicts"])
                                 )
                             )
+                        first_conflict = result["conflicts"][0]["session"]
+                        raise ValueError(
+                            _(
+                                "Conflict detected for {date} at {time}. No changes were made."
+                            ).format(
+                                date=first_conflict.date,
+                                time=first_conflict.start_time,
+                            )
+                        )
 
-                        created_count = result.get("created", 0)
+                    if weekdays_changed:
                         messages.success(
                             self.request,
                             _(
                                 "Series updated. {deleted} lesson(s) deleted, {created} new lesson(s) created, {updated} lesson(s) updated."
                             ).format(
-                                deleted=deleted_count,
-                                created=created_count,
-                                updated=len(all_lessons) - deleted_count,
+                                deleted=result["deleted"],
+                                created=result["created"],
+                                updated=result["updated"],
                             ),
                         )
                     else:
-                        # Weekdays have not changed -> only update existing lessons
-                        updated_count = 0
-                        for lesson in all_lessons:
-                            lesson.start_time = recurring.start_time
-                            lesson.duration_minutes = recurring.duration_minutes
-                            lesson.travel_time_before_minutes = recurring.travel_time_before_minutes
-                            lesson.travel_time_after_minutes = recurring.travel_time_after_minutes
-                            lesson.notes = recurring.notes
-                            LessonStatusService.update_status_for_lesson(lesson)
-                            lesson.save()
-                            updated_count += 1
-                            recalculate_conflicts_for_affected_lessons(lesson)
-
-                        # Check for conflicts after update; rollback if any
-                        for lesson in all_lessons:
-                            lesson.refresh_from_db()
-                            conflicts = LessonConflictService.check_conflicts(
-                                lesson, exclude_self=True
-                            )
-                            if conflicts:
-                                raise ValueError(
-                                    _(
-                                        "Conflict detected for {date} at {time}. No changes were made."
-                                    ).format(
-                                        date=lesson.date,
-                                        time=lesson.start_time,
-                                    )
-                                )
-
                         messages.success(
                             self.request,
                             _("Series updated. {count} lesson(s) updated.").format(
-                                count=updated_count
+                                count=result["updated"]
                             ),
                         )
             except ValueError as e:
@@ -473,7 +430,7 @@ class LessonDeleteView(LoginRequiredMixin, DeleteView):
     template_name = "lessons/lesson_confirm_delete.html"
 
     def get_queryset(self):
-        return super().get_queryset().filter(contract__student__user=self.request.user)
+        return super().get_queryset().filter(owner=self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
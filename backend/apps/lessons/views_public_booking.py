@@ -7,9 +7,11 @@ import logging
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
+from django.core.cache import cache
 from django.db import transaction
 from django.http import Http404, JsonResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.csrf import ensure_csrf_cookie
@@ -26,10 +28,15 @@ from apps.core.feature_flags import (
 )
 from apps.core.models import UserProfile
 from apps.core.utils_booking import get_tutor_for_booking
+from apps.lessons.availability_cache import (
+    WEEK_CACHE_TIMEOUT_SECONDS,
+    apply_week_etag,
+    week_cache_key,
+    week_etag,
+)
 from apps.lessons.booking_service import BookingService
 from apps.lessons.models import Lesson, LessonDocument
 from apps.lessons.throttle import is_public_booking_throttled, record_public_booking_attempt
-from apps.lessons.travel_policy import is_slot_allowed_by_policy
 from apps.lessons.utils_dates import get_week_start
 from apps.students.booking_code_service import set_booking_code, verify_booking_code
 from apps.students.models import Student
@@ -186,6 +193,25 @@ def public_booking_week_api(request, tutor_token):
         except (ValueError, TypeError):
             exclude_lesson_id = None
 
+    week_start = get_week_start(date(year, month, day))
+
+    # The ETag always comes from the database, so a stale cache entry can never confirm
+    # an outdated week with 304 Not Modified; the cache only holds the payload body
+    etag = week_etag(
+        tutor.id, week_start, student_id=student_id, exclude_lesson_id=exclude_lesson_id
+    )
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return apply_week_etag(not_modified, etag)
+
+    # Anonymous week payloads are identical for every visitor: serve them from the cache
+    cache_key = None
+    if student_id is None and exclude_lesson_id is None:
+        cache_key = week_cache_key(tutor.id, week_start)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return apply_week_etag(JsonResponse({"success": True, "week_data": cached}), etag)
+
     try:
         week_data = BookingService.get_public_booking_data(
             year,
@@ -199,7 +225,95 @@ def public_booking_week_api(request, tutor_token):
         return JsonResponse({"success": False, "message": _("Invalid date.")}, status=400)
 
     data = _serialize_public_week_data(week_data)
-    return JsonResponse({"success": True, "week_data": data})
+    if cache_key is not None:
+        cache.set(cache_key, data, WEEK_CACHE_TIMEOUT_SECONDS)
+    return apply_week_etag(JsonResponse({"success": True, "week_data": data}), etag)
+
+
+@require_http_methods(["GET"])
+def public_booking_range_api(request, tutor_token):
+    """
+    API for fetching several consecutive weeks at once (prefetch for week navigation).
+
+    ?week_start=YYYY-MM-DD (any day of the first week) and ?weeks=N (1..8, default 4).
+    """
+    tutor = get_tutor_for_booking(tutor_token)
+    if not tutor:
+        return JsonResponse(
+            {"success": False, "message": _("Booking link invalid or expired.")}, status=404
+        )
+
+    week_param = request.GET.get("week_start", "").strip()
+    try:
+        target = date.fromisoformat(week_param) if week_param else timezone.now().date()
+        weeks = int(request.GET.get("weeks", 4))
+    except (ValueError, TypeError):
+        return JsonResponse({"success": False, "message": _("Invalid date.")}, status=400)
+
+    student_id = None
+    if request.session.get("public_booking_tutor_token") == tutor_token:
+        student_id = request.session.get("public_booking_student_id")
+
+    weeks_data = BookingService.get_public_booking_range(
+        target, weeks=weeks, user=tutor, student_id=student_id
+    )
+    return JsonResponse(
+        {"success": True, "weeks": [_serialize_public_week_data(w) for w in weeks_data]}
+    )
+
+
+_MAX_NEXT_SLOTS = 20
+
+
+@require_http_methods(["GET"])
+def public_booking_next_slots_api(request, tutor_token):
+    """
+    API for the next free slots of a tutor.
+
+    ?after=YYYY-MM-DD or YYYY-MM-DDTHH:MM (default: now) and ?limit=N (1..20, default 5).
+    Slot length is the verified student's unit duration, otherwise 60 minutes.
+    """
+    tutor = get_tutor_for_booking(tutor_token)
+    if not tutor:
+        return JsonResponse(
+            {"success": False, "message": _("Booking link invalid or expired.")}, status=404
+        )
+
+    after_param = request.GET.get("after", "").strip()
+    try:
+        after = datetime.fromisoformat(after_param) if after_param else None
+        limit = int(request.GET.get("limit", 5))
+    except (ValueError, TypeError):
+        return JsonResponse({"success": False, "message": _("Invalid date.")}, status=400)
+    limit = max(1, min(limit, _MAX_NEXT_SLOTS))
+
+    duration = 60
+    if request.session.get("public_booking_tutor_token") == tutor_token:
+        student_id = request.session.get("public_booking_student_id")
+        contract = (
+            Contract.objects.filter(student_id=student_id, student__user=tutor, is_active=True)
+            .order_by("-start_date")
+            .first()
+            if student_id
+            else None
+        )
+        if contract:
+            duration = contract.unit_duration_minutes
+
+    slots = BookingService.find_next_available_slots(tutor, duration, after=after, limit=limit)
+    return JsonResponse(
+        {
+            "success": True,
+            "slots": [
+                {
+                    "date": slot_date.strftime("%Y-%m-%d"),
+                    "start": start.strftime("%H:%M"),
+                    "end": end.strftime("%H:%M"),
+                }
+                for slot_date, start, end in slots
+            ],
+        }
+    )
 
 
 _NEUTRAL_ERROR = _("Invalid name or code. Please try again.")
@@ -528,101 +642,65 @@ def book_lesson_api(request):
                 status=400,
             )
 
-        # Check availability
-        week_data = BookingService.get_public_booking_data(
-            booking_date_obj.year,
-            booking_date_obj.month,
-            booking_date_obj.day,
-            user=tutor,
-        )
-
-        # Find the day in week_data
-        target_day = None
-        for day_data in week_data["days"]:
-            if day_data["date"] == booking_date_obj:
-                target_day = day_data
-                break
-
-        if not target_day:
-            return JsonResponse({"success": False, "message": _("Date not found.")}, status=400)
-
-        # Check if slot is available
-        occupied_slots = BookingService.get_all_occupied_time_slots(
-            booking_date_obj, booking_date_obj, user=tutor
-        )
-
-        if not BookingService.is_time_slot_available(
-            booking_date_obj, start_time_obj, end_time_obj, occupied_slots
-        ):
-            return JsonResponse(
-                {"success": False, "message": _("Time slot is already booked.")}, status=400
+        with transaction.atomic():
+            # Serialize bookings per tutor; the slot check below sees all committed bookings
+            profile = BookingService.lock_tutor_schedule(tutor)
+            slot = BookingService.check_slot(
+                booking_date_obj, start_time_obj, end_time_obj, user=tutor, profile=profile
             )
-
-        profile = UserProfile.objects.filter(user=tutor).first()
-        if profile and getattr(profile, "default_booking_location", "online") == "vor_ort":
-            policy = getattr(profile, "travel_policy", None) or {}
-            if policy.get("enabled"):
-                day_working_hours = target_day.get("working_hours") or []
-                if not is_slot_allowed_by_policy(
-                    booking_date_obj,
-                    start_time_obj,
-                    end_time_obj,
-                    policy,
-                    working_hours_for_date=day_working_hours,
-                ):
-                    return JsonResponse(
-                        {
-                            "success": False,
-                            "message": _(
-                                "This time is not available due to travel time rules. "
-                                "Please choose another slot."
-                            ),
-                            "alternative_slots": [
-                                [s[0].strftime("%H:%M"), s[1].strftime("%H:%M")]
-                                for s in target_day.get("available_slots", [])
-                            ][:10],
-                        },
-                        status=400,
+            if not slot["available"]:
+                if slot["reason"] == "travel_policy":
+                    message = _(
+                        "This time is not available due to travel time rules. "
+                        "Please choose another slot."
                     )
+                else:
+                    message = _("Time slot is already booked.")
+                return JsonResponse(
+                    {
+                        "success": False,
+                        "message": message,
+                        "alternative_slots": [
+                            [s[0].strftime("%H:%M"), s[1].strftime("%H:%M")]
+                            for s in slot["alternative_slots"]
+                        ],
+                    },
+                    status=400,
+                )
 
-        # Find or create contract for this student (student belongs to tutor)
-        contract = Contract.objects.filter(
-            student=student, student__user=tutor, is_active=True
-        ).first()
-
-        if not contract:
-            # Create new contract with hourly_rate=0.00 (to be set later by tutor)
-            contract = Contract.objects.create(
-                student=student,
-                institute=institute if institute else None,
-                hourly_rate=Decimal("0.00"),  # Price will be set later by tutor
-                unit_duration_minutes=60,  # Default
-                start_date=timezone.now().date(),
-                is_active=True,
-            )
+            if public_booking_limit_reached(tutor):
+                return JsonResponse(
+                    {
+                        "success": False,
+                        "message": _(
+                            "Public booking limit reached. Upgrade to Premium for unlimited bookings."
+                        ),
+                    },
+                    status=403,
+                )
 
-        if public_booking_limit_reached(tutor):
-            return JsonResponse(
-                {
-                    "success": False,
-                    "message": _(
-                        "Public booking limit reached. Upgrade to Premium for unlimited bookings."
-                    ),
-                },
-                status=403,
-            )
+            if not contract:
+                # Create new contract with hourly_rate=0.00 (to be set later by tutor)
+                contract = Contract.objects.create(
+                    student=student,
+                    institute=institute if institute else None,
+                    hourly_rate=Decimal("0.00"),  # Price will be set later by tutor
+                    unit_duration_minutes=60,  # Default
+                    start_date=timezone.now().date(),
+                    is_active=True,
+                )
 
-        lesson = Lesson.objects.create(
-            contract=contract,
-            date=booking_date_obj,
-            start_time=start_time_obj,
-            duration_minutes=duration_total,
-            status="planned",
-            travel_time_before_minutes=0,
-            travel_time_after_minutes=0,
-            notes=f"{_('Subject')}: {subject}\n{notes}" if subject or notes else notes,
-            created_via="public_booking",
-        )
+            lesson = Lesson.objects.create(
+                contract=contract,
+                date=booking_date_obj,
+                start_time=start_time_obj,
+                duration_minutes=duration_total,
+                status="planned",
+                travel_time_before_minutes=0,
+                travel_time_after_minutes=0,
+                notes=f"{_('Subject')}: {subject}\n{notes}" if subject or notes else notes,
+                created_via="public_booking",
+            )
 
         try:
             from apps.lessons.email_service import send_booking_notification
@@ -764,7 +842,7 @@ def reschedule_lesson_api(request):
                 .filter(
                     pk=lesson_id,
                     contract__student_id=student_id,
-                    contract__student__user=tutor,
+                    owner=tutor,
                     status="planned",
                 )
                 .select_related("contract")
@@ -881,12 +959,11 @@ def reschedule_lesson_api(request):
                     }
                 )
 
-            occupied = BookingService.get_all_occupied_time_slots(
-                new_date_obj, new_date_obj, user=tutor, exclude_lesson_id=lesson.id
+            BookingService.lock_tutor_schedule(tutor)
+            slot = BookingService.check_slot(
+                new_date_obj, new_start_obj, new_end_obj, user=tutor, exclude_lesson_id=lesson.id
             )
-            if not BookingService.is_time_slot_available(
-                new_date_obj, new_start_obj, new_end_obj, occupied
-            ):
+            if not slot["available"]:
                 return JsonResponse({"success": False, "message": _RESCHEDULE_NEUTRAL}, status=400)
 
             old_date = lesson.date
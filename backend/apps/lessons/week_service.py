@@ -50,8 +50,8 @@ class WeekService:
             .order_by("date", "start_time")
         )
         if user:
-            lessons_qs = lessons_qs.filter(contract__student__user=user)
-        lessons = lessons_qs
+            lessons_qs = lessons_qs.filter(owner=user)
+        lessons = list(lessons_qs)
 
         # Lade Blockzeiten für die Woche
         start_datetime = timezone.make_aware(datetime.combine(week_start, time.min))
@@ -61,7 +61,7 @@ class WeekService:
         ).order_by("start_datetime")
         if user:
             blocked_times_qs = blocked_times_qs.filter(user=user)
-        blocked_times = blocked_times_qs
+        blocked_times = list(blocked_times_qs)
 
         # Lade wiederkehrende Blockzeiten und generiere temporäre Blockzeiten für die Woche
         recurring_qs = RecurringBlockedTime.objects.filter(
@@ -75,14 +75,11 @@ class WeekService:
 
         # Gruppiere Lessons nach Datum
         lessons_by_date = defaultdict(list)
-        conflicts_by_lesson = {}
-
         for lesson in lessons:
             lessons_by_date[lesson.date].append(lesson)
-            # Prüfe Konflikte
-            conflicts = LessonConflictService.check_conflicts(lesson)
-            if conflicts:
-                conflicts_by_lesson[lesson.id] = conflicts
+
+        # Lese Konflikte aller Lessons aus dem Konflikt-Speicher
+        conflicts_by_lesson = LessonConflictService.get_stored_conflicts(lessons)
 
         # Gruppiere Blockzeiten nach Datum
         blocked_times_by_date = defaultdict(list)
@@ -99,12 +96,10 @@ class WeekService:
                 current_date += timedelta(days=1)
 
         # Füge generierte Blockzeiten aus RecurringBlockedTime hinzu
-        for rbt in recurring_blocked_times:
-            generated_blocked_times_preview = RecurringBlockedTimeService.preview_blocked_times(rbt)
-            for bt_preview in generated_blocked_times_preview:
-                # Filter nur für die aktuelle Woche
-                if week_start <= bt_preview.start_datetime.date() <= week_end:
-                    blocked_times_by_date[bt_preview.start_datetime.date()].append(bt_preview)
+        for bt_preview in RecurringBlockedTimeService.expand_recurring_between(
+            recurring_blocked_times, week_start, week_end, existing=blocked_times
+        ):
+            blocked_times_by_date[bt_preview.start_datetime.date()].append(bt_preview)
 
         return {
             "week_start": week_start,
@@ -257,6 +257,14 @@ LLM_API_KEY = os.environ.get("LLM_API_KEY", "")
 LLM_MODEL_NAME = os.environ.get("LLM_MODEL_NAME", "gpt-3.5-turbo")
 LLM_TIMEOUT_SECONDS = int(os.environ.get("LLM_TIMEOUT_SECONDS", "30"))
 
+# Series generation
+# With a worker (`manage.py process_series_jobs`) running, series are generated in the
+# background and the UI polls the progress. Without a worker, jobs run inside the request.
+SERIES_GENERATION_ASYNC = env_bool("SERIES_GENERATION_ASYNC", default=False)
+# Open-ended series are materialized only this many weeks ahead; the rolling horizon is
+# extended by `manage.py materialize_series` (also run periodically by the worker).
+SERIES_HORIZON_WEEKS = int(env("SERIES_HORIZON_WEEKS", default="12"))
+
 # Logging configuration
 LOGGING = {
     "version": 1,
@@ -3,6 +3,8 @@ set -euo pipefail
 
 # WORKDIR is already set to /app/backend in Dockerfile, so no need to cd
 python manage.py migrate --noinput
+# Extend open-ended series up to the current horizon (schedule it daily as well)
+python manage.py materialize_series
 
 if [ "${DEBUG:-True}" != "True" ] && [ "${DEBUG:-True}" != "true" ]; then
   python manage.py collectstatic --noinput